@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.5
+
+AutoCAD type library constants, precomputed.
+Importing comtypes.gen.AutoCAD takes seconds and needs AutoCAD installed (getModule, GetLibPath),
+so enums used by snippets.py and dwg.dump.py live here.
+Interfaces (IAcadText, ...) still loaded from type library by snippets.VacTypeLib, on first use.
+
+Check and regenerate values for other type library (on machine with AutoCAD and comtypes):
+    python acadconst.py > acadconst.new.py
+'''
+
+import sys
+
+# type library this constants taken from
+TLB_NAME = 'acax18ENU.tlb'
+TLB_GUID = '{D32C213D-6096-40EF-A216-89A3A6FB82F7}'
+TLB_VERSION = (1, 0)
+
+# AcCoordinateSystem
+acWorld = 0
+acUCS = 1
+acDisplayDCS = 2
+acPaperSpaceDCS = 3
+acOCS = 4
+
+# AcEntityName
+ac3dFace = 1
+ac3dPolyline = 2
+ac3dSolid = 3
+acArc = 4
+acAttribute = 5
+acAttributeReference = 6
+acBlockReference = 7
+acCircle = 8
+acDimAligned = 9
+acDimAngular = 10
+acDimDiametric = 12
+acDimOrdinate = 13
+acDimRadial = 14
+acDimRotated = 15
+acEllipse = 16
+acHatch = 17
+acLeader = 18
+acLine = 19
+acMtext = 21
+acPoint = 22
+acPolyline = 23
+acPolylineLight = 24
+acPolymesh = 25
+acRaster = 26
+acRay = 27
+acRegion = 28
+acShape = 29
+acSolid = 30
+acSpline = 31
+acText = 32
+acTolerance = 33
+acTrace = 34
+acPViewport = 35
+acXline = 36
+acGroup = 37
+acMInsertBlock = 38
+acPolyfaceMesh = 39
+acMLine = 40
+acDim3PointAngular = 41
+acExternalReference = 42
+acTable = 43
+acDimArcLength = 44
+acDimRadialLarge = 45
+
+# AcSelect
+acSelectionSetWindow = 0
+acSelectionSetCrossing = 1
+acSelectionSetFence = 2
+acSelectionSetPrevious = 3
+acSelectionSetLast = 4
+acSelectionSetAll = 5
+acSelectionSetWindowPolygon = 6
+acSelectionSetCrossingPolygon = 7
+
+# AcAlignment
+acAlignmentLeft = 0
+acAlignmentCenter = 1
+acAlignmentRight = 2
+acAlignmentAligned = 3
+acAlignmentMiddle = 4
+acAlignmentFit = 5
+acAlignmentTopLeft = 6
+acAlignmentTopCenter = 7
+acAlignmentTopRight = 8
+acAlignmentMiddleLeft = 9
+acAlignmentMiddleCenter = 10
+acAlignmentMiddleRight = 11
+acAlignmentBottomLeft = 12
+acAlignmentBottomCenter = 13
+acAlignmentBottomRight = 14
+
+
+def constants():
+    ''' dict of all constants {name: value}
+    '''
+    mod = sys.modules[__name__]
+    return dict([(k, getattr(mod, k)) for k in dir(mod)
+        if k.startswith('ac') and isinstance(getattr(mod, k), int)])
+
+def checkConstants(tlb):
+    ''' Compare constants with loaded type library module (comtypes.gen.AutoCAD).
+    Returns list of (name, our value, library value) for differences.
+    '''
+    res = []
+    for k,v in sorted(constants().items()):
+        t = getattr(tlb, k, v)
+        if t != v:
+            res.append((k, v, t))
+    return res
+
+def dumpConstants(tlb, out=sys.stdout):
+    ''' print constants known here with values from comtypes.gen.AutoCAD, as python source
+    '''
+    print >> out, "TLB_NAME = '%s'" % TLB_NAME
+    print >> out, "TLB_GUID = '%s'" % TLB_GUID
+    print >> out, 'TLB_VERSION = %r' % (TLB_VERSION,)
+    print >> out
+    for k in sorted(constants().keys()):
+        if hasattr(tlb, k):
+            print >> out, '%s = %s' % (k, getattr(tlb, k))
+
+
+if __name__ == '__main__':
+    import comtypes.gen.AutoCAD as tlb
+    dumpConstants(tlb)
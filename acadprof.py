@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.5
+
+COM calls accounting for comtypesDump.
+VcomProxy wraps AutoCAD object (document, ModelSpace, Utility, entity) and counts and times
+every property read and method call; COM objects returned from calls (Item, QueryInterface, ...)
+wrapped too.
+Calls made between VcomProfiler.begin() and end(typename) charged to that entity type,
+e.g. TranslateCoordinates or doc.Name calls made while processing AcDbPolyline.
+
+Usage:
+    prof = VcomProfiler()
+    prof.install(VAcad) # wrap VAcad.doc, VAcad.ms, VAcad.u
+    for i in range(count):
+        prof.begin()
+        item = VacItem(VAcad.ms.Item(i))
+        ...
+        prof.end(item.name)
+    prof.uninstall(VAcad)
+    print prof.report()
+
+Report sample:
+    type                  entities    calls  calls/ent     COM s  COM ms/ent   ms/ent
+    AcDbPolyline              1088    21356      19.63     1.068      0.9815   1.1211
+'''
+
+import sys
+from timeit import default_timer as timer
+
+
+class VcomProfiler:
+    ''' Calls count and time per entity type and call name
+    '''
+    def __init__(self):
+        self.stats = {} # type: {call name: [count, seconds]}
+        self.entities = {} # type: [count, seconds]
+        self.current = {}
+        self.started = None
+        self.saved = None
+
+    def begin(self):
+        ''' start entity processing
+        '''
+        self.current = {}
+        self.started = timer()
+
+    def end(self, typename):
+        ''' entity processed, charge calls to typename
+        '''
+        elapsed = 0.0
+        if self.started is not None:
+            elapsed = timer() - self.started
+        self.started = None
+        ent = self.entities.setdefault(typename, [0, 0.0])
+        ent[0] += 1
+        ent[1] += elapsed
+        st = self.stats.setdefault(typename, {})
+        for k,v in self.current.items():
+            c = st.setdefault(k, [0, 0.0])
+            c[0] += v[0]
+            c[1] += v[1]
+        self.current = {}
+
+    def record(self, name, seconds):
+        if self.started is None: # outside of entity processing
+            st = self.stats.setdefault(u'(dump)', {})
+        else:
+            st = self.current
+        c = st.setdefault(name, [0, 0.0])
+        c[0] += 1
+        c[1] += seconds
+
+    def wrap(self, obj):
+        if obj is None or isinstance(obj, VcomProxy):
+            return obj
+        return VcomProxy(obj, self)
+
+    def install(self, acad):
+        ''' wrap VAcadServices document objects
+        '''
+        self.saved = (acad.doc, acad.ms, acad.u)
+        acad.doc, acad.ms, acad.u = [self.wrap(o) for o in self.saved]
+
+    def uninstall(self, acad):
+        if self.saved:
+            acad.doc, acad.ms, acad.u = self.saved
+        self.saved = None
+
+    def totals(self, typename):
+        ''' (calls, COM seconds) for entity type
+        '''
+        calls,secs = (0, 0.0)
+        for c,s in self.stats.get(typename, {}).values():
+            calls += c
+            secs += s
+        return (calls, secs)
+
+    def report(self, details=True):
+        ''' table of calls per entity and seconds per entity for each type
+        '''
+        lst = [u'%-24s %9s %9s %10s %9s %11s %9s' % (
+            u'type', u'entities', u'calls', u'calls/ent', u'COM s', u'COM ms/ent', u'ms/ent')]
+        for t in sorted(self.stats.keys()):
+            n,secs = self.entities.get(t, [0, 0.0])
+            calls,comsecs = self.totals(t)
+            div = float(max(n, 1))
+            lst.append(u'%-24s %9i %9i %10.2f %9.3f %11.4f %9.4f' % (
+                t, n, calls, calls / div, comsecs, 1000.0 * comsecs / div, 1000.0 * secs / div))
+            if details:
+                st = self.stats[t]
+                for k in sorted(st.keys(), key=lambda k: st[k][1], reverse=True):
+                    c,s = st[k]
+                    lst.append(u'    %-20s %9s %9i %10.2f %9.3f %11.4f' % (
+                        k, u'', c, c / div, s, 1000.0 * s / div))
+        return u'\n'.join(lst)
+
+    def __str__(self):
+        return self.report()
+#class VcomProfiler:
+
+
+class VcomProxy(object):
+    ''' AutoCAD object wrapper, each attribute access and method call accounted
+    '''
+    __slots__ = ('_obj', '_prof')
+
+    def __init__(self, obj, prof):
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_prof', prof)
+
+    def __getattr__(self, name):
+        prof = self._prof
+        start = timer()
+        v = getattr(self._obj, name)
+        if callable(v):
+            return VcomMethod(name, v, prof)
+        prof.record(name, timer() - start)
+        if hasattr(v, 'QueryInterface'):
+            return prof.wrap(v)
+        return v
+
+    def __setattr__(self, name, value):
+        setattr(self._obj, name, value)
+#class VcomProxy(object):
+
+
+class VcomMethod(object):
+    __slots__ = ('name', 'method', 'prof')
+
+    def __init__(self, name, method, prof):
+        self.name = name
+        self.method = method
+        self.prof = prof
+
+    def __call__(self, *args, **kwargs):
+        start = timer()
+        v = self.method(*args, **kwargs)
+        self.prof.record(self.name, timer() - start)
+        if hasattr(v, 'QueryInterface'):
+            return self.prof.wrap(v)
+        if isinstance(v, list): # IEnumVARIANT.Next batch
+            return [hasattr(x, 'QueryInterface') and self.prof.wrap(x) or x for x in v]
+        return v
+#class VcomMethod(object):
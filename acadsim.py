@@ -0,0 +1,760 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.6
+
+Offline AutoCAD ActiveX simulator.
+In-process stand-in for the part of AutoCAD object model used by dwg.dump.py and snippets.py:
+    Application.Documents, ActiveDocument
+    Document.Name, FullName, ModelSpace, Layers, SelectionSets, Utility, GetVariable, ActiveUCS
+    ModelSpace.Count, Item, _NewEnum
+    Layers.Count, Item; Layer.Name, Freeze, LayerOn
+    SelectionSets.Count, Item, Add; SelectionSet.Name, Select (acSelectionSetAll, DXF codes 0, 410),
+        Count, Item, _NewEnum, Clear, Delete
+    IEnumVARIANT.Next, Skip, Reset
+    Utility.TranslateCoordinates, Prompt
+    IAcad* entities properties, GetBulge, GetXData, QueryInterface
+
+Every property read and method call costs 'latency' seconds, like a late-bound COM call,
+and counted in VsimServer.calls.
+
+Drawings may be synthetic (makeDrawing) or recorded from real AutoCAD (recordDrawing, saved as JSON).
+
+Usage:
+    import acadsim
+    sim = acadsim.VsimServer(latency=0.00005)
+    sim.addDrawing(acadsim.makeDrawing('SIM.dwg', count=1000))
+    acadsim.install(sim) # fake comtypes.client, comtypes.gen.AutoCAD modules
+    import snippets
+
+Benchmark comtypesDump:
+    python acadsim.py --count 18000 --latency 0.00005
+    python acadsim.py --count 18000 --latency 0.00005 --enum batch --batch 500
+'''
+
+import os, sys, math, time
+import traceback
+import random
+import types
+
+import trig
+import acadconst
+import snippets
+
+cp = 'utf-8'
+ecErr = 1
+ecOK = 0
+
+
+class AutoCAD:
+    ''' comtypes.gen.AutoCAD replacement: interfaces; constants from acadconst
+    '''
+    IAcadApplication = 'IAcadApplication'
+    IAcadDocument = 'IAcadDocument'
+    IAcadUCS = 'IAcadUCS'
+    IAcadArc = 'IAcadArc'
+    IAcadBlockReference = 'IAcadBlockReference'
+    IAcadCircle = 'IAcadCircle'
+    IAcadLine = 'IAcadLine'
+    IAcadPoint = 'IAcadPoint'
+    IAcadLWPolyline = 'IAcadLWPolyline'
+    IAcadText = 'IAcadText'
+#class AutoCAD:
+
+
+# EntityType: (ObjectName, properties used by snippets.Vac* adapters)
+ENTITIES = {
+    acadconst.acBlockReference: ('AcDbBlockReference',
+        ('InsertionPoint', 'Rotation', 'Name', 'XScaleFactor', 'YScaleFactor', 'Normal')),
+    acadconst.acPolylineLight: ('AcDbPolyline',
+        ('Closed', 'Coordinates', 'Normal')),
+    acadconst.acText: ('AcDbText',
+        ('InsertionPoint', 'TextAlignmentPoint', 'TextString', 'Rotation', 'Alignment',
+        'VerticalAlignment', 'HorizontalAlignment', 'Height', 'ScaleFactor', 'Backward',
+        'StyleName', 'Normal')),
+    acadconst.acLine: ('AcDbLine',
+        ('StartPoint', 'EndPoint')),
+    acadconst.acCircle: ('AcDbCircle',
+        ('Center', 'Radius')),
+    acadconst.acArc: ('AcDbArc',
+        ('Center', 'StartPoint', 'EndPoint', 'StartAngle', 'EndAngle', 'Radius', 'Normal')),
+    acadconst.acPoint: ('AcDbPoint',
+        ('Coordinates',)),
+}
+
+# properties common for all entities
+COMMON = ('ObjectName', 'EntityType', 'ObjectID', 'Layer', 'Handle')
+
+# EntityType: DXF name, for SelectionSet filter
+DXF_NAMES = {
+    acadconst.acBlockReference: u'INSERT', acadconst.acPolylineLight: u'LWPOLYLINE',
+    acadconst.acText: u'TEXT', acadconst.acLine: u'LINE', acadconst.acCircle: u'CIRCLE',
+    acadconst.acArc: u'ARC', acadconst.acPoint: u'POINT'}
+
+
+class COMError(Exception):
+    ''' comtypes.COMError replacement
+    '''
+    pass
+
+
+class VsimServer:
+    ''' Simulator state: drawings, latency, calls accounting
+    '''
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = {}
+        self.drawings = {}
+        self.application = VsimApplication(self)
+
+    def tick(self, name):
+        ''' one COM call
+        '''
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency > 0.0:
+            if self.latency >= 0.001:
+                time.sleep(self.latency)
+            else: # time.sleep too coarse for microseconds
+                t = time.time() + self.latency
+                while time.time() < t: pass
+
+    def totalCalls(self):
+        return sum(self.calls.values())
+
+    def resetCalls(self):
+        self.calls = {}
+
+    def addDrawing(self, drawing):
+        self.drawings[drawing['name'].lower()] = drawing
+        if self.application.docs.count() == 0:
+            self.application.docs.add(drawing)
+
+    def getDrawing(self, fname):
+        ''' registered drawing by file name; recorded drawing from JSON file;
+        or synthetic drawing with seed based on file name
+        '''
+        name = os.path.basename(fname.replace('\\', '/'))
+        d = self.drawings.get(name.lower())
+        if d is not None:
+            return d
+        if fname.lower().endswith('.json') and os.path.exists(fname):
+            d = loadDrawing(fname)
+        else:
+            d = makeDrawing(name, seed=sum(map(ord, name)))
+        d['fullname'] = fname
+        self.drawings[name.lower()] = d
+        return d
+#class VsimServer:
+
+
+class VsimObject(object):
+    ''' COM object: properties from self._props, each read is a COM call
+    '''
+    def __init__(self, sim, props=None):
+        object.__setattr__(self, '_sim', sim)
+        object.__setattr__(self, '_props', props or {})
+
+    def __getattr__(self, name):
+        props = object.__getattribute__(self, '_props')
+        if name.startswith('_') or name not in props:
+            raise AttributeError(name)
+        object.__getattribute__(self, '_sim').tick(name)
+        return props[name]
+
+    def QueryInterface(self, interface):
+        self._sim.tick('QueryInterface')
+        return self
+#class VsimObject(object):
+
+
+class VsimApplication(VsimObject):
+    def __init__(self, sim):
+        super(VsimApplication, self).__init__(sim)
+        self.docs = VsimDocuments(sim)
+        self._props['Name'] = u'AutoCAD simulator'
+
+    @property
+    def Documents(self):
+        self._sim.tick('Documents')
+        return self.docs
+
+    @property
+    def ActiveDocument(self):
+        self._sim.tick('ActiveDocument')
+        if self.docs.active is None: # new AutoCAD instance have empty drawing
+            self.docs.add(makeDrawing('Drawing1.dwg', count=0))
+        return self.docs.active
+
+    def Quit(self):
+        self._sim.tick('Quit')
+        self.docs.docs = []
+        self.docs.active = None
+#class VsimApplication(VsimObject):
+
+
+class VsimDocuments(VsimObject):
+    def __init__(self, sim):
+        super(VsimDocuments, self).__init__(sim)
+        self.docs = []
+        self.active = None
+
+    def count(self):
+        return len(self.docs)
+
+    def add(self, drawing):
+        doc = VsimDocument(self._sim, drawing, self)
+        self.docs.append(doc)
+        self.active = doc
+        return doc
+
+    @property
+    def Count(self):
+        self._sim.tick('Count')
+        return len(self.docs)
+
+    def Item(self, i):
+        self._sim.tick('Item')
+        return self.docs[i]
+
+    def Close(self):
+        self._sim.tick('Close')
+        self.docs = []
+        self.active = None
+
+    def Open(self, fname, ro=True):
+        self._sim.tick('Open')
+        return self.add(self._sim.getDrawing(fname))
+#class VsimDocuments(VsimObject):
+
+
+class VsimDocument(VsimObject):
+    def __init__(self, sim, drawing, docs=None):
+        super(VsimDocument, self).__init__(sim, {
+            'Name': drawing['name'],
+            'FullName': drawing.get('fullname', drawing['name'])})
+        self.drawing = drawing
+        self.docs = docs
+        self.ms = VsimModelSpace(sim, drawing['entities'])
+        self.layers = VsimLayers(sim, drawing.get('layers') or drawingLayers(drawing))
+        self.sets = VsimSelectionSets(sim, self.ms)
+        self.u = VsimUtility(sim)
+
+    @property
+    def ModelSpace(self):
+        self._sim.tick('ModelSpace')
+        return self.ms
+
+    @property
+    def Layers(self):
+        self._sim.tick('Layers')
+        return self.layers
+
+    @property
+    def SelectionSets(self):
+        self._sim.tick('SelectionSets')
+        return self.sets
+
+    @property
+    def Utility(self):
+        self._sim.tick('Utility')
+        return self.u
+
+    @property
+    def ActiveUCS(self):
+        self._sim.tick('ActiveUCS')
+        return None
+
+    def GetVariable(self, name):
+        self._sim.tick('GetVariable')
+        return self.drawing['variables'].get(name, u'')
+
+    def Close(self, save=True):
+        self._sim.tick('Close')
+        docs = self.docs
+        if docs is not None and self in docs.docs:
+            docs.docs.remove(self)
+            if docs.active is self:
+                docs.active = docs.docs and docs.docs[-1] or None
+#class VsimDocument(VsimObject):
+
+
+class VsimModelSpace(VsimObject):
+    def __init__(self, sim, entities):
+        super(VsimModelSpace, self).__init__(sim)
+        self.entities = entities
+        self.items = {}
+
+    @property
+    def Count(self):
+        self._sim.tick('Count')
+        return len(self.entities)
+
+    def Item(self, i):
+        self._sim.tick('Item')
+        return self.item(i)
+
+    @property
+    def _NewEnum(self):
+        self._sim.tick('_NewEnum')
+        return VsimEnum(self._sim, self.item, len(self.entities))
+
+    def item(self, i):
+        ''' entity object, w/o COM call
+        '''
+        o = self.items.get(i)
+        if o is None:
+            o = VsimEntity(self._sim, self.entities[i])
+            self.items[i] = o
+        return o
+#class VsimModelSpace(VsimObject):
+
+
+class VsimEnum(VsimObject):
+    ''' IEnumVARIANT over collection items, item(i) for i in range(count).
+    Next(celt) returns list of items, or (item, fetched) if celt == 1, as comtypes do.
+    '''
+    def __init__(self, sim, item, count):
+        super(VsimEnum, self).__init__(sim)
+        self.item = item
+        self.count = count
+        self.pos = 0
+
+    def Next(self, celt):
+        self._sim.tick('Next')
+        res = [self.item(i) for i in xrange(self.pos, min(self.pos + celt, self.count))]
+        self.pos += len(res)
+        if celt == 1:
+            return (res and res[0] or None, len(res))
+        return res
+
+    def Skip(self, celt):
+        self._sim.tick('Skip')
+        self.pos = min(self.pos + celt, self.count)
+
+    def Reset(self):
+        self._sim.tick('Reset')
+        self.pos = 0
+#class VsimEnum(VsimObject):
+
+
+class VsimSelectionSets(VsimObject):
+    def __init__(self, sim, ms):
+        super(VsimSelectionSets, self).__init__(sim)
+        self.ms = ms
+        self.sets = []
+
+    @property
+    def Count(self):
+        self._sim.tick('Count')
+        return len(self.sets)
+
+    def Item(self, i):
+        self._sim.tick('Item')
+        return self.sets[i]
+
+    def Add(self, name):
+        self._sim.tick('Add')
+        if [x for x in self.sets if x.name.lower() == name.lower()]:
+            raise COMError('SelectionSets.Add: duplicate record name [%s]' % name)
+        ss = VsimSelectionSet(self._sim, name, self)
+        self.sets.append(ss)
+        return ss
+#class VsimSelectionSets(VsimObject):
+
+
+class VsimSelectionSet(VsimObject):
+    ''' Selected ModelSpace entities indices; all entities are in model space
+    '''
+    def __init__(self, sim, name, sets):
+        super(VsimSelectionSet, self).__init__(sim, {'Name': name})
+        self.name = name
+        self.sets = sets
+        self.selected = []
+
+    def Select(self, mode, Point1=None, Point2=None, FilterType=None, FilterData=None):
+        self._sim.tick('Select')
+        if not mode == acadconst.acSelectionSetAll:
+            raise COMError('Select: only acSelectionSetAll simulated')
+        import fnmatch
+        names = None
+        model = True
+        for code,value in zip(FilterType or (), FilterData or ()):
+            if code == 0:
+                names = [x.strip().upper() for x in value.split(',')]
+            elif code == 410:
+                model = fnmatch.fnmatch('MODEL', value.upper())
+            else:
+                raise COMError('Select: DXF code [%s] not simulated' % code)
+        ms = self.sets.ms
+        for i,e in enumerate(ms.entities):
+            dxf = DXF_NAMES.get(e['EntityType'], u'')
+            if model and (names is None or [x for x in names if fnmatch.fnmatch(dxf, x)]):
+                self.selected.append(i)
+
+    @property
+    def Count(self):
+        self._sim.tick('Count')
+        return len(self.selected)
+
+    def Item(self, i):
+        self._sim.tick('Item')
+        return self.item(i)
+
+    @property
+    def _NewEnum(self):
+        self._sim.tick('_NewEnum')
+        return VsimEnum(self._sim, self.item, len(self.selected))
+
+    def item(self, i):
+        return self.sets.ms.item(self.selected[i])
+
+    def Clear(self):
+        self._sim.tick('Clear')
+        self.selected = []
+
+    def Delete(self):
+        self._sim.tick('Delete')
+        if self in self.sets.sets:
+            self.sets.sets.remove(self)
+#class VsimSelectionSet(VsimObject):
+
+
+class VsimLayers(VsimObject):
+    ''' Layers table, layer records: {Name, Freeze, LayerOn}
+    '''
+    def __init__(self, sim, layers):
+        super(VsimLayers, self).__init__(sim)
+        self.layers = [VsimObject(sim, dict(x)) for x in layers]
+
+    @property
+    def Count(self):
+        self._sim.tick('Count')
+        return len(self.layers)
+
+    def Item(self, i):
+        self._sim.tick('Item')
+        return self.layers[i]
+#class VsimLayers(VsimObject):
+
+
+class VsimUtility(VsimObject):
+    def TranslateCoordinates(self, point, csFrom, csTo, disp=False, norm=None):
+        ''' OCS <-> WCS by arbitrary axis algorithm; WCS == UCS == DCS in simulator
+        '''
+        self._sim.tick('TranslateCoordinates')
+        p = (point[0], point[1], point[2])
+        if csFrom == csTo:
+            return p
+        if acadconst.acOCS in (csFrom, csTo) and norm is None:
+            raise COMError('TranslateCoordinates: OCS without normal')
+        if csFrom == acadconst.acOCS:
+            p = trig.Vocs2wcs(norm).ocs2wcsP(p)
+        if csTo == acadconst.acOCS:
+            p = trig.Vocs2wcs(norm).wcs2ocsP(p)
+        return tuple(p)
+
+    def Prompt(self, msg):
+        self._sim.tick('Prompt')
+#class VsimUtility(VsimObject):
+
+
+class VsimEntity(VsimObject):
+    ''' Entity with properties from drawing record
+    '''
+    def GetBulge(self, ind):
+        self._sim.tick('GetBulge')
+        bulges = self._props.get('bulges') or ()
+        if ind < len(bulges):
+            return bulges[ind]
+        return 0.0
+
+    def GetXData(self, appname):
+        self._sim.tick('GetXData')
+        xd = self._props.get('xdata')
+        if not xd or appname != u'ESMA':
+            return (None, None)
+        return ((1001, 1000), (u'ESMA', xd))
+#class VsimEntity(VsimObject):
+
+
+################################################################################
+# drawings
+################################################################################
+
+LAYERS = (
+    u'0', u'В_1_СЕТЬ', u'В_КОЛОДЕЦ', u'В_ТЕКСТ_УЗЛЫ', u'ЗД_ЖИЛЫЕ', u'ЗД_БЕНЗОКОЛОНКИ_Т',
+    u'КС_ФОНАРИ', u'ТЕКСТ', u'УЛ_ПЛОЩАДКИ_ПРОЕЗДЫ', u'ВОДА_ВОДОХРАНИЛИЩА')
+
+XDATA = (
+    u'', u'/99:56044000/ДМ:800/МТ:жб/00:"Гильза водопровода"/', u'/00:"Фонари"/99:56017200/',
+    u'/00:"Водопровод"/99:56041000/ДМ:1000/МТ:ЖБ/', u'/99:44110000/00:"Здания жилые"/',
+    u'/00:"Смотровой колодец"/99:55141000/НН:202.29-/', u'/99:T1000000/00:"Опорные точки"/')
+
+# layers (Freeze, LayerOn) other than (False, True)
+LAYER_STATES = {u'КС_ФОНАРИ': (False, False), u'ВОДА_ВОДОХРАНИЛИЩА': (True, True)}
+
+BLOCKS = (u'AZS', u'FOUNTAIN', u'LANTERN', u'LIGHT', u'LP', u'PHONE', u'WELLTS')
+
+
+def makeDrawing(name='SIM.dwg', count=1000, seed=1, vertices=(2, 40), bigone=0):
+    ''' Synthetic drawing with 'count' entities of all supported types.
+    Most entities have Normal (0,0,1), some (0,0,-1), as in real sheets.
+    vertices: polyline vertex count range; bigone: vertex count for one extra huge polyline.
+    '''
+    rnd = random.Random(seed)
+    weights = (
+        (acadconst.acPolylineLight, 55), (acadconst.acBlockReference, 28), (acadconst.acText, 15),
+        (acadconst.acLine, 1), (acadconst.acCircle, 1), (acadconst.acArc, 1), (acadconst.acPoint, 1))
+    etypes = []
+    for t,w in weights: etypes.extend([t] * w)
+
+    entities = []
+    for i in xrange(count):
+        etype = rnd.choice(etypes)
+        entities.append(makeEntity(rnd, etype, i, vertices))
+    if bigone:
+        entities.append(makeEntity(rnd, acadconst.acPolylineLight, count, (bigone, bigone)))
+
+    return {
+        'name': name,
+        'fullname': name,
+        'variables': {
+            u'UCSNAME': u'', u'UCSXDIR': (0.0, 1.0, 0.0), u'UCSYDIR': (1.0, 0.0, 0.0),
+            u'UCSORG': (0.0, 0.0, 0.0), u'DWGPREFIX': u''},
+        'layers': [{'Name': x, 'Freeze': LAYER_STATES.get(x, (False, True))[0],
+            'LayerOn': LAYER_STATES.get(x, (False, True))[1]} for x in LAYERS],
+        'entities': entities}
+#def makeDrawing(name='SIM.dwg', count=1000, seed=1, vertices=(2, 40), bigone=0):
+
+
+def drawingLayers(drawing):
+    ''' Layers records for drawing w/o layers table (recorded before): entities layers, all visible
+    '''
+    names = sorted(set([e['Layer'] for e in drawing['entities']]))
+    return [{'Name': x, 'Freeze': False, 'LayerOn': True} for x in names]
+
+
+def makeEntity(rnd, etype, num, vertices=(2, 40)):
+    ''' entity record (dict of properties) for simulator
+    '''
+    norm = (0.0, 0.0, 1.0)
+    if rnd.random() < 0.1:
+        norm = (0.0, 0.0, -1.0)
+    ocs = trig.Vocs2wcs(norm)
+    x,y = (rnd.uniform(1000.0, 6000.0), rnd.uniform(1000.0, 4000.0))
+    # WCS point for OCS (x,y)
+    wp = lambda x, y: ocs.ocs2wcs(x, y)
+
+    e = {
+        'ObjectName': ENTITIES[etype][0], 'EntityType': etype,
+        'ObjectID': 2100000000 + num * 8, 'Handle': u'%X' % (0x1000 + num),
+        'Layer': rnd.choice(LAYERS), 'xdata': rnd.choice(XDATA)}
+
+    if etype == acadconst.acPolylineLight:
+        n = rnd.randint(vertices[0], vertices[1])
+        coords = []
+        for i in xrange(n):
+            coords.extend((x, y))
+            x += rnd.uniform(-5.0, 5.0)
+            y += rnd.uniform(-5.0, 5.0)
+        bulges = ()
+        if rnd.random() < 0.1:
+            bulges = tuple([rnd.choice((0.0, 0.0, 0.26052, -0.40485, 1.0)) for i in xrange(n)])
+        e.update({'Closed': rnd.random() < 0.5, 'Coordinates': tuple(coords), 'Normal': norm,
+            'bulges': bulges})
+    elif etype == acadconst.acBlockReference:
+        e.update({'InsertionPoint': wp(x, y), 'Rotation': rnd.uniform(0.0, 2*math.pi),
+            'Name': rnd.choice(BLOCKS), 'XScaleFactor': 1.0, 'YScaleFactor': 1.0, 'Normal': norm})
+    elif etype == acadconst.acText:
+        e.update({'InsertionPoint': wp(x, y), 'TextAlignmentPoint': (0.0, 0.0, 0.0),
+            'TextString': rnd.choice((u'150', u'кер', u'5кж', u'119ст')),
+            'Rotation': rnd.uniform(0.0, 2*math.pi), 'Alignment': 0, 'VerticalAlignment': 0,
+            'HorizontalAlignment': 0, 'Height': 3.0, 'ScaleFactor': 1.0, 'Backward': False,
+            'StyleName': u'ROMANS', 'Normal': norm})
+    elif etype == acadconst.acLine:
+        e.update({'StartPoint': (x, y, 0.0),
+            'EndPoint': (x + rnd.uniform(-50.0, 50.0), y + rnd.uniform(-50.0, 50.0), 0.0)})
+    elif etype == acadconst.acCircle:
+        e.update({'Center': (x, y, 0.0), 'Radius': rnd.uniform(0.5, 20.0)})
+    elif etype == acadconst.acArc:
+        r = rnd.uniform(0.5, 20.0)
+        sa,ea = (rnd.uniform(0.0, 2*math.pi), rnd.uniform(0.0, 2*math.pi))
+        s = trig.AutoLISP.polar(x, y, sa, r)
+        t = trig.AutoLISP.polar(x, y, ea, r)
+        e.update({'Center': wp(x, y), 'StartPoint': wp(s[0], s[1]), 'EndPoint': wp(t[0], t[1]),
+            'StartAngle': sa, 'EndAngle': ea, 'Radius': r, 'Normal': norm})
+    elif etype == acadconst.acPoint:
+        e.update({'Coordinates': (x, y, 0.0)})
+    return e
+#def makeEntity(rnd, etype, num, vertices=(2, 40)):
+
+
+def recordDrawing(doc, fname=''):
+    ''' Record entities properties from AutoCAD document (real or simulated)
+    to drawing dict; save it as JSON if fname given.
+    '''
+    ms = doc.ModelSpace
+    entities = []
+    for i in xrange(ms.Count):
+        item = ms.Item(i)
+        e = {}
+        for k in COMMON:
+            e[k] = getattr(item, k)
+        if e['EntityType'] not in ENTITIES:
+            continue
+        for k in ENTITIES[e['EntityType']][1]:
+            e[k] = getattr(item, k)
+        if e['EntityType'] == acadconst.acPolylineLight:
+            e['bulges'] = tuple([item.GetBulge(n) for n in xrange(len(e['Coordinates']) / 2)])
+        xd1,xd2 = item.GetXData(u'ESMA')
+        e['xdata'] = xd2 and xd2[1] or u''
+        entities.append(e)
+
+    layers = doc.Layers
+    lst = []
+    for i in xrange(layers.Count):
+        lyr = layers.Item(i)
+        lst.append({'Name': lyr.Name, 'Freeze': lyr.Freeze, 'LayerOn': lyr.LayerOn})
+
+    d = {
+        'name': doc.Name, 'fullname': doc.FullName, 'layers': lst,
+        'variables': dict([(k, doc.GetVariable(k)) for k in (
+            u'UCSNAME', u'UCSXDIR', u'UCSYDIR', u'UCSORG', u'DWGPREFIX')]),
+        'entities': entities}
+    if fname:
+        saveDrawing(d, fname)
+    return d
+#def recordDrawing(doc, fname=''):
+
+
+def saveDrawing(drawing, fname):
+    import json
+    f = open(fname, 'wb')
+    try:
+        json.dump(drawing, f)
+    finally:
+        f.close()
+
+def loadDrawing(fname):
+    ''' Recorded drawing from JSON; points restored as tuples
+    '''
+    import json
+    f = open(fname, 'rb')
+    try:
+        d = json.load(f)
+    finally:
+        f.close()
+    for e in d['entities']:
+        for k,v in e.items():
+            if isinstance(v, list): e[k] = tuple(v)
+    for k,v in d['variables'].items():
+        if isinstance(v, list): d['variables'][k] = tuple(v)
+    return d
+
+
+################################################################################
+# comtypes replacement
+################################################################################
+
+def install(sim):
+    ''' Register simulator as comtypes.client, comtypes.gen.AutoCAD modules,
+    so snippets.py and dwg.dump.py can be imported and run without AutoCAD.
+    Must be called before importing snippets.
+    '''
+    comtypes = types.ModuleType('comtypes')
+    client = types.ModuleType('comtypes.client')
+    automation = types.ModuleType('comtypes.automation')
+    gen = types.ModuleType('comtypes.gen')
+    acad = types.ModuleType('comtypes.gen.AutoCAD')
+
+    client.GetActiveObject = lambda progid: sim.application
+    client.CreateObject = lambda progid, interface=None: sim.application
+    client.GetModule = lambda fname: None
+    for k,v in acadconst.constants().items():
+        setattr(acad, k, v)
+    for k in dir(AutoCAD):
+        if not k.startswith('_'):
+            setattr(acad, k, getattr(AutoCAD, k))
+    automation.IEnumVARIANT = 'IEnumVARIANT'
+    comtypes.COMError = COMError
+    comtypes.client = client
+    comtypes.automation = automation
+    comtypes.gen = gen
+    gen.AutoCAD = acad
+
+    sys.modules['comtypes'] = comtypes
+    sys.modules['comtypes.client'] = client
+    sys.modules['comtypes.automation'] = automation
+    sys.modules['comtypes.gen'] = gen
+    sys.modules['comtypes.gen.AutoCAD'] = acad
+    return sim
+#def install(sim):
+
+
+def benchmark(sim, dumper, dumpArgs=()):
+    ''' Run comtypesDump on active simulated document, print time and COM calls.
+    dumpArgs: dwg.dump.py options, e.g. ['--profile']
+    '''
+    sim.resetCalls()
+    start = time.time()
+    dumper.comtypesDump(dumper.parseArgs(list(dumpArgs))[0])
+    elapsed = time.time() - start
+    count = len(sim.application.docs.active.drawing['entities'])
+    calls = sim.totalCalls()
+    print >> sys.stderr, 'benchmark: entities [%i], time [%0.3f] s, COM calls [%i], calls/entity [%0.2f], ms/entity [%0.4f]' % (
+        count, elapsed, calls, float(calls) / max(count, 1), 1000.0 * elapsed / max(count, 1))
+    for k in sorted(sim.calls, key=sim.calls.get, reverse=True):
+        print >> sys.stderr, '  %s: %i' % (k, sim.calls[k])
+    return elapsed
+
+
+def parseArgs(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage='%prog [options]')
+    parser.add_option('--count', dest='count', type='int', default=1000,
+        help='synthetic drawing entities count')
+    parser.add_option('--seed', dest='seed', type='int', default=1)
+    parser.add_option('--bigone', dest='bigone', type='int', default=0,
+        help='add polyline with BIGONE vertices')
+    parser.add_option('--latency', dest='latency', type='float', default=0.0,
+        help='seconds per COM call, e.g. 0.00005')
+    parser.add_option('--drawing', dest='drawing', default='',
+        help='recorded drawing (JSON) instead of synthetic one')
+    parser.add_option('--save', dest='save', default='',
+        help='save drawing to JSON file')
+    parser.add_option('--profile', dest='profile', action='store_true', default=False,
+        help='dwg.dump.py --profile, COM calls per entity type')
+    parser.add_option('--enum', dest='enum', default='index',
+        help='dwg.dump.py --enum: index, batch or select')
+    parser.add_option('--batch', dest='batch', type='int', default=100,
+        help='dwg.dump.py --batch, entities per enumerator call')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    argc = len(sys.argv)
+    res = ecErr
+    print 'begin [%s], argc: [%s], argv: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), argc, sys.argv)
+    opts,args = parseArgs(sys.argv[1:])
+    try:
+        if opts.drawing:
+            d = loadDrawing(opts.drawing)
+        else:
+            d = makeDrawing('SIM.dwg', count=opts.count, seed=opts.seed, bigone=opts.bigone)
+        if opts.save:
+            saveDrawing(d, opts.save)
+        sim = install(VsimServer(latency=opts.latency))
+        sim.addDrawing(d)
+        dumpArgs = ['--enum', opts.enum, '--batch', str(opts.batch)]
+        if opts.profile: dumpArgs.append('--profile')
+        benchmark(sim, snippets.loadDumper(), dumpArgs)
+        res = ecOK
+        print 'done [%s]' % res
+    except Exception, e:
+        print 'Error, benchmark failed:'
+        traceback.print_exc(file=sys.stderr)
+    print 'end [%s], argc: [%s], argv: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), argc, sys.argv)
+    sys.exit(res)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.6
+
+Batch extraction, replacement for rip.cmd loop.
+Reads DWG file names from list file (dwg.list), starts N worker processes,
+each worker owns its AutoCAD session (new AutoCAD instance if N > 1) and takes
+next file from queue when previous one is done (dwg.dump.py session mode, one connection per worker).
+Like rip.cmd, output for each file goes to <name.dwg>.log and <name.dwg>.err in current directory,
+data to <name.dwg>.csv (or other dwg.dump.py --sink), stats to <name.dwg>.stats.json; stats of all files merged
+and written to dwg.dump.py --summary FILE.
+DWG files not changed since last run skipped (dwg.dump.py --manifest, manifest.py).
+
+Usage:
+    python dwg.batch.py [options] [dwg.list] [-- dwg.dump.py options]
+    python dwg.batch.py -j 4 dwg.list
+    python dwg.batch.py -j 4 --sim --latency 0.00005 dwg.list -- --profile
+    python dwg.batch.py dwg.list -- --force
+    python dwg.batch.py -j 4 dwg.list -- --summary dwg.stats.json
+'''
+
+import os, sys, time
+import traceback
+import multiprocessing, Queue
+
+cp = 'utf-8'
+ecErr = 1
+ecOK = 0
+
+
+def worker(tasks, results, opts, dumpArgs):
+    ''' Worker process: own AutoCAD session, files from tasks queue until None
+    '''
+    if opts.sim:
+        import acadsim
+        acadsim.install(acadsim.VsimServer(latency=opts.latency))
+    import snippets
+    dumper = snippets.loadDumper()
+    dopts = dumper.parseArgs(list(dumpArgs))[0]
+    dopts.session = True
+    dopts.manifest = '' # manifest kept by parent process
+    dumper.setup(dopts)
+    newInstance = opts.jobs > 1
+    try:
+        dumper.VAcad.connect(new=newInstance)
+    except Exception, e:
+        traceback.print_exc(file=sys.stderr)
+        fname = tasks.get()
+        while fname is not None:
+            results.put((fname, ecErr, 0.0))
+            fname = tasks.get()
+        return
+
+    while True:
+        fname = tasks.get()
+        if fname is None: break
+        results.put(dumper.dumpFile(fname, dopts, True))
+
+    dumper.VAcad.closeDWG()
+    if newInstance:
+        dumper.VAcad.quit()
+#def worker(tasks, results, opts, dumpArgs):
+
+
+def doWork(files, opts, dumpArgs=()):
+    ''' Extract all files with opts.jobs workers.
+    Files not changed since last extraction (dwg.dump.py manifest) skipped.
+    '''
+    print 'doWork, files [%i], jobs [%i]...' % (len(files), opts.jobs)
+    start = time.time()
+    import snippets
+    dumper = snippets.loadDumper()
+    dopts = dumper.parseArgs(list(dumpArgs))[0]
+    mf = None
+    infos = {}
+    if dopts.manifest is None: dopts.manifest = dumper.MANIFEST
+    if dopts.manifest:
+        mf = dumper.getManifest(dopts.manifest, dopts)
+        todo = []
+        for fname in files:
+            if not dopts.force and mf.check(fname):
+                print 'file [%s] not changed, skip' % fname
+                continue
+            infos[fname] = mf.fileInfo(fname)
+            todo.append(fname)
+        mf.save()
+        print '%s, files to extract [%i]' % (mf, len(todo))
+        files = todo
+
+    tasks = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    for fname in files:
+        tasks.put(fname)
+    procs = []
+    for n in range(opts.jobs):
+        tasks.put(None)
+        p = multiprocessing.Process(target=worker, args=(tasks, results, opts, dumpArgs))
+        p.start()
+        procs.append(p)
+
+    res = ecOK
+    done = 0
+    total = dumper.VdumpStats()
+    while done < len(files):
+        try:
+            fname,code,secs = results.get(True, 1.0)
+        except Queue.Empty:
+            if [p for p in procs if p.is_alive()]: continue
+            print 'Error, workers died, files not reported [%i]' % (len(files) - done)
+            res = ecErr
+            break
+        done += 1
+        print 'file [%s], res [%s], time [%0.3f] s' % (fname, code, secs)
+        if not code == ecOK:
+            res = ecErr
+            continue
+        dumper.mergeStats(total, fname)
+        if mf and infos.get(fname):
+            mf.update(fname, dumper.outputName(fname, dopts), infos[fname])
+            mf.save()
+    for p in procs:
+        p.join()
+
+    elapsed = time.time() - start
+    print 'files [%i], jobs [%i], time [%0.3f] s, files/min [%0.2f]' % (
+        len(files), opts.jobs, elapsed, 60.0 * len(files) / max(elapsed, 0.001))
+    print (u'stats: %s' % total).encode(cp)
+    if dopts.summary:
+        total.save(dopts.summary)
+    return res
+#def doWork(files, opts, dumpArgs=()):
+
+
+def parseArgs(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage='%prog [options] [dwg.list] [-- dwg.dump.py options]')
+    parser.add_option('-j', '--jobs', dest='jobs', type='int', default=multiprocessing.cpu_count(),
+        help='number of worker processes (AutoCAD instances)')
+    parser.add_option('--sim', dest='sim', action='store_true', default=False,
+        help='use AutoCAD simulator (acadsim.py) instead of AutoCAD')
+    parser.add_option('--latency', dest='latency', type='float', default=0.0,
+        help='simulator: seconds per COM call')
+    return parser.parse_args(argv)
+#def parseArgs(argv):
+
+
+if __name__ == '__main__':
+    argc = len(sys.argv)
+    res = ecErr
+    print 'begin [%s], argc: [%s], argv: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), argc, sys.argv)
+    opts,args = parseArgs(sys.argv[1:])
+    lst = 'dwg.list'
+    if args: lst = args[0]
+
+    try:
+        import snippets
+        res = doWork(snippets.loadDumper().readList(lst), opts, args[1:])
+        print 'done [%s]' % res
+    except Exception, e:
+        print 'Error, doWork failed:'
+        traceback.print_exc(file=sys.stderr)
+    print 'end [%s], argc: [%s], argv: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), argc, sys.argv)
+    sys.exit(res)
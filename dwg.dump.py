@@ -48,28 +48,57 @@ extra info:
 
 import os, sys, time
 import traceback
-import csv
-import comtypes.client
+import sinks
 
+# AutoCAD (constants, interfaces), VAcad (connected on first use)
 from snippets import *
 
-# c:\Python25\Lib\site-packages\comtypes\gen\_D32C213D_6096_40EF_A216_89A3A6FB82F7_0_1_0.py
-import comtypes.gen.AutoCAD as AutoCAD
-
 cp = 'utf-8'
 ecErr = 1
 ecOK = 0
 
-
-def doWork(dwg=''):
+# output columns, listHeads order; dwg.dump.py --columns
+COLUMNS = ('dwg', 'typename', 'typenum', 'layer', 'id', 'handle', 'attribs',
+    'coords', 'angle', 'text', 'closed', 'radius')
+# VacItem columns read from entity properties, besides typename (ObjectName)
+ITEM_PROPS = (('typenum', 'EntityType'), ('layer', 'Layer'), ('id', 'ObjectID'),
+    ('handle', 'Handle'), ('attribs', 'GetXData'))
+# ObjectName: DXF name, for SelectionSet filter (--enum select)
+DXF_NAMES = {
+    'AcDbBlockReference': u'INSERT', 'AcDbPolyline': u'LWPOLYLINE', 'AcDbText': u'TEXT',
+    'AcDbLine': u'LINE', 'AcDbCircle': u'CIRCLE', 'AcDbArc': u'ARC', 'AcDbPoint': u'POINT'}
+SELECTION_NAME = u'DWGDUMP'
+# manifest for session, watch and dwg.batch.py w/o --manifest FILE
+MANIFEST = 'dwg.manifest.json'
+# checkpoint interval for --resume w/o --checkpoint N
+CHECKPOINT_INTERVAL = 1000
+# ObjectName: EntityType, for supported entities
+ENTITY_TYPES = {
+    'AcDbBlockReference': AutoCAD.acBlockReference, 'AcDbPolyline': AutoCAD.acPolylineLight,
+    'AcDbText': AutoCAD.acText, 'AcDbLine': AutoCAD.acLine, 'AcDbCircle': AutoCAD.acCircle,
+    'AcDbArc': AutoCAD.acArc, 'AcDbPoint': AutoCAD.acPoint}
+
+
+def doWork(dwg='', opts=None):
     ''' Dump data from DWG
+    opts: options from parseArgs
     '''
     print 'doWork...'
     #~ axDump()
 
+    if opts is None: opts = parseArgs([])[0]
+    mf = info = None
+    if dwg and opts.manifest:
+        mf = getManifest(opts.manifest, opts)
+        if not opts.force and mf.check(dwg):
+            print 'DWG not changed since last extraction, skip [%s]' % dwg
+            mf.save()
+            return ecOK
+        info = mf.fileInfo(dwg)
+
     if dwg:
         print 'try load DWG [%s]' % dwg
-        VAcad.openDWG(dwg)
+        VAcad.openDWG(dwg, closeAll=not opts.session)
         #~ acad = comtypes.client.GetActiveObject('AutoCAD.Application')
         #~ ac = CType(acad, AutoCAD.IAcadApplication)
         #~ docs = ac.Documents
@@ -77,15 +106,37 @@ def doWork(dwg=''):
         #~ doc = docs.Open(dwg, True)
         #~ print 'dwg name [%s], fullname [%s], dwgprefix var [%s]' % (doc.Name, doc.FullName, doc.GetVariable('DWGPREFIX'))
 
-    comtypesDump()
+    csvName = comtypesDump(opts)
+    if mf and info:
+        mf.update(dwg, csvName, info)
+        mf.save()
     return ecOK
-# def doWork(dwg=''):
+# def doWork(dwg='', opts=None):
+
+
+def getManifest(fname, opts):
+    ''' manifest.Vmanifest for this extractor version, one per file name and output options in session.
+    Extractor version: dumper and output sinks sources, options affecting output (outputKey)
+    '''
+    import manifest, snippets, trig, acadconst
+    extra = outputKey(opts)
+    mf = manifests.get((fname, extra))
+    if mf is None:
+        sources = [__file__, snippets.__file__, trig.__file__, acadconst.__file__] + sinks.sinkSources(opts.sinks or ['csv'])
+        mf = manifests[(fname, extra)] = manifest.Vmanifest(fname, manifest.extractorVersion(sources, extra))
+    return mf
+manifests = {}
 
 
-def comtypesDump():
+
+def comtypesDump(opts=None):
     '''
     Enumerate objects from ModelSpace in current DWG;
     output objects data to file dwgname.csv.
+    With opts.profile COM calls counted and timed per entity type (acadprof.VcomProfiler).
+    With filter options (--layer, --exclude-layer, --type, --code, --visible) rejected entities
+    not dumped, only ObjectName, Layer, XData read for them (Vfilter).
+    Entities taken by ModelSpace.Item(i) or enumerated by batches (--enum, entitySource, entityItems).
 
     eXtended data sample:
     xd(
@@ -111,6 +162,8 @@ def comtypesDump():
         УЛ_ТРАМВАЙНЫЕ_ЛИНИИ:7]
     types [AcDbArc:1;AcDbBlockReference:5322;AcDbCircle:4;AcDbLine:7;AcDbPolyline:10421;AcDbText:3054]
     noXDCount [3257], dupIDs [0]
+
+    the same stats as JSON in name.dwg.stats.json (VdumpStats)
     '''
     print 'comtypesDump...'
     #~ acad = comtypes.client.GetActiveObject('AutoCAD.Application')
@@ -120,82 +173,361 @@ def comtypesDump():
     #~ print 'dwg name [%s], fullname [%s], dwgprefix var [%s]' % (doc.Name, doc.FullName, doc.GetVariable('DWGPREFIX'))
     #~ ms = doc.ModelSpace
 
+    if opts is None: opts = parseArgs([])[0]
+    prof = None
+    if opts.profile:
+        import acadprof
+        prof = acadprof.VcomProfiler()
+        prof.install(VAcad)
+
     count = VAcad.ms.Count
     print 'objects count [%i]' % count
-    lyrDict = VCountStrings()
-    nameDict = VCountStrings()
-    idDict = VCountStrings()
-    noXDCount = 0
-    csvWriter = VcsvWriter('%s.csv' % VAcad.doc.Name)
-
-    for i in range(count):
-        #~ if i > 100: break
-        item = VacItem(VAcad.ms.Item(i))
-
-        if nameDict.push(item.name) == 1:
-            print >> sys.stderr, (u'new type, num [%i], item [%s]' % (i+1, item)).encode(cp)
-            if not item.ent:
-                raise NameError('Need EntityType adapter! [%s]' % item.name)
-
-        if lyrDict.push(item.lyr) == 1:
-            print >> sys.stderr, (u'new lyr, num [%i], item [%s]' % (i+1, item)).encode(cp)
-            pass
-
-        if idDict.push('%s' % item.id) > 1:
-            print >> sys.stderr, 'num [%i], duplicate ID [%s %s]' % (i+1, item.name, item.id)
-
-        if not item.xd2[1]:
-            #~ print >> sys.stderr, 'num [%i], XData is None! [%s %s]' % (i+1, item.name, item.id)
-            noXDCount += 1
-
-        if i == 0:
-            csvWriter.writerow([(u'DWG file: %s\nObjects: %u\nUCSMatrix: %r\n' %
-                (VAcad.doc.FullName, count, VAcad.getUCSMatrix())).encode(cp) +
-                item.description(cp)])
-            csvWriter.writerow([u'dwg'] + item.listHeads(cp))
-
-        csvWriter.writerow([VAcad.doc.Name[:-4]] + item.listValues(cp))
-
-        #~ if item.handle == '7598': break
-        #~ if item.handle == '73DD': break
-    #for i in range(count): for each entity
-
-    del csvWriter
-    print (u'layers [%s]' % lyrDict.toStr()).encode(cp)
-    print (u'types [%s]' % nameDict.toStr()).encode(cp)
-    print 'noXDCount [%i], dupIDs [%i]' % (noXDCount, count - len(idDict.dict))
+    coll,total = entitySource(opts)
+    if not total == count:
+        print 'selected [%i]' % total
+    flt = makeFilter(opts)
+    cols = projection(opts, flt)
+    stats = VdumpStats(VAcad.doc.FullName, count)
+    base = VAcad.doc.Name
+    dwgName = base[:-4]
+    sinkNames = opts.sinks or ['csv']
+    fnames = [sinks.sinkName(n, base) for n in sinkNames]
+    interval = opts.checkpoint or (opts.resume and CHECKPOINT_INTERVAL) or 0
+    ckpt = Vcheckpoint(fnames[0] + '.ckpt', VAcad.doc.FullName, total, interval, fnames, outputKey(opts))
+    start,offsets = (0, [None] * len(fnames))
+    # trig.arcTemplates shared by all drawings: stats of this dump are counters less start values
+    arcs = (trig.arcTemplates.hits, trig.arcTemplates.misses)
+    if opts.resume:
+        state = ckpt.load(fnames)
+        if state and coll.Item(state['index'] - 1).Handle == state['handle']:
+            start,offsets = (state['index'], state['offsets'])
+            stats.load(state['stats'])
+            arcs = (arcs[0] - stats.arcHits, arcs[1] - stats.arcMisses)
+            if flt and state.get('filter'): flt.stats = state['filter']
+            print 'resume from checkpoint, num [%i], offsets %s' % (start, offsets)
+        else:
+            print 'no valid checkpoint [%s], dump from beginning' % ckpt.fname
+    out = sinks.openSinks(sinkNames, base, offsets, opts.bufsize * 1024, makeTolerance(opts))
+    if ckpt.interval and not out.resumable:
+        print 'sinks [%s] can not be resumed, no checkpoints' % ', '.join(
+            [n for n,s in zip(sinkNames, out.sinks) if not s.resumable])
+        ckpt.interval = 0
+
+    try:
+        if start == 0 and count > 0:
+            item = VacItem()
+            item.ent = VacEntity()
+            descr = u'DWG file: %s\nObjects: %u\nUCSMatrix: %r\n' % (VAcad.doc.FullName, count, VAcad.getUCSMatrix())
+            if cols is not None:
+                descr += u'Columns: %s\n' % u', '.join([x for x in COLUMNS if x in cols or x in ('dwg', 'typename')])
+            out.header(descr.encode(cp) + item.description(cp), item.listHeads(cp))
+
+        for i,acItem in entityItems(coll, total, opts, start):
+            #~ if i > 100: break
+            if prof: prof.begin()
+            item = VacItem()
+            if not item.configure(acItem, flt, cols):
+                if prof: prof.end(item.name)
+                if ckpt.due(i + 1):
+                    stats.countArcs(arcs)
+                    ckpt.save(i + 1, acItem.Handle, out, stats, flt)
+                continue
+
+            if item.skipped: stats.addSkipped(item.name, item.skipped)
+            if stats.addType(item.name) == 1:
+                print >> sys.stderr, (u'new type, num [%i], item [%s]' % (i+1, item)).encode(cp)
+                if not item.ent:
+                    raise NameError('Need EntityType adapter! [%s]' % item.name)
+
+            if stats.addLayer(item.lyr) == 1:
+                print >> sys.stderr, (u'new lyr, num [%i], item [%s]' % (i+1, item)).encode(cp)
+                pass
+
+            if not item.id == '' and not stats.addID(item.id):
+                print >> sys.stderr, 'num [%i], duplicate ID [%s %s]' % (i+1, item.name, item.id)
+
+            if (cols is None or 'attribs' in cols) and not item.xd2[1]:
+                #~ print >> sys.stderr, 'num [%i], XData is None! [%s %s]' % (i+1, item.name, item.id)
+                stats.noXData += 1
+
+            out.write(dwgName, item)
+            if prof: prof.end(item.name)
+            if ckpt.due(i + 1):
+                stats.countArcs(arcs)
+                ckpt.save(i + 1, item.handle or acItem.Handle, out, stats, flt)
+
+            #~ if item.handle == '7598': break
+            #~ if item.handle == '73DD': break
+        #for i in range(count): for each entity
+
+    finally:
+        out.close()
+        if not coll is VAcad.ms:
+            coll.Delete()
+        if prof: prof.uninstall(VAcad)
+    ckpt.remove()
+    if flt: stats.filter = dict(flt.stats)
+    stats.countArcs(arcs)
+    stats.save(statsName(base))
+    print (u'layers [%s]' % dict2string(stats.layers)).encode(cp)
+    print (u'types [%s]' % dict2string(stats.types)).encode(cp)
+    print 'noXDCount [%i], dupIDs [%i]' % (stats.noXData, stats.dupIDs)
+    if flt:
+        print (u'filter: %s' % flt).encode(cp)
+    if cols is not None:
+        print 'projection: columns [%s], property reads skipped [%i], by type [%s]' % (
+            ', '.join([x for x in COLUMNS if x in cols]), sum(stats.skipped.values()), dict2string(stats.skipped))
+    print 'trans: local [%(local)i], COM [%(com)i], verified [%(verified)i]' % VAcad.transCount
+    print 'OCS cache: %s' % VAcad.ocsCache
+    print 'XData cache: %s' % xdataCache
+    print 'Arc templates: hits [%i], misses [%i], hit rate [%0.1f%%], size [%i]' % (
+        stats.arcHits, stats.arcMisses, 100.0 * stats.arcHits / max(1, stats.arcHits + stats.arcMisses),
+        len(trig.arcTemplates.dict))
+    if prof:
+        print (u'COM calls:\n%s' % prof.report()).encode(cp)
     VAcad.doc.Utility.Prompt("There are " + str(count) + " objects in ModelSpace \n")
-#def comtypesDump():
+    return fnames[0]
+#def comtypesDump(opts=None):
 
 
-class VcsvWriter:
-    ''' Wrapper for csv.writer
+def entitySource(opts):
+    ''' (collection, count) of entities to dump: ModelSpace or, with opts.enum == 'select',
+    SelectionSet of supported entity types in model space (deleted by caller)
+    '''
+    if opts.enum == 'select':
+        ss = VAcad.selectAll(SELECTION_NAME, sorted(DXF_NAMES.values()))
+        return (ss, ss.Count)
+    return (VAcad.ms, VAcad.ms.Count)
+
 
-    writer = csv.writer(csv_stream, delimiter=exportDelimiter, quotechar=exportEscape,
-        quoting=csv.QUOTE_ALL, lineterminator='\n')
-    writer.writerow([description])
+def entityItems(coll, count, opts, start=0):
+    ''' (index, entity) for collection items from start:
+    opts.enum == 'index': Item(i) call for each entity;
+    batch, select: opts.batch entities per IEnumVARIANT.Next call (VAcad.enumItems)
+    '''
+    import itertools
+    if opts.enum == 'index':
+        return ((i, coll.Item(i)) for i in xrange(start, count))
+    return itertools.izip(itertools.count(start), VAcad.enumItems(coll, start, opts.batch))
+
+
+class Vcheckpoint:
+    ''' comtypesDump progress for --resume: next entity index, handle of last written entity,
+    output files sizes, statistics (VdumpStats with IDs, filter stats).
+    Saved every interval entities to name.dwg.csv.ckpt, removed when dump is done.
+    Rows written after last checkpoint (AutoCAD died, Ctrl+C) dropped on resume.
+    Compressed, npz and gpkg outputs can't be truncated, no checkpoints for them.
+    key: filter and projection options (outputKey), checkpoint made with other options not valid.
     '''
-    def __init__(self, fname='t.csv'):
+    def __init__(self, fname, dwg, count, interval=1000, files=(), key=''):
         self.fname = fname
-        self.fileObj = open(fname, 'wb')
-        self.csvWriter = csv.writer(self.fileObj,
-            delimiter=';', quotechar="'", quoting=csv.QUOTE_ALL,
-            lineterminator='\n')
+        self.dwg = dwg
+        self.count = count
+        self.interval = interval
+        self.files = list(files)
+        self.key = key
+
+    def due(self, done):
+        return self.interval and done % self.interval == 0
+
+    def save(self, done, handle, out, stats, flt=None):
+        import json
+        state = {'dwg': self.dwg, 'count': self.count, 'index': done, 'handle': handle,
+            'key': self.key, 'files': self.files, 'offsets': out.sync(), 'stats': stats.toDict(True),
+            'filter': flt and flt.stats or None}
+        tmp = self.fname + '.tmp'
+        f = open(tmp, 'wb')
+        try:
+            json.dump(state, f)
+        finally:
+            f.close()
+        if os.path.exists(self.fname):
+            os.remove(self.fname)
+        os.rename(tmp, self.fname)
+
+    def load(self, fnames):
+        ''' saved state if it made for the same DWG and CSV file is in place, else None
+        '''
+        import json
+        if not os.path.exists(self.fname):
+            return None
+        f = open(self.fname, 'rb')
+        try:
+            state = json.load(f)
+        finally:
+            f.close()
+        if not (state['dwg'] == self.dwg and state['count'] == self.count and state['index'] > 0 and 'stats' in state):
+            return None
+        if not state.get('files') == fnames or not state.get('key', '') == self.key:
+            return None
+        for fname,offset in zip(fnames, state['offsets']):
+            if not os.path.exists(fname) or os.path.getsize(fname) < offset:
+                return None
+        return state
+
+    def remove(self):
+        if os.path.exists(self.fname):
+            os.remove(self.fname)
+#class Vcheckpoint:
+
+
+class Vfilter:
+    ''' Entities filter, checked by VacItem.configure on properties read so far:
+    ObjectName (acceptType), Layer (acceptLayer), parsed XData (acceptAttr).
+    Rejected entity costs 1-3 COM calls instead of full adapter.
+
+    types: ObjectName globs, e.g. AcDbPolyline, AcDbText;
+    layers, exclude: layer name globs, e.g. ЗД_*; names compared case insensitive, as AutoCAD do;
+    codes: XData 'key:value' globs, value w/o key means classification code (99), e.g. 44110000, 5604*, МТ:жб;
+    hidden: names of frozen or off layers (hiddenLayers), entities on them rejected.
+    stats: rejected entities count by reason, and accepted count.
+    '''
+    def __init__(self, types=(), layers=(), exclude=(), codes=(), hidden=()):
+        self.types = [x.upper() for x in types]
+        self.layers = [x.upper() for x in layers]
+        self.exclude = [x.upper() for x in exclude]
+        self.codes = [(':' in x) and x or u'99:' + x for x in codes]
+        self.hidden = set([x.upper() for x in hidden])
+        self.stats = {'type': 0, 'layer': 0, 'xdata': 0, 'accepted': 0}
+        # layer name: accepted, globs matched once per layer
+        self.layerCache = {}
+
+    def acceptType(self, name):
+        if self.types and not matchAny(name.upper(), self.types):
+            self.stats['type'] += 1
+            return False
+        return True
+
+    def acceptLayer(self, lyr):
+        res = self.layerCache.get(lyr)
+        if res is None:
+            u = lyr.upper()
+            res = self.layerCache[lyr] = bool(not u in self.hidden and
+                (not self.layers or matchAny(u, self.layers)) and not matchAny(u, self.exclude))
+        if not res:
+            self.stats['layer'] += 1
+        return res
+
+    def acceptAttr(self, attr):
+        if self.codes and not [1 for k,v in attr.iteritems() if matchAny(u'%s:%s' % (k, v), self.codes)]:
+            self.stats['xdata'] += 1
+            return False
+        self.stats['accepted'] += 1
+        return True
+
+    def columns(self):
+        ''' columns filter needs, besides typename
+        '''
+        res = []
+        if self.layers or self.exclude or self.hidden: res.append('layer')
+        if self.codes: res.append('attribs')
+        return res
+
+    def __str__(self):
+        return 'accepted [%(accepted)i], rejected by type [%(type)i], layer [%(layer)i], xdata [%(xdata)i]' % self.stats
+#class Vfilter:
+
+
+def matchAny(name, patterns):
+    import fnmatch
+    for p in patterns:
+        if fnmatch.fnmatchcase(name, p):
+            return True
+    return False
 
-    def __del__(self):
-        del self.csvWriter
-        self.fileObj.close()
 
-    def writerow(self, row):
-        self.csvWriter.writerow(row)
-#class VcsvWriter:
+def hiddenLayers(doc):
+    ''' names of frozen or off layers from document Layers table, one pass over table
+    '''
+    res = []
+    layers = doc.Layers
+    for i in xrange(layers.Count):
+        lyr = layers.Item(i)
+        if lyr.Freeze or not lyr.LayerOn:
+            res.append(lyr.Name)
+    return res
+
 
+def argText(s):
+    ''' command line argument as unicode: ANSI code page on windows (mbcs), utf-8 if locale is unknown
+    '''
+    if isinstance(s, unicode): return s
+    try:
+        return s.decode(sys.getfilesystemencoding() or cp)
+    except UnicodeDecodeError:
+        return s.decode(cp)
 
-class VacItem:
+
+def outputKey(opts):
+    ''' filter, projection and sinks options as string, for manifest version and checkpoint;
+    empty string if all entities and columns dumped to csv
+    '''
+    lst = [(k, sorted(getattr(opts, k))) for k in ('types', 'layers', 'exclude', 'codes', 'columns') if getattr(opts, k)]
+    if opts.sinks and not opts.sinks == ['csv']: lst.append(('sinks', sorted(opts.sinks)))
+    if opts.visible: lst.append(('visible', True))
+    if opts.enum == 'select': lst.append(('enum', 'select'))
+    if opts.tolerance or opts.layerTolerance:
+        lst.append(('tolerance', opts.tolerance, sorted(opts.layerTolerance)))
+    if not lst: return ''
+    return repr(lst)
+
+
+def makeFilter(opts):
+    ''' Vfilter for opts or None; frozen and off layers taken from current document if opts.visible
+    '''
+    if not (opts.types or opts.layers or opts.exclude or opts.codes or opts.visible): return None
+    hidden = ()
+    if opts.visible:
+        hidden = hiddenLayers(VAcad.doc)
+        print (u'hidden layers [%s]' % u';'.join(hidden)).encode(cp)
+    return Vfilter([argText(x) for x in opts.types], [argText(x) for x in opts.layers],
+        [argText(x) for x in opts.exclude], [argText(x) for x in opts.codes], hidden)
+
+
+def makeTolerance(opts):
+    ''' trig.VarcTolerance for --tolerance, --layer-tolerance GLOB=T options or None
+    '''
+    if not (opts.tolerance or opts.layerTolerance): return None
+    import trig
+    layers = []
+    for x in opts.layerTolerance:
+        glob,sep,tol = argText(x).rpartition(u'=')
+        try:
+            layers.append((glob, float(tol)))
+        except ValueError:
+            raise NameError('Bad layer tolerance [%s], GLOB=TOLERANCE expected' % x)
+        if not glob:
+            raise NameError('Bad layer tolerance [%s], GLOB=TOLERANCE expected' % x)
+    return trig.VarcTolerance(opts.tolerance, layers)
+
+
+def projection(opts, flt=None):
+    ''' frozenset of columns to read from AutoCAD for opts.columns, None for all columns.
+    Columns needed by filter flt added; coords and radius (circles geometry, measures.py)
+    added for geometry sinks (npz, gpkg).
+    '''
+    if not opts.columns: return None
+    cols = set()
+    for x in ','.join(opts.columns).split(','):
+        x = x.strip().lower()
+        if not x: continue
+        if not x in COLUMNS:
+            raise NameError('Unknown column [%s], known columns [%s]' % (x, ', '.join(COLUMNS)))
+        cols.add(x)
+    if flt: cols.update(flt.columns())
+    if [x for x in (opts.sinks or ['csv']) if not x.startswith('csv')]: cols.update(('coords', 'radius'))
+    return frozenset(cols)
+
+
+class VacItem(object):
     ''' Wrapper for ACAD.ModelSpace.item.
+    Record: name, etype, lyr, id, handle, attr (XData) and entity adapter fields (VacEntity).
+    skipped: number of properties not read because of projection (configure cols).
 
     Unprocessed attribs: color, TrueColor, Visible, Material, Linetype, Lineweight
     '''
+    __slots__ = ('name', 'id', 'xd1', 'xd2', 'attr', 'lyr', 'etype', 'ent', 'handle', 'skipped')
+
     def __init__(self, item=''):
         self.name = ''
         self.id = ''
@@ -205,11 +537,12 @@ class VacItem:
         self.etype = ''
         self.ent = ''
         self.handle = ''
+        self.skipped = 0
         if item: self.configure(item)
 
     def toStr(self):
         return u'name [%s], type [%s], lyr [%s], id [%s], hndl [%s], attr [%s], xd [%s], ent [%s]' % \
-            (self.name, self.etype, self.lyr, self.id, self.handle, self.attr2str(), self.xd2[1], self.ent)
+            (self.name, self.etype, self.lyr, self.id, self.handle, self.attr2str(), self.xd2 and self.xd2[1], self.ent)
 
     def __str__(self):
         return self.toStr()
@@ -218,6 +551,8 @@ class VacItem:
         return self.toStr()
 
     def attr2str(self):
+        if isinstance(self.attr, VattrDict):
+            return self.attr.text
         return dict2string(self.attr)
 
     def description(self, codepage='utf-8'):
@@ -231,27 +566,51 @@ attribs это расширенные данные элемента (XData).\n%s
         s = u'typename, typenum, layer, id, handle, attribs, %s' % self.ent.heads()
         return s.encode(codepage).split(', ')
 
-    def listValues(self, codepage='utf-8'):
-        s = u'%s//%u//%s//%u//%s//%s//%s' % \
-            (self.name, self.etype, self.lyr, self.id, self.handle, self.attr2str(), self.ent.values())
-        return s.encode(codepage).split('//')
+    def values(self):
+        ''' list of unicode field values, in listHeads order
+        '''
+        return [self.name, u'%u' % self.etype, self.lyr, unicode(self.id), self.handle,
+            self.attr2str()] + self.ent.values()
 
-    def configure(self, acItem):
+    def listValues(self, codepage='utf-8'):
+        return [v.encode(codepage) for v in self.values()]
+
+    def configure(self, acItem, flt=None, cols=None):
+        ''' Read entity properties. Cheap ones first: ObjectName, Layer, XData;
+        with filter (Vfilter) returns False as soon as entity rejected, other properties not read.
+        With projection cols (frozenset of column names, projection()) properties for other columns
+        not read, these fields stay empty; EntityType of known types taken from ObjectName.
+        '''
         self.name = acItem.ObjectName
-        self.etype = acItem.EntityType
-        self.id = acItem.ObjectID
-        self.lyr = acItem.Layer
-        self.handle = acItem.Handle
-
-        self.xd1,self.xd2 = acItem.GetXData('ESMA')
-        if not self.xd2: self.xd2 = (u'ESMA', u'')
-        xd = self.xd2[1].encode('cp1251').split(r'/')
-        for d in xd:
-            pair = d.split(r':', 1)
-            if len(pair) > 1:
-                self.attr[pair[0].decode('cp1251')] = pair[1].decode('cp1251')
-
-        self.ent = self.makeEntity(self.etype, acItem)
+        if flt and not flt.acceptType(self.name): return False
+        skipped = 0
+        if cols is None or 'layer' in cols:
+            self.lyr = xdataCache.intern(acItem.Layer)
+            if flt and not flt.acceptLayer(self.lyr): return False
+        else: skipped += 1
+
+        if cols is None or 'attribs' in cols:
+            self.xd1,self.xd2 = acItem.GetXData('ESMA')
+            if not self.xd2: self.xd2 = (u'ESMA', u'')
+            self.attr = xdataCache.get(self.xd2[1])
+        else: skipped += 1
+        if flt and not flt.acceptAttr(self.attr): return False
+
+        if cols is None or 'typenum' in cols or not self.name in ENTITY_TYPES:
+            self.etype = acItem.EntityType
+        else:
+            self.etype = ENTITY_TYPES[self.name]
+            skipped += 1
+        if cols is None or 'id' in cols:
+            self.id = acItem.ObjectID
+        else: skipped += 1
+        if cols is None or 'handle' in cols:
+            self.handle = acItem.Handle
+        else: skipped += 1
+        self.ent = self.makeEntity(self.etype, acItem, cols)
+        if self.ent: skipped += self.ent.skips(cols)
+        self.skipped = skipped
+        return True
 
         #~ en = acItem.EntityName
         #~ if en != self.name:
@@ -259,27 +618,104 @@ attribs это расширенные данные элемента (XData).\n%s
 #    def configure(self, acItem):
 
 
-    def makeEntity(self, etype, acItem):
+    def makeEntity(self, etype, acItem, cols=None):
         if etype == AutoCAD.acBlockReference:
-            self.ent = VacBlock(acItem)
+            self.ent = VacBlock(acItem, cols)
         elif etype == AutoCAD.acPolylineLight:
-            self.ent = VacLWPolyline(acItem)
+            self.ent = VacLWPolyline(acItem, cols)
         elif etype == AutoCAD.acText:
-            self.ent = VacText(acItem)
+            self.ent = VacText(acItem, cols)
         elif etype == AutoCAD.acLine:
-            self.ent = VacLine(acItem)
+            self.ent = VacLine(acItem, cols)
         elif etype == AutoCAD.acCircle:
-            self.ent = VacCircle(acItem)
+            self.ent = VacCircle(acItem, cols)
         elif etype == AutoCAD.acArc:
-            self.ent = VacArc(acItem)
+            self.ent = VacArc(acItem, cols)
         elif etype == AutoCAD.acPoint:
-            self.ent = VacPoint(acItem)
+            self.ent = VacPoint(acItem, cols)
         else:
             self.ent = ''
 
         return self.ent
-#    def makeEntity(self, etype, acItem):
-#class VacItem:
+#    def makeEntity(self, etype, acItem, cols=None):
+#class VacItem(object):
+
+
+class VattrDict(dict):
+    ''' Parsed XData attributes, read only: shared by all entities with the same XData (VxdataCache).
+    text: attributes as dict2string
+    '''
+    __slots__ = ('text',)
+
+    def __init__(self, pairs=()):
+        dict.__init__(self, pairs)
+        self.text = dict2string(self)
+
+    def readOnly(self, *args, **kwargs):
+        raise NameError('XData attributes are shared, read only')
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = readOnly
+#class VattrDict(dict):
+
+
+class VxdataCache:
+    ''' ESMA XData parsed to attributes (VattrDict) keyed by raw XData string.
+    A few hundred distinct XData strings repeat across thousands of entities in a sheet,
+    so each one parsed once and entities share parsed attributes.
+    Keys, values and layer names interned: equal strings kept as one object.
+    Oldest entries dropped when cache size exceeds maxsize.
+    '''
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.dict = {}
+        self.keys = []
+        self.strings = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, xd):
+        attr = self.dict.get(xd)
+        if attr is not None:
+            self.hits += 1
+            return attr
+        self.misses += 1
+        attr = VattrDict(self.parse(xd))
+        if len(self.keys) >= self.maxsize:
+            del self.dict[self.keys.pop(0)]
+        self.dict[xd] = attr
+        self.keys.append(xd)
+        return attr
+
+    def parse(self, xd):
+        ''' (key, value) pairs from XData string '/99:56044000/ДМ:800/МТ:жб/00:"Гильза водопровода"/'
+        '''
+        res = []
+        for d in xd.encode('cp1251').split(r'/'):
+            pair = d.split(r':', 1)
+            if len(pair) > 1:
+                res.append((self.intern(pair[0].decode('cp1251')), self.intern(pair[1].decode('cp1251'))))
+        return res
+
+    def intern(self, s):
+        ''' the same string object for equal strings; builtin intern() don't take unicode
+        '''
+        res = self.strings.get(s)
+        if res is None:
+            if len(self.strings) >= self.maxsize * 8:
+                self.strings = {}
+            res = self.strings[s] = s
+        return res
+
+    def toStr(self):
+        return u'hits [%i], misses [%i], size [%i], strings [%i]' % (
+            self.hits, self.misses, len(self.dict), len(self.strings))
+
+    def __str__(self):
+        return self.toStr()
+
+    def __repr__(self):
+        return self.toStr()
+#class VxdataCache:
+xdataCache = VxdataCache()
 
 
 class VCountStrings:
@@ -307,12 +743,149 @@ class VCountStrings:
 #class VCountStrings:
 
 
+class VdumpStats:
+    ''' comtypesDump statistics: entities count by layer and by type, entities w/o XData,
+    duplicate ObjectIDs, filter stats (Vfilter.stats), property reads skipped by projection by type,
+    arc templates (trig.arcTemplates) hits and misses of this dump.
+    IDs kept as set of ints, for current drawing only; counters of several drawings
+    (session, dwg.batch.py workers) combined by merge.
+    Summary saved to name.dwg.stats.json:
+        {"files": ["<dwg path>"], "objects": 18809, "entities": 18809, "noXData": 3257, "dupIDs": 0,
+        "layers": {"0": 16, ...}, "types": {"AcDbText": 3054, ...}, "filter": null, "skipped": {},
+        "arcHits": 0, "arcMisses": 0}
+    '''
+    def __init__(self, dwg='', objects=0):
+        self.files = dwg and [dwg] or []
+        self.objects = objects
+        self.layers = {}
+        self.types = {}
+        self.ids = set()
+        self.noXData = 0
+        self.dupIDs = 0
+        self.filter = None
+        self.skipped = {}
+        self.arcHits = 0
+        self.arcMisses = 0
+
+    def addType(self, name):
+        num = self.types[name] = self.types.get(name, 0) + 1
+        return num
+
+    def addLayer(self, lyr):
+        num = self.layers[lyr] = self.layers.get(lyr, 0) + 1
+        return num
+
+    def addSkipped(self, name, num):
+        self.skipped[name] = self.skipped.get(name, 0) + num
+
+    def countArcs(self, start):
+        ''' arc templates hits, misses since start: (hits, misses) of trig.arcTemplates at dump start
+        '''
+        self.arcHits = trig.arcTemplates.hits - start[0]
+        self.arcMisses = trig.arcTemplates.misses - start[1]
+
+    def addID(self, oid):
+        ''' False if oid seen already
+        '''
+        if oid in self.ids:
+            self.dupIDs += 1
+            return False
+        self.ids.add(oid)
+        return True
+
+    def entities(self):
+        return sum(self.types.values())
+
+    def merge(self, other):
+        ''' add other stats counters to this; IDs not merged, they are unique per drawing only
+        '''
+        self.files.extend(other.files)
+        self.objects += other.objects
+        self.noXData += other.noXData
+        self.dupIDs += other.dupIDs
+        self.arcHits += other.arcHits
+        self.arcMisses += other.arcMisses
+        for dst,src in ((self.layers, other.layers), (self.types, other.types), (self.skipped, other.skipped)):
+            for k,n in src.iteritems():
+                dst[k] = dst.get(k, 0) + n
+        if other.filter is not None:
+            if self.filter is None: self.filter = {}
+            for k,n in other.filter.iteritems():
+                self.filter[k] = self.filter.get(k, 0) + n
+        return self
+
+    def toDict(self, ids=False):
+        res = {'files': self.files, 'objects': self.objects, 'entities': self.entities(),
+            'noXData': self.noXData, 'dupIDs': self.dupIDs, 'layers': self.layers, 'types': self.types,
+            'filter': self.filter, 'skipped': self.skipped, 'arcHits': self.arcHits, 'arcMisses': self.arcMisses}
+        if ids:
+            res['ids'] = list(self.ids)
+        return res
+
+    def load(self, dct):
+        ''' counters from toDict result, returns self
+        '''
+        self.files = list(dct.get('files', []))
+        self.objects = dct.get('objects', 0)
+        self.noXData = dct.get('noXData', 0)
+        self.dupIDs = dct.get('dupIDs', 0)
+        self.layers = dict(dct.get('layers', {}))
+        self.types = dict(dct.get('types', {}))
+        self.ids = set(dct.get('ids', []))
+        self.filter = dct.get('filter')
+        self.skipped = dict(dct.get('skipped', {}))
+        self.arcHits = dct.get('arcHits', 0)
+        self.arcMisses = dct.get('arcMisses', 0)
+        return self
+
+    def save(self, fname):
+        ''' write JSON summary: temp file, then rename
+        '''
+        import json
+        tmp = fname + '.tmp'
+        f = open(tmp, 'wb')
+        try:
+            json.dump(self.toDict(), f, indent=1, sort_keys=True)
+        finally:
+            f.close()
+        if os.path.exists(fname):
+            os.remove(fname)
+        os.rename(tmp, fname)
+
+    def toStr(self):
+        return 'files [%i], objects [%i], entities [%i], layers [%i], types [%s], noXData [%i], dupIDs [%i]' % (
+            len(self.files), self.objects, self.entities(), len(self.layers), dict2string(self.types),
+            self.noXData, self.dupIDs)
+
+    def __str__(self):
+        return self.toStr()
+
+    def __repr__(self):
+        return self.toStr()
+#class VdumpStats:
+
+
+def statsName(base):
+    ''' summary file name for name.dwg
+    '''
+    return base + '.stats.json'
+
+
+def loadStats(fname):
+    ''' VdumpStats from JSON summary file or None if file not exists
+    '''
+    import json
+    if not os.path.exists(fname):
+        return None
+    f = open(fname, 'rb')
+    try:
+        return VdumpStats().load(json.load(f))
+    finally:
+        f.close()
+
+
 def dict2string(dct):
-    s = u''
-    for k in sorted(dct.keys()):
-        if s: s += u';'
-        s += u'%s:%s' % (k, dct[k])
-    return s
+    return u';'.join([u'%s:%s' % (k, dct[k]) for k in sorted(dct.keys())])
 #def dict2string(dct):
 
 
@@ -328,6 +901,7 @@ def axDump():
     u'AcDbArc': 2}]
     '''
     print 'axDump...'
+    import comtypes.client
     #~ import win32com.client
     #~ acad = win32com.client.Dispatch("AutoCAD.Application")
     acad = comtypes.client.GetActiveObject("AutoCAD.Application")
@@ -338,9 +912,8 @@ def axDump():
     count = ms.Count
     total_text = 0
     res = {}
-    for i in range(count):
+    for i,item in enumerate(VAcad.enumItems(ms)):
         if i > 100: break
-        item = ms.Item(i)
         on = item.ObjectName
         try:
             num = res[on]
@@ -358,15 +931,226 @@ def axDump():
 #def axDump():
 
 
+def readList(fname):
+    ''' DWG file names from list file; lines started with '*' are comments (rip.cmd eol=*)
+    '''
+    f = open(fname, 'rb')
+    try:
+        return list(listNames(f))
+    finally:
+        f.close()
+
+
+def listNames(lines):
+    ''' DWG file names from lines iterator, w/o comments and empty lines
+    '''
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('*'):
+            yield line
+#def listNames(lines):
+
+
+def logName(fname):
+    ''' name.dwg for \\\\linserv\\files\\...\\name.dwg (%%~nxi in rip.cmd)
+    '''
+    return os.path.basename(fname.replace('\\', '/'))
+
+
+def outputName(fname, opts):
+    ''' output file of fname dump, first sink: name.dwg.csv, name.dwg.gpkg, ...; as comtypesDump returns
+    '''
+    return sinks.sinkName((opts.sinks or ['csv'])[0], logName(fname))
+
+
+def mergeStats(total, fname):
+    ''' add stats of dumped fname (name.dwg.stats.json) to total
+    '''
+    st = loadStats(statsName(logName(fname)))
+    if st is None:
+        print 'no stats for [%s]' % fname
+        return total
+    return total.merge(st)
+
+
+def dumpFile(fname, opts=None, logs=False):
+    ''' Run doWork for fname; with logs stdout, stderr redirected to name.dwg.log, name.dwg.err.
+    Returns (fname, result code, seconds)
+    '''
+    res = ecErr
+    stdout,stderr = (sys.stdout, sys.stderr)
+    if logs:
+        nm = logName(fname)
+        sys.stdout,sys.stderr = (open(nm + '.log', 'wb'), open(nm + '.err', 'wb'))
+    start = time.time()
+    try:
+        print 'begin [%s], dwg: [%s], pid [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), fname, os.getpid())
+        try:
+            res = doWork(fname, opts)
+            print 'done [%s]' % res
+        except Exception, e:
+            if type(e).__name__ == 'COMError': print 'COM Error, msg [%s]' % e
+            else:
+                print 'Error, doWork failed:'
+                traceback.print_exc(file=sys.stderr)
+        print 'end [%s], dwg: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), fname)
+    finally:
+        if logs:
+            sys.stdout.close()
+            sys.stderr.close()
+        sys.stdout,sys.stderr = (stdout, stderr)
+    return (fname, res, time.time() - start)
+#def dumpFile(fname, opts=None, logs=False):
+
+
+def session(fnames, opts, logs=False):
+    ''' Session mode: dump each DWG from fnames (list file lines, sys.stdin) in this process.
+    One AutoCAD connection, type library and OCS cache for all files;
+    only document opened for previous file closed, VAcad doc, ms, u reset by openDWG.
+    '''
+    print 'session...'
+    opts.session = True
+    if opts.manifest is None: opts.manifest = MANIFEST
+    res = ecOK
+    count = 0
+    total = VdumpStats()
+    start = time.time()
+    for fname in listNames(fnames):
+        fname,code,secs = dumpFile(fname, opts, logs)
+        count += 1
+        print 'file [%s], res [%s], time [%0.3f] s' % (fname, code, secs)
+        sys.stdout.flush()
+        if not code == ecOK: res = ecErr
+        else: mergeStats(total, fname)
+    VAcad.closeDWG()
+    elapsed = time.time() - start
+    print 'session, files [%i], time [%0.3f] s, files/min [%0.2f]' % (
+        count, elapsed, 60.0 * count / max(elapsed, 0.001))
+    print (u'session stats: %s' % total).encode(cp)
+    if opts.summary:
+        total.save(opts.summary)
+    return res
+#def session(fnames, opts, logs=False):
+
+
+def watch(fnames, opts, logs=False):
+    ''' Watch mode: check fnames every opts.watch seconds, extract DWG changed since last extraction.
+    File extracted when its (size, mtime) differ from manifest and stay the same for two polls,
+    i.e. file copying is finished. Stopped by Ctrl+C.
+    '''
+    print 'watch, files [%i], period [%s] s...' % (len(fnames), opts.watch)
+    opts.session = True
+    if not opts.manifest: opts.manifest = MANIFEST
+    mf = getManifest(opts.manifest, opts) # the same Vmanifest doWork updates
+    import manifest
+    res = ecOK
+    last = {}
+    try:
+        while True:
+            for fname in fnames:
+                st = manifest.fileStat(fname)
+                prev,last[fname] = (last.get(fname), st)
+                if st is None or not st == prev or not mf.changed(fname):
+                    continue
+                fname,code,secs = dumpFile(fname, opts, logs)
+                print 'file [%s], res [%s], time [%0.3f] s' % (fname, code, secs)
+                sys.stdout.flush()
+                if not code == ecOK: res = ecErr
+            time.sleep(opts.watch)
+    except KeyboardInterrupt:
+        print 'watch stopped'
+    VAcad.closeDWG()
+    return res
+#def watch(fnames, opts, logs=False):
+
+
+def setup(opts):
+    ''' apply options to VAcad services
+    '''
+    VAcad.verifyTrans = opts.verify
+    VAcad.localTrans = not opts.comtrans
+#def setup(opts):
+
+
+def parseArgs(argv):
+    ''' dwg.dump.py [options] [filename.dwg]
+    dwg.dump.py --session [options] [dwg.list | -]
+    '''
+    from optparse import OptionParser
+    parser = OptionParser(usage='%prog [options] [filename.dwg]\n       %prog --session [options] [dwg.list | -]')
+    parser.add_option('--verify', dest='verify', type='int', default=0, metavar='N',
+        help='check every N-th local OCS/WCS transformation against Utility.TranslateCoordinates')
+    parser.add_option('--comtrans', dest='comtrans', action='store_true', default=False,
+        help='use Utility.TranslateCoordinates for all transformations')
+    parser.add_option('--profile', dest='profile', action='store_true', default=False,
+        help='count and time COM calls per entity type')
+    parser.add_option('--session', dest='session', action='store_true', default=False,
+        help='dump each DWG named in list file (filename parameter) or stdin (no parameter or -), one AutoCAD connection for all')
+    parser.add_option('--logs', dest='logs', action='store_true', default=False,
+        help='session: output for each file to name.dwg.log, name.dwg.err')
+    parser.add_option('--manifest', dest='manifest', default=None, metavar='FILE',
+        help='skip DWG not changed since last extraction (size, mtime, md5, extractor version in FILE); '
+            'default: %s for --session, --watch and dwg.batch.py, no manifest for single DWG; '
+            'empty string: no manifest' % MANIFEST)
+    parser.add_option('--force', dest='force', action='store_true', default=False,
+        help='extract DWG even if manifest say it not changed')
+    parser.add_option('--sink', dest='sinks', action='append', default=[], metavar='NAME',
+        help='output format, one of %s; can be repeated; default csv' % ', '.join(sorted(sinks.SINKS.keys())))
+    parser.add_option('--bufsize', dest='bufsize', type='int', default=1024, metavar='KB',
+        help='output written by blocks of KB kilobytes')
+    parser.add_option('--checkpoint', dest='checkpoint', type='int', default=0, metavar='N',
+        help='save dump progress every N entities to name.dwg.csv.ckpt; default 0: no checkpoints')
+    parser.add_option('--resume', dest='resume', action='store_true', default=False,
+        help='continue dump from checkpoint, CSV truncated to last checkpointed row; '
+            'checkpoints every %i entities if no --checkpoint N' % CHECKPOINT_INTERVAL)
+    parser.add_option('--layer', dest='layers', action='append', default=[], metavar='GLOB',
+        help='dump entities on layers matched GLOB only, e.g. ЗД_*; can be repeated')
+    parser.add_option('--exclude-layer', dest='exclude', action='append', default=[], metavar='GLOB',
+        help='skip entities on layers matched GLOB; can be repeated')
+    parser.add_option('--type', dest='types', action='append', default=[], metavar='NAME',
+        help='dump entities with ObjectName NAME only, e.g. AcDbPolyline; can be repeated')
+    parser.add_option('--code', dest='codes', action='append', default=[], metavar='CODE',
+        help='dump entities with XData CODE only: classification code (99:CODE) or KEY:VALUE, globs allowed; can be repeated')
+    parser.add_option('--columns', dest='columns', action='append', default=[], metavar='LIST',
+        help='read and write only listed columns, e.g. coords,attribs,text,typename,handle,layer; other columns empty')
+    parser.add_option('--visible', dest='visible', action='store_true', default=False,
+        help='skip entities on frozen or off layers')
+    parser.add_option('--enum', dest='enum', type='choice', choices=('index', 'batch', 'select'), default='index',
+        help='entities access: index, ModelSpace.Item(i) for each; batch, ModelSpace enumerator; '
+            'select, SelectionSet of supported types in model space, enumerated')
+    parser.add_option('--batch', dest='batch', type='int', default=100, metavar='N',
+        help='enum batch, select: entities fetched per enumerator call')
+    parser.add_option('--tolerance', dest='tolerance', type='float', default=0.0, metavar='T',
+        help='gpkg: divide arcs so chord deviates from arc <= T drawing units, circles as polygons; 0: 10 deg parts')
+    parser.add_option('--layer-tolerance', dest='layerTolerance', action='append', default=[], metavar='GLOB=T',
+        help='gpkg: tolerance T for layers matched GLOB, e.g. В_КОЛОДЕЦ=0.005; can be repeated, first match wins')
+    parser.add_option('--summary', dest='summary', default='', metavar='FILE',
+        help='session, dwg.batch.py: write stats of all files (name.dwg.stats.json merged) to JSON FILE')
+    parser.add_option('--watch', dest='watch', type='float', default=0.0, metavar='SECONDS',
+        help='session: poll list files every SECONDS, extract changed ones, until Ctrl+C')
+    return parser.parse_args(argv)
+#def parseArgs(argv):
+
+
 if __name__ == '__main__':
     argc = len(sys.argv)
     res = ecErr
     dwg = ''
     print 'begin [%s], argc: [%s], argv: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), argc, sys.argv)
-    if argc > 1: dwg = sys.argv[1]
+    opts,args = parseArgs(sys.argv[1:])
+    if args: dwg = args[0]
+    setup(opts)
 
     try:
-        res = doWork(dwg)
+        if opts.session and opts.watch:
+            res = watch(readList(dwg or 'dwg.list'), opts, opts.logs)
+        elif opts.session:
+            if dwg and not dwg == '-':
+                res = session(readList(dwg), opts, opts.logs)
+            else:
+                res = session(iter(sys.stdin.readline, ''), opts, opts.logs)
+        else:
+            res = doWork(dwg, opts)
         print 'done [%s]' % res
     except Exception, e:
         if type(e).__name__ == 'COMError': print 'COM Error, msg [%s]' % e
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.5
+
+GeoPackage output for comtypesDump (dwg.dump.py --sink gpkg), standard library sqlite3 only.
+One feature table 'entities' with layer column, geometry in GPKG WKB, srs_id -1 (undefined cartesian,
+DWG WCS coordinates). Rows inserted by batches, one transaction for each;
+R-tree spatial index (gpkg_rtree_index extension) built after all rows inserted.
+
+Geometry:
+    AcDbPolyline        LINESTRING, POLYGON if closed; bulge segments divided to arcs parts <= 10 deg
+    AcDbLine            LINESTRING
+    AcDbArc             LINESTRING, arc parts <= 10 deg
+    AcDbBlockReference, AcDbText, AcDbCircle, AcDbPoint
+                        POINT: insertion point, center, point
+With sagitta tolerance for entity layer (dwg.dump.py --tolerance, --layer-tolerance; trig.VarcTolerance)
+arcs and bulges divided by tolerance (trig.arcFacets) instead of 10 deg parts,
+AcDbCircle is POLYGON, circle divided by tolerance.
+Other fields same as in CSV, w/o coords; length and area columns exact, from arcs and bulges
+(measures.entityMeasures), not from tessellated geometry: area of closed polylines (absolute) and circles,
+0 for other curves, NULL for blocks, texts and points.
+
+Read:
+    gpd.read_file('name.dwg.gpkg', layer='entities')
+    ogr2ogr -f "ESRI Shapefile" out name.dwg.gpkg -where "layer = '...'"
+'''
+
+import os, math
+import struct
+import sqlite3
+
+import trig
+import measures
+import acadconst
+from sinks import Vsink
+
+TABLE = 'entities'
+SRS_ID = -1
+BATCH_SIZE = 5000
+
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+
+COLUMNS = (
+    ('dwg', 'TEXT'), ('typename', 'TEXT'), ('typenum', 'INTEGER'), ('layer', 'TEXT'),
+    ('id', 'INTEGER'), ('handle', 'TEXT'), ('attribs', 'TEXT'),
+    ('angle', 'TEXT'), ('text', 'TEXT'), ('closed', 'TEXT'), ('radius', 'TEXT'),
+    ('length', 'REAL'), ('area', 'REAL'))
+
+
+def gpkgBlob(wkbType, points, srsId=SRS_ID):
+    ''' GeoPackage geometry blob: GP header with XY envelope, little endian ISO WKB.
+    points: [(x, y), ...]; for polygon it's a closed ring
+    '''
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    env = (min(xs), max(xs), min(ys), max(ys))
+    # magic, version 0, flags: envelope [minx, maxx, miny, maxy] (1 << 1), little endian (1)
+    head = struct.pack('<2sBBi4d', 'GP', 0, 0x03, srsId, *env)
+    if wkbType == WKB_POINT:
+        wkb = struct.pack('<BIdd', 1, WKB_POINT, points[0][0], points[0][1])
+    else:
+        flat = []
+        for p in points:
+            flat.append(p[0])
+            flat.append(p[1])
+        if wkbType == WKB_POLYGON:
+            wkb = struct.pack('<BIII', 1, WKB_POLYGON, 1, len(points))
+        else:
+            wkb = struct.pack('<BII', 1, WKB_LINESTRING, len(points))
+        wkb += struct.pack('<%id' % len(flat), *flat)
+    return (head + wkb, env)
+
+
+def entityGeometry(etype, ent, tolerance=0.0):
+    ''' (WKB type, points) for VacEntity with WCS points ent.pts;
+    tolerance > 0: arcs facets sagitta tolerance, circle as polygon
+    '''
+    pts = ent.pts
+    if etype == acadconst.acPolylineLight:
+        res = [(pts[0][0], pts[0][1])]
+        bulges = ent.bulges or [0.0] * len(pts)
+        for i in xrange(1, len(pts)):
+            if bulges[i-1]:
+                res.extend(trig.bulgePoints(pts[i-1], pts[i], bulges[i-1], tolerance=tolerance))
+            else:
+                res.append((pts[i][0], pts[i][1]))
+        if ent.closed is True and len(res) > 3:
+            return (WKB_POLYGON, res)
+        if len(res) < 2:
+            res.append(res[0])
+        return (WKB_LINESTRING, res)
+    if etype == acadconst.acArc:
+        c,s,e,m = pts
+        sa,sweep = trig.arcSweep(c, s, e, m)
+        return (WKB_LINESTRING, [(s[0], s[1])] + trig.arcPoints(c, math.hypot(s[0] - c[0], s[1] - c[1]), sa, sweep, e,
+            tolerance=tolerance))
+    if etype == acadconst.acCircle and tolerance > 0.0 and ent.radius:
+        c,r = (pts[0], ent.radius)
+        s = (c[0] + r, c[1])
+        return (WKB_POLYGON, [s] + trig.arcPoints(c, r, 0.0, math.pi * 2.0, s, tolerance=tolerance))
+    if len(pts) == 1 or etype in (acadconst.acBlockReference, acadconst.acText):
+        return (WKB_POINT, [(pts[0][0], pts[0][1])])
+    return (WKB_LINESTRING, [(p[0], p[1]) for p in pts])
+
+
+class VgpkgSink(Vsink):
+    ''' GeoPackage file, 'entities' feature table; written by batches of batchSize rows.
+    tolerance: trig.VarcTolerance, arcs tessellation tolerance by layer, or None
+    '''
+    def __init__(self, fname, batchSize=BATCH_SIZE, tolerance=None):
+        if os.path.exists(fname):
+            os.remove(fname)
+        self.fname = fname
+        self.batchSize = batchSize
+        self.tolerance = tolerance
+        self.rows = []
+        self.count = 0
+        self.extent = None
+        self.db = sqlite3.connect(fname)
+        self.db.execute('PRAGMA application_id = 1196444487') # 'GPKG'
+        self.db.execute('PRAGMA user_version = 10200')
+        self.db.execute('PRAGMA synchronous = OFF')
+        self.createTables()
+        self.sql = 'INSERT INTO %s (geom, %s) VALUES (?, %s)' % (
+            TABLE, ', '.join([c for c,t in COLUMNS]), ', '.join(['?'] * len(COLUMNS)))
+
+    def createTables(self):
+        db = self.db
+        db.execute('''CREATE TABLE gpkg_spatial_ref_sys (srs_name TEXT NOT NULL,
+            srs_id INTEGER NOT NULL PRIMARY KEY, organization TEXT NOT NULL,
+            organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL, description TEXT)''')
+        db.executemany('INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)', [
+            ('Undefined cartesian SRS', -1, 'NONE', -1, 'undefined', 'undefined cartesian coordinate reference system'),
+            ('Undefined geographic SRS', 0, 'NONE', 0, 'undefined', 'undefined geographic coordinate reference system'),
+            ('WGS 84 geodetic', 4326, 'EPSG', 4326, 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",'
+                '6378137,298.257223563,AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,'
+                'AUTHORITY["EPSG","8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],'
+                'AUTHORITY["EPSG","4326"]]', 'longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid')])
+        db.execute('''CREATE TABLE gpkg_contents (table_name TEXT NOT NULL PRIMARY KEY,
+            data_type TEXT NOT NULL, identifier TEXT UNIQUE, description TEXT DEFAULT '',
+            last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+            min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE, srs_id INTEGER,
+            CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id))''')
+        db.execute('''CREATE TABLE gpkg_geometry_columns (table_name TEXT NOT NULL,
+            column_name TEXT NOT NULL, geometry_type_name TEXT NOT NULL, srs_id INTEGER NOT NULL,
+            z TINYINT NOT NULL, m TINYINT NOT NULL,
+            CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+            CONSTRAINT fk_gc_tn FOREIGN KEY (table_name) REFERENCES gpkg_contents(table_name),
+            CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys (srs_id))''')
+        db.execute('''CREATE TABLE gpkg_extensions (table_name TEXT, column_name TEXT,
+            extension_name TEXT NOT NULL, definition TEXT NOT NULL, scope TEXT NOT NULL,
+            CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name))''')
+        db.execute('CREATE TABLE %s (fid INTEGER PRIMARY KEY AUTOINCREMENT, geom GEOMETRY, %s)' % (
+            TABLE, ', '.join(['%s %s' % (c, t) for c,t in COLUMNS])))
+        db.execute('''INSERT INTO gpkg_contents (table_name, data_type, identifier, srs_id)
+            VALUES (?, 'features', ?, ?)''', (TABLE, TABLE, SRS_ID))
+        db.execute("INSERT INTO gpkg_geometry_columns VALUES (?, 'geom', 'GEOMETRY', ?, 0, 0)", (TABLE, SRS_ID))
+        db.commit()
+
+    def header(self, description, heads):
+        self.db.execute('UPDATE gpkg_contents SET description = ? WHERE table_name = ?',
+            (description.decode('utf-8'), TABLE))
+
+    def write(self, dwg, item):
+        ent = item.ent
+        tol = self.tolerance and self.tolerance.get(item.lyr) or 0.0
+        wkbType,pts = entityGeometry(item.etype, ent, tol)
+        blob,env = gpkgBlob(wkbType, pts)
+        if self.extent is None:
+            self.extent = list(env)
+        else:
+            e = self.extent
+            e[0],e[1],e[2],e[3] = (min(e[0], env[0]), max(e[1], env[1]), min(e[2], env[2]), max(e[3], env[3]))
+        length = area = None
+        meas = measures.entityMeasures(item.etype, ent)
+        if meas is not None:
+            length,area = (meas[0], abs(meas[1]))
+        self.rows.append((buffer(blob), dwg, item.name, item.etype, item.lyr, item.id or None, item.handle,
+            item.attr2str(), unicode(ent.angle), unicode(ent.name), unicode(ent.closed), unicode(ent.radius),
+            length, area))
+        if len(self.rows) >= self.batchSize:
+            self.flush()
+
+    def flush(self):
+        ''' insert collected rows, one transaction
+        '''
+        if self.rows:
+            self.db.executemany(self.sql, self.rows)
+            self.db.commit()
+            self.count += len(self.rows)
+            self.rows = []
+
+    def createIndex(self):
+        ''' R-tree spatial index from geometry envelopes (GP header), with triggers as in GeoPackage 1.2
+        '''
+        db = self.db
+        rtree = 'rtree_%s_geom' % TABLE
+        db.execute('CREATE VIRTUAL TABLE %s USING rtree(id, minx, maxx, miny, maxy)' % rtree)
+        # envelope in GP header: srs_id at 4, minx, maxx, miny, maxy doubles at 8
+        rows = []
+        for fid,geom in db.execute('SELECT fid, geom FROM %s' % TABLE):
+            rows.append((fid,) + struct.unpack_from('<4d', geom, 8))
+        db.executemany('INSERT INTO %s VALUES (?, ?, ?, ?, ?)' % rtree, rows)
+        db.execute('''INSERT INTO gpkg_extensions VALUES (?, 'geom', 'gpkg_rtree_index',
+            'http://www.geopackage.org/spec120/#extension_rtree', 'write-only')''', (TABLE,))
+        for sql in RTREE_TRIGGERS:
+            db.execute(sql.replace('<t>', TABLE).replace('<c>', 'geom').replace('<i>', 'fid'))
+        db.commit()
+
+    def close(self):
+        if self.db is None:
+            return
+        self.flush()
+        self.createIndex()
+        if self.extent:
+            self.db.execute('UPDATE gpkg_contents SET min_x = ?, max_x = ?, min_y = ?, max_y = ? WHERE table_name = ?',
+                tuple(self.extent) + (TABLE,))
+        self.db.commit()
+        self.db.close()
+        self.db = None
+#class VgpkgSink(Vsink):
+
+
+# GeoPackage 1.2 rtree triggers; ST_* functions provided by GeoPackage aware readers (GDAL, QGIS)
+RTREE_TRIGGERS = (
+'''CREATE TRIGGER rtree_<t>_<c>_insert AFTER INSERT ON <t>
+WHEN (new.<c> NOT NULL AND NOT ST_IsEmpty(NEW.<c>))
+BEGIN
+  INSERT OR REPLACE INTO rtree_<t>_<c> VALUES (
+    NEW.<i>, ST_MinX(NEW.<c>), ST_MaxX(NEW.<c>), ST_MinY(NEW.<c>), ST_MaxY(NEW.<c>));
+END''',
+'''CREATE TRIGGER rtree_<t>_<c>_update1 AFTER UPDATE OF <c> ON <t>
+WHEN OLD.<i> = NEW.<i> AND (NEW.<c> NOTNULL AND NOT ST_IsEmpty(NEW.<c>))
+BEGIN
+  INSERT OR REPLACE INTO rtree_<t>_<c> VALUES (
+    NEW.<i>, ST_MinX(NEW.<c>), ST_MaxX(NEW.<c>), ST_MinY(NEW.<c>), ST_MaxY(NEW.<c>));
+END''',
+'''CREATE TRIGGER rtree_<t>_<c>_update2 AFTER UPDATE OF <c> ON <t>
+WHEN OLD.<i> = NEW.<i> AND (NEW.<c> ISNULL OR ST_IsEmpty(NEW.<c>))
+BEGIN
+  DELETE FROM rtree_<t>_<c> WHERE id = OLD.<i>;
+END''',
+'''CREATE TRIGGER rtree_<t>_<c>_update3 AFTER UPDATE ON <t>
+WHEN OLD.<i> != NEW.<i> AND (NEW.<c> NOTNULL AND NOT ST_IsEmpty(NEW.<c>))
+BEGIN
+  DELETE FROM rtree_<t>_<c> WHERE id = OLD.<i>;
+  INSERT OR REPLACE INTO rtree_<t>_<c> VALUES (
+    NEW.<i>, ST_MinX(NEW.<c>), ST_MaxX(NEW.<c>), ST_MinY(NEW.<c>), ST_MaxY(NEW.<c>));
+END''',
+'''CREATE TRIGGER rtree_<t>_<c>_update4 AFTER UPDATE ON <t>
+WHEN OLD.<i> != NEW.<i> AND (NEW.<c> ISNULL OR ST_IsEmpty(NEW.<c>))
+BEGIN
+  DELETE FROM rtree_<t>_<c> WHERE id IN (OLD.<i>, NEW.<i>);
+END''',
+'''CREATE TRIGGER rtree_<t>_<c>_delete AFTER DELETE ON <t>
+WHEN old.<c> NOT NULL
+BEGIN
+  DELETE FROM rtree_<t>_<c> WHERE id = OLD.<i>;
+END''',
+)
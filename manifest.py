@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.6
+
+Manifest of extracted DWG files, for skipping unchanged drawings on re-runs.
+For each DWG stored: size, mtime, md5 of content, extractor version, CSV name and size.
+DWG considered unchanged if extractor version, size and CSV (name, size) the same and
+mtime the same or, if mtime changed (file copied, touched), content hash the same.
+
+Manifest is JSON file, dwg.manifest.json in current directory by default:
+    {"version": "...", "files": {"<dwg path>": {"size": 123, "mtime": 1.5, "md5": "...",
+        "version": "...", "csv": "name.dwg.csv", "csvsize": 456}}}
+
+Usage:
+    mf = Vmanifest('dwg.manifest.json', extractorVersion([__file__, ...]))
+    if not mf.check(dwg):
+        info = mf.fileInfo(dwg)
+        ... extract dwg to csv ...
+        mf.update(dwg, csv, info)
+        mf.save()
+'''
+
+import os
+import hashlib
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def fileHash(fname):
+    ''' md5 hexdigest of file content
+    '''
+    h = hashlib.md5()
+    f = open(fname, 'rb')
+    try:
+        while True:
+            data = f.read(BLOCK_SIZE)
+            if not data: break
+            h.update(data)
+    finally:
+        f.close()
+    return h.hexdigest()
+
+
+def extractorVersion(sources, extra=''):
+    ''' extractor version: md5 of source files (dwg.dump.py, snippets.py, ...) and extra string;
+    any change in extractor code makes all manifest entries outdated
+    '''
+    h = hashlib.md5(extra)
+    for fname in sources:
+        if fname.endswith(('.pyc', '.pyo')):
+            fname = fname[:-1]
+        f = open(fname, 'rb')
+        try:
+            h.update(f.read())
+        finally:
+            f.close()
+    return h.hexdigest()
+
+
+def fileStat(fname):
+    ''' (size, mtime) or None if file not exists
+    '''
+    try:
+        st = os.stat(fname)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime)
+
+
+class Vmanifest:
+    ''' DWG files extracted: size, mtime, hash, extractor version, CSV
+    '''
+    def __init__(self, fname='dwg.manifest.json', version=''):
+        self.fname = fname
+        self.version = version
+        self.files = {}
+        self.load()
+
+    def key(self, dwg):
+        return os.path.normcase(os.path.abspath(dwg))
+
+    def load(self):
+        ''' read manifest file, entries made by other extractor version stay until updated
+        '''
+        import json
+        self.files = {}
+        if os.path.exists(self.fname):
+            f = open(self.fname, 'rb')
+            try:
+                self.files = json.load(f).get('files', {})
+            finally:
+                f.close()
+
+    def save(self):
+        ''' write manifest file: temp file, then rename
+        '''
+        import json
+        tmp = self.fname + '.tmp'
+        f = open(tmp, 'wb')
+        try:
+            json.dump({'version': self.version, 'files': self.files}, f, indent=1, sort_keys=True)
+        finally:
+            f.close()
+        if os.path.exists(self.fname): # windows can't rename over existing file
+            os.remove(self.fname)
+        os.rename(tmp, self.fname)
+
+    def fileInfo(self, dwg):
+        ''' {size, mtime, md5} for dwg, taken before extraction
+        '''
+        st = fileStat(dwg)
+        if st is None:
+            return None
+        return {'size': st[0], 'mtime': st[1], 'md5': fileHash(dwg)}
+
+    def check(self, dwg):
+        ''' True if dwg extracted by this extractor version, not changed since and CSV is in place
+        '''
+        e = self.files.get(self.key(dwg))
+        if not e or not e.get('version') == self.version:
+            return False
+        st = fileStat(e['csv'])
+        if st is None or not st[0] == e['csvsize']:
+            return False
+        st = fileStat(dwg)
+        if st is None or not st[0] == e['size']:
+            return False
+        if st[1] == e['mtime']:
+            return True
+        if fileHash(dwg) == e['md5']: # touched or copied, content the same
+            e['mtime'] = st[1]
+            return True
+        return False
+
+    def changed(self, dwg):
+        ''' cheap check for watch loop: (size, mtime) differ from manifest entry
+        '''
+        e = self.files.get(self.key(dwg))
+        st = fileStat(dwg)
+        if st is None:
+            return False
+        if not e or not e.get('version') == self.version:
+            return True
+        return not st == (e['size'], e['mtime'])
+
+    def update(self, dwg, csv, info=None):
+        ''' store entry for dwg extracted to csv; info from fileInfo before extraction
+        '''
+        if info is None:
+            info = self.fileInfo(dwg)
+        if info is None:
+            return
+        e = dict(info)
+        e['version'] = self.version
+        e['csv'] = csv
+        e['csvsize'] = (fileStat(csv) or (None, None))[0]
+        self.files[self.key(dwg)] = e
+
+    def __str__(self):
+        return 'manifest [%s], files [%i]' % (self.fname, len(self.files))
+#class Vmanifest:
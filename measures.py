@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.5
+
+Exact length, area and centroid of exported entities, closed form from chords and bulges,
+w/o arcs tessellation (trig.unzipBulge, trig.bulgePoints); result don't depend on facets count.
+
+Polyline segment p1-p2 with bulge b: included angle 4 * atan(b), half angle t = 2 * atan(|b|),
+half chord h; arc length 2 * t * h / sin(t), circular segment (between chord and arc) area
+h^2 * (2t - sin(2t)) / (2 * sin(t)^2), segment centroid on chord normal, h * g(t) from chord midpoint.
+Polyline area and centroid: shoelace sums plus segments areas and moments, positive bulge adds area.
+Small angles (t < SERIES_ANGLE) by Taylor series, no cancellation in 2t - sin(2t) and g(t).
+
+Area signed: counterclockwise ring positive, as bulge. Open curves (open polylines, lines, arcs)
+area 0.0, centroid None (nan in arrays).
+
+Scalar functions for VacEntity records (snippets.py), numpy functions for batches,
+e.g. all polylines of npz sink output (sinks.VnpzSink):
+    d = numpy.load('name.dwg.npz')
+    res = npzMeasures(d)
+    res['length'], res['area'], res['centroid']
+'''
+
+import math
+
+import trig
+import acadconst
+
+numpy = trig.numpy
+
+SERIES_ANGLE = 0.5
+# Taylor series in t^2: 2t - sin(2t) = t^3 * F(t^2), g(t) = t * G(t^2); relative error < 1e-16 for t < 0.5
+F_SERIES = (4.0/3.0, -4.0/15.0, 8.0/315.0, -4.0/2835.0, 8.0/155925.0, -8.0/6081075.0, 16.0/638512875.0,
+    -4.0/10854718875.0, 8.0/1856156927625.0)
+G_SERIES = (1.0/5.0, 11.0/525.0, 2.0/875.0, 701.0/3031875.0, 40022.0/1773646875.0, 45538.0/20692546875.0,
+    493132.0/2261399765625.0, 7628152201.0/347384924996484375.0, 430588174.0/192991624998046875.0,
+    37165429060822.0/163592245803969404296875.0)
+
+
+def series(coefs, x):
+    ''' polynomial coefs[0] + coefs[1] * x + ..., number or numpy array x
+    '''
+    res = coefs[-1]
+    for c in coefs[-2::-1]:
+        res = res * x + c
+    return res
+
+
+def segmentShape(t):
+    ''' (2t - sin(2t), g) for half angle t of circular segment;
+    segment area = h^2 * (2t - sin(2t)) / (2 * sin(t)^2), centroid h * g from chord, h: half chord
+    '''
+    if t < SERIES_ANGLE:
+        t2 = t * t
+        return (t2 * t * series(F_SERIES, t2), t * series(G_SERIES, t2))
+    f = 2.0 * t - math.sin(2.0 * t)
+    s = math.sin(t)
+    return (f, (4.0 * s * s * s - 3.0 * math.cos(t) * f) / (3.0 * s * f))
+
+
+def segmentsShape(t):
+    ''' segmentShape for numpy array of half angles t > 0
+    '''
+    np = numpy
+    err = np.seterr(divide='ignore', invalid='ignore', over='ignore')
+    try:
+        t2 = t * t
+        sf,sg = (t2 * t * series(F_SERIES, t2), t * series(G_SERIES, t2))
+        f = 2.0 * t - np.sin(2.0 * t)
+        s = np.sin(t)
+        g = (4.0 * s * s * s - 3.0 * np.cos(t) * f) / (3.0 * s * f)
+    finally:
+        np.seterr(**err)
+    small = t < SERIES_ANGLE
+    return (np.where(small, sf, f), np.where(small, sg, g))
+
+
+def segmentMeasures(x1, y1, x2, y2, bulge):
+    ''' (length, area, mx, my): segment p1-p2 contribution to polyline length, ring area and
+    area moments (area * centroid x, y); sums over ring segments give ring measures.
+    Coords relative to some point near the ring (first vertex), shoelace sums lose precision far from origin.
+    '''
+    cross = x1 * y2 - x2 * y1
+    area = cross / 2.0
+    mx,my = ((x1 + x2) * cross / 6.0, (y1 + y2) * cross / 6.0)
+    dx,dy = (x2 - x1, y2 - y1)
+    chord = math.hypot(dx, dy)
+    if bulge == 0.0 or chord == 0.0:
+        return (chord, area, mx, my)
+    t = 2.0 * math.atan(abs(bulge))
+    h = chord / 2.0
+    s = math.sin(t)
+    f,g = segmentShape(t)
+    seg = h * h * f / (2.0 * s * s)
+    k = h * g / chord # segment centroid: chord midpoint + k * (dy, -dx), arc side
+    if bulge < 0.0:
+        seg,k = (-seg, -k)
+    gx,gy = ((x1 + x2) / 2.0 + k * dy, (y1 + y2) / 2.0 - k * dx)
+    return (2.0 * t * h / s, area + seg, mx + seg * gx, my + seg * gy)
+
+
+def segmentsMeasures(x1, y1, x2, y2, bulge):
+    ''' segmentMeasures for numpy arrays [n], (length, area, mx, my) arrays
+    '''
+    trig.needNumpy('segmentsMeasures')
+    np = numpy
+    x1,y1,x2,y2,bulge = [np.asarray(a, dtype=np.float64) for a in (x1, y1, x2, y2, bulge)]
+    cross = x1 * y2 - x2 * y1
+    area = cross / 2.0
+    mx,my = ((x1 + x2) * cross / 6.0, (y1 + y2) * cross / 6.0)
+    dx,dy = (x2 - x1, y2 - y1)
+    chord = np.hypot(dx, dy)
+    arc = (bulge != 0.0) & (chord > 0.0)
+    t = np.where(arc, 2.0 * np.arctan(np.abs(bulge)), SERIES_ANGLE) # straight: any t, result dropped
+    h = chord / 2.0
+    s = np.sin(t)
+    f,g = segmentsShape(t)
+    sign = np.where(bulge < 0.0, -1.0, 1.0)
+    seg = np.where(arc, h * h * f / (2.0 * s * s), 0.0) * sign
+    k = np.where(arc, h * g / np.where(arc, chord, 1.0), 0.0) * sign
+    gx,gy = ((x1 + x2) / 2.0 + k * dy, (y1 + y2) / 2.0 - k * dx)
+    return (np.where(arc, 2.0 * t * h / s, chord), area + seg, mx + seg * gx, my + seg * gy)
+
+
+def polylineMeasures(pts, bulges=None, closed=False):
+    ''' (length, area, centroid) for polyline points [(x, y), ...] and bulges (segment started at vertex);
+    open polyline: area 0.0, centroid None; closed one: centroid None if area is 0
+    '''
+    n = len(pts)
+    if n == 0:
+        return (0.0, 0.0, None)
+    if not bulges:
+        bulges = [0.0] * n
+    x0,y0 = (pts[0][0], pts[0][1])
+    length = area = mx = my = 0.0
+    count = n - 1
+    if closed:
+        count = n
+    for i in xrange(count):
+        p,q = (pts[i], pts[(i + 1) % n])
+        l,a,x,y = segmentMeasures(p[0] - x0, p[1] - y0, q[0] - x0, q[1] - y0, bulges[i])
+        length += l
+        area += a
+        mx += x
+        my += y
+    if not closed or area == 0.0:
+        return (length, 0.0, None)
+    return (length, area, (x0 + mx / area, y0 + my / area))
+
+
+def polylinesMeasures(xy, bulge, offsets, closed):
+    ''' polylineMeasures for many polylines, numpy needed.
+    xy: [m, 2] vertices, bulge: [m], offsets: [n + 1], polyline i vertices xy[offsets[i]:offsets[i+1]],
+    offsets[0] = 0, offsets[n] = m; closed: bool [n] or bool.
+    Returns dict of numpy arrays: length [n], area [n], centroid [n, 2] (nan for open polylines)
+    '''
+    trig.needNumpy('polylinesMeasures')
+    np = numpy
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    bulge = np.asarray(bulge, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n = len(offsets) - 1
+    closed = np.zeros(n, dtype=bool) | np.asarray(closed, dtype=bool)
+    counts = np.diff(offsets)
+    poly = np.repeat(np.arange(n), counts)
+    full = counts > 0
+    # segment for each vertex: to next vertex, last one to first vertex if polyline closed
+    nxt = np.arange(len(xy)) + 1
+    last = offsets[1:][full] - 1
+    nxt[last] = offsets[:-1][full]
+    use = np.ones(len(xy), dtype=bool)
+    use[last] = closed[full]
+    first = offsets[:-1][poly]
+    x0,y0 = (xy[first, 0], xy[first, 1])
+    l,a,mx,my = segmentsMeasures(xy[:, 0] - x0, xy[:, 1] - y0, xy[nxt, 0] - x0, xy[nxt, 1] - y0,
+        np.where(use, bulge, 0.0))
+    w = use.astype(np.float64)
+    length = np.bincount(poly, weights=l * w, minlength=n)
+    area = np.bincount(poly, weights=a * w, minlength=n)
+    mx = np.bincount(poly, weights=mx * w, minlength=n)
+    my = np.bincount(poly, weights=my * w, minlength=n)
+    area[~closed] = 0.0
+    centroid = np.empty((n, 2), dtype=np.float64)
+    centroid.fill(np.nan)
+    ok = area != 0.0
+    centroid[ok, 0] = xy[offsets[:-1][ok], 0] + mx[ok] / area[ok]
+    centroid[ok, 1] = xy[offsets[:-1][ok], 1] + my[ok] / area[ok]
+    return {'length': length, 'area': area, 'centroid': centroid}
+#def polylinesMeasures(xy, bulge, offsets, closed):
+
+
+def arcMeasures(center, start, end, midpoint):
+    ''' (length, area, centroid) for arc points as in VacArc coords: arc length,
+    circular segment (arc closed by chord) area, signed as sweep, and centroid
+    '''
+    sa,sweep = trig.arcSweep(center, start, end, midpoint)
+    r = math.hypot(start[0] - center[0], start[1] - center[1])
+    t = abs(sweep) / 2.0
+    if t == 0.0:
+        return (0.0, 0.0, None)
+    f,g = segmentShape(t)
+    area = r * r * f / 2.0
+    d = 4.0 * r * math.sin(t) ** 3 / (3.0 * f) # from center, to arc midpoint
+    a = sa + sweep / 2.0
+    if sweep < 0.0:
+        area = -area
+    return (r * abs(sweep), area, (center[0] + d * math.cos(a), center[1] + d * math.sin(a)))
+
+
+def circleMeasures(center, radius):
+    ''' (length, area, centroid) for circle
+    '''
+    return (2.0 * math.pi * radius, math.pi * radius * radius, (center[0], center[1]))
+
+
+def entityMeasures(etype, ent):
+    ''' (length, area, centroid) for VacEntity with WCS points ent.pts, None for point like entities
+    (blocks, texts, points) and for coords or radius not read (dwg.dump.py --columns);
+    arcs and lines are open curves, area 0.0
+    '''
+    pts = ent.pts
+    if not pts:
+        return None
+    if etype == acadconst.acPolylineLight:
+        return polylineMeasures(pts, ent.bulges, ent.closed is True)
+    if etype == acadconst.acLine:
+        return (math.hypot(pts[1][0] - pts[0][0], pts[1][1] - pts[0][1]), 0.0, None)
+    if etype == acadconst.acArc:
+        return (arcMeasures(*pts[:4])[0], 0.0, None)
+    if etype == acadconst.acCircle:
+        if ent.radius == '':
+            return None
+        return circleMeasures(pts[0], ent.radius)
+    return None
+
+
+def rangesIndex(starts, counts):
+    ''' numpy index of ranges [starts[i], starts[i] + counts[i]) concatenated
+    '''
+    np = numpy
+    ends = np.cumsum(counts)
+    return np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts - starts, counts)
+
+
+def npzMeasures(d):
+    ''' entityMeasures for npz sink output (numpy.load result or dict of its arrays).
+    Returns dict of numpy arrays: length [n], area [n], centroid [n, 2];
+    point like entities: length 0.0, area 0.0, centroid nan
+    '''
+    trig.needNumpy('npzMeasures')
+    np = numpy
+    typenum = np.asarray(d['typenum'])
+    off = np.asarray(d['vertex_offset'], dtype=np.int64)
+    xy = np.asarray(d['xy'], dtype=np.float64).reshape(-1, 2)
+    n = len(typenum)
+    length = np.zeros(n, dtype=np.float64)
+    area = np.zeros(n, dtype=np.float64)
+    centroid = np.empty((n, 2), dtype=np.float64)
+    centroid.fill(np.nan)
+
+    idx = np.nonzero(typenum == acadconst.acPolylineLight)[0]
+    if len(idx):
+        counts = off[idx + 1] - off[idx]
+        vert = rangesIndex(off[idx], counts)
+        sub = np.zeros(len(idx) + 1, dtype=np.int64)
+        np.cumsum(counts, out=sub[1:])
+        closed = (d['closed_dict'][d['closed']] == u'True')[idx]
+        res = polylinesMeasures(xy[vert], np.asarray(d['bulge'])[vert], sub, closed)
+        length[idx],area[idx],centroid[idx] = (res['length'], res['area'], res['centroid'])
+
+    idx = np.nonzero(typenum == acadconst.acLine)[0]
+    if len(idx):
+        p,q = (xy[off[idx]], xy[off[idx] + 1])
+        length[idx] = np.hypot(q[:, 0] - p[:, 0], q[:, 1] - p[:, 1])
+
+    idx = np.nonzero(typenum == acadconst.acArc)[0]
+    if len(idx):
+        c,s = (xy[off[idx]], xy[off[idx] + 1])
+        sa,sweep = trig.arcSweeps(c, s, xy[off[idx] + 2], xy[off[idx] + 3])
+        length[idx] = np.hypot(s[:, 0] - c[:, 0], s[:, 1] - c[:, 1]) * np.abs(sweep)
+
+    idx = np.nonzero(typenum == acadconst.acCircle)[0]
+    if len(idx):
+        radii = []
+        for v in d['radius_dict']:
+            try:
+                radii.append(float(v))
+            except ValueError:
+                radii.append(np.nan)
+        r = np.array(radii, dtype=np.float64)[np.asarray(d['radius'])[idx]]
+        length[idx] = 2.0 * np.pi * r
+        area[idx] = np.pi * r * r
+        centroid[idx] = xy[off[idx]]
+    return {'length': length, 'area': area, 'centroid': centroid}
+#def npzMeasures(d):
@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8 -*-
+
+'''
+Created on 2026-10-17
+
+Python >= 2.5
+
+Output sinks for comtypesDump records.
+Sink gets header (description, column names) once and then each dumped entity (VacItem);
+Vsinks passes the same records to several sinks, e.g. CSV and CSV.gz.
+Writes collected in memory and go to file in big blocks (VblockFile), that matters for
+network shares (\\\\linserv\\...). Sinks closed explicitly, by Vsinks.close().
+
+Sinks by name (dwg.dump.py --sink NAME):
+    csv         name.dwg.csv, default
+    csv.gz      name.dwg.csv.gz, gzip stream
+    csv.zst     name.dwg.csv.zst, zstd stream, zstandard module needed
+    npz         name.dwg.npz, columnar numpy arrays, numpy needed (VnpzSink)
+    gpkg        name.dwg.gpkg, GeoPackage, sqlite3 (gpkg.VgpkgSink)
+
+Usage:
+    out = openSinks(['csv', 'csv.gz'], 'name.dwg')
+    out.header(description, heads)
+    for item in items:
+        out.write(dwgName, item)
+    out.close()
+'''
+
+import os
+import csv
+import array
+
+cp = 'utf-8'
+BLOCK_SIZE = 1024 * 1024
+
+
+class VblockFile(object):
+    ''' File object wrapper, writes collected in memory and passed to file by blocks of bufsize bytes
+    '''
+    def __init__(self, fileObj, bufsize=BLOCK_SIZE):
+        self.fileObj = fileObj
+        self.bufsize = bufsize
+        self.parts = []
+        self.size = 0
+        self.written = 0
+
+    def write(self, data):
+        self.parts.append(data)
+        self.size += len(data)
+        if self.size >= self.bufsize:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            data = ''.join(self.parts)
+            self.fileObj.write(data)
+            self.written += len(data)
+            self.parts = []
+            self.size = 0
+
+    def tell(self):
+        ''' bytes written, buffered included
+        '''
+        return self.written + self.size
+
+    def close(self):
+        self.flush()
+        self.fileObj.close()
+#class VblockFile(object):
+
+
+def openOutput(fname, compress='', offset=None):
+    ''' binary file object for writing: plain, gzip or zstd stream.
+    offset: continue plain file truncated to offset bytes
+    '''
+    if compress == 'gz':
+        import gzip
+        return gzip.open(fname, 'wb', 6)
+    if compress == 'zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise NameError('zstandard module needed for [%s]' % fname)
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(fname, 'wb'))
+    if offset is None:
+        return open(fname, 'wb')
+    f = open(fname, 'r+b')
+    f.truncate(offset)
+    f.seek(offset)
+    return f
+
+
+class Vsink(object):
+    ''' Sink interface
+    '''
+    # sink can be truncated to offset and continued (comtypesDump --resume)
+    resumable = False
+
+    def header(self, description, heads):
+        ''' description: encoded text; heads: list of encoded column names, w/o dwg column
+        '''
+        pass
+
+    def write(self, dwg, item):
+        ''' dwg: drawing name column; item: VacItem record
+        '''
+        pass
+
+    def sync(self):
+        ''' flush data to disk, return offset for resume or None
+        '''
+        return None
+
+    def close(self):
+        pass
+#class Vsink(object):
+
+
+class VcsvSink(Vsink):
+    ''' CSV file: description row, heads row, row per entity.
+    csv.writer(delimiter=';', quotechar="'", quoting=csv.QUOTE_ALL, lineterminator='\\n')
+    '''
+    def __init__(self, fname, compress='', offset=None, bufsize=BLOCK_SIZE):
+        self.fname = fname
+        self.resumable = not compress
+        self.fileObj = openOutput(fname, compress, offset)
+        self.buf = VblockFile(self.fileObj, bufsize)
+        self.csvWriter = csv.writer(self.buf,
+            delimiter=';', quotechar="'", quoting=csv.QUOTE_ALL,
+            lineterminator='\n')
+
+    def header(self, description, heads):
+        self.csvWriter.writerow([description])
+        self.csvWriter.writerow([u'dwg'] + heads)
+
+    def write(self, dwg, item):
+        self.csvWriter.writerow([dwg] + item.listValues(cp))
+
+    def writerow(self, row):
+        self.csvWriter.writerow(row)
+
+    def sync(self):
+        self.buf.flush()
+        if not self.resumable:
+            return None
+        self.fileObj.flush()
+        os.fsync(self.fileObj.fileno())
+        return self.fileObj.tell()
+
+    def close(self):
+        if self.buf is not None:
+            self.buf.close()
+            self.buf = None
+#class VcsvSink(Vsink):
+
+
+class Vsinks(Vsink):
+    ''' Same records to each sink
+    '''
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.resumable = bool(self.sinks) and not [s for s in self.sinks if not s.resumable]
+
+    def header(self, description, heads):
+        for s in self.sinks:
+            s.header(description, heads)
+
+    def write(self, dwg, item):
+        for s in self.sinks:
+            s.write(dwg, item)
+
+    def sync(self):
+        ''' list of sinks offsets
+        '''
+        return [s.sync() for s in self.sinks]
+
+    def close(self):
+        for s in self.sinks:
+            s.close()
+#class Vsinks(Vsink):
+
+
+class VdictColumn(object):
+    ''' Dictionary encoded strings column: distinct values list and value code for each row
+    '''
+    def __init__(self):
+        self.index = {}
+        self.values = []
+        self.codes = array.array('i')
+
+    def push(self, value):
+        value = unicode(value)
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+#class VdictColumn(object):
+
+
+class VnpzSink(Vsink):
+    ''' Columnar output, numpy .npz file (uncompressed zip of .npy arrays), written on close.
+    Coordinates stored as float64, w/o text formatting and parsing; string columns dictionary encoded.
+
+    Arrays, n: entities count, m: vertices count:
+        dwg, description        drawing name, CSV description text
+        typenum, id             int32, int64 [n]; id 0 if not read (dwg.dump.py --columns)
+        handle                  unicode [n]
+        typename, layer, attribs, text, closed, radius, angle
+                                int32 codes [n], values in <name>_dict unicode array;
+                                text is block name or text string, other fields as in CSV
+        vertex_offset           int64 [n + 1], entity i vertices: xy[vertex_offset[i]:vertex_offset[i+1]]
+        xy                      float64 [m, 2], WCS, points in CSV coords order
+        bulge                   float64 [m], polyline bulge for segment started at vertex, 0.0 for others
+
+    Read:
+        d = numpy.load('name.dwg.npz')
+        layers = d['layer_dict'][d['layer']]
+        off = d['vertex_offset']
+        pts = d['xy'][off[i]:off[i + 1]]
+    '''
+    COLUMNS = ('typename', 'layer', 'attribs', 'text', 'closed', 'radius', 'angle')
+
+    def __init__(self, fname):
+        try:
+            import numpy
+        except ImportError:
+            raise NameError('numpy module needed for [%s]' % fname)
+        self.numpy = numpy
+        self.fname = fname
+        self.dwg = u''
+        self.description = u''
+        self.typenum = array.array('i')
+        self.ids = []
+        self.handles = []
+        self.cols = dict([(k, VdictColumn()) for k in self.COLUMNS])
+        self.offsets = array.array('l', [0])
+        self.xy = array.array('d')
+        self.bulge = array.array('d')
+
+    def header(self, description, heads):
+        self.description = description.decode(cp)
+
+    def write(self, dwg, item):
+        self.dwg = dwg
+        ent = item.ent
+        self.typenum.append(item.etype)
+        self.ids.append(item.id or 0)
+        self.handles.append(item.handle)
+        cols = self.cols
+        cols['typename'].push(item.name)
+        cols['layer'].push(item.lyr)
+        cols['attribs'].push(item.attr2str())
+        cols['text'].push(ent.name)
+        cols['closed'].push(ent.closed)
+        cols['radius'].push(ent.radius)
+        cols['angle'].push(ent.angle)
+        xy = self.xy
+        for p in ent.pts:
+            xy.append(p[0])
+            xy.append(p[1])
+        if ent.bulges is None:
+            self.bulge.extend([0.0] * len(ent.pts))
+        else:
+            self.bulge.extend(ent.bulges)
+        self.offsets.append(len(xy) // 2)
+
+    def close(self):
+        if self.fname is None:
+            return
+        np = self.numpy
+        res = {
+            'dwg': np.array(self.dwg, dtype=np.unicode_),
+            'description': np.array(self.description, dtype=np.unicode_),
+            'typenum': np.array(self.typenum, dtype=np.int32),
+            'id': np.array(self.ids, dtype=np.int64),
+            'handle': np.array(self.handles, dtype=np.unicode_),
+            'vertex_offset': np.array(self.offsets, dtype=np.int64),
+            'xy': np.frombuffer(self.xy, dtype=np.float64).reshape(-1, 2),
+            'bulge': np.frombuffer(self.bulge, dtype=np.float64),
+        }
+        for k,c in self.cols.items():
+            res[k] = np.array(c.codes, dtype=np.int32)
+            res[k + '_dict'] = np.array(c.values, dtype=np.unicode_)
+        f = open(self.fname, 'wb')
+        try:
+            np.savez(f, **res)
+        finally:
+            f.close()
+        self.fname = None
+#class VnpzSink(Vsink):
+
+
+# sink name: (file name suffix, constructor(fname, offset, bufsize, tolerance))
+# tolerance: trig.VarcTolerance for sinks with tessellated arcs, or None
+SINKS = {
+    'csv': ('.csv', lambda fname, offset, bufsize, tolerance: VcsvSink(fname, '', offset, bufsize)),
+    'csv.gz': ('.csv.gz', lambda fname, offset, bufsize, tolerance: VcsvSink(fname, 'gz', None, bufsize)),
+    'csv.zst': ('.csv.zst', lambda fname, offset, bufsize, tolerance: VcsvSink(fname, 'zst', None, bufsize)),
+    'npz': ('.npz', lambda fname, offset, bufsize, tolerance: VnpzSink(fname)),
+    'gpkg': ('.gpkg', lambda fname, offset, bufsize, tolerance: gpkgSink(fname, tolerance)),
+}
+
+
+def gpkgSink(fname, tolerance=None):
+    import gpkg
+    return gpkg.VgpkgSink(fname, tolerance=tolerance)
+
+
+def sinkSources(names):
+    ''' source files of sinks modules for sink names, for extractor version (manifest.extractorVersion)
+    '''
+    res = [__file__]
+    if 'gpkg' in names:
+        import gpkg, measures
+        res.extend([gpkg.__file__, measures.__file__])
+    return res
+
+
+def sinkName(name, base):
+    ''' output file name for sink name and base name (name.dwg)
+    '''
+    if name not in SINKS:
+        raise NameError('Unknown sink [%s], known sinks [%s]' % (name, ', '.join(sorted(SINKS.keys()))))
+    return base + SINKS[name][0]
+
+
+def makeSink(name, base, offset=None, bufsize=BLOCK_SIZE, tolerance=None):
+    return SINKS[name][1](sinkName(name, base), offset, bufsize, tolerance)
+
+
+def openSinks(names, base, offsets=None, bufsize=BLOCK_SIZE, tolerance=None):
+    ''' Vsinks for sink names; sinks opened already closed if some sink can't be opened
+    '''
+    if offsets is None:
+        offsets = [None] * len(names)
+    res = []
+    try:
+        for name,offset in zip(names, offsets):
+            res.append(makeSink(name, base, offset, bufsize, tolerance))
+    except:
+        for s in res:
+            s.close()
+        raise
+    return Vsinks(res)
@@ -67,6 +67,7 @@ http://www.kxcad.net/autodesk/autocad/Autodesk_AutoCAD_ActiveX_and_VBA_Developer
 
 import math, array
 import trig
+import acadconst
 
 
 def getModule(sModuleName):
@@ -106,15 +107,39 @@ def CType(obj, interface):
     except:
         return None
 
+def loadDumper():
+    ''' import dwg.dump.py as module
+    '''
+    import imp, os
+    fname = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dwg.dump.py')
+    return imp.load_source('dwgdump', fname)
+
 def point2str(xyz):
     return u'%0.16f, %0.16f' % (xyz[0], xyz[1])
 
+# VacEntity.reads predicates: (adapter type, columns): predicate
+readsCache = {}
+readsAll = lambda prop: True
+# VacEntity.skips counts: (adapter type, columns): number of properties not read
+skipsCache = {}
+
 
 class VacEntity (object):
     ''' EntityType adapter (c:\program...\Autodesk Topobase Client 2011\Help\acadauto.chm)
     Basic class for entity coordinates and properties.
-    Coords in WCS except for some rare cases
+    Coords in WCS except for some rare cases.
+    Record fields: coords, angle, name (text column), closed, radius; no per-instance dict.
+    pts: coords as WCS points [(x, y), ...], bulges: polyline bulge for each point (or None),
+    for binary outputs (sinks.VnpzSink).
+
+    Projection: adapter created with cols (set of column names) reads only properties
+    listed in PROPS for these columns; fields for other columns stay empty,
+    unless the same properties read for listed column.
     '''
+    __slots__ = ('coords', 'angle', 'name', 'closed', 'radius', 'pts', 'bulges')
+    # column: properties read for it
+    PROPS = {}
+
     def __init__(self, item=''):
         super(VacEntity, self).__init__()
         self.coords = ''
@@ -122,6 +147,8 @@ class VacEntity (object):
         self.name = ''
         self.closed = ''
         self.radius = ''
+        self.pts = ()
+        self.bulges = None
 
     def toStr(self):
         return u'%s;%s;%s;%s;%s' % (self.coords, self.angle, self.name, self.closed, self.radius)
@@ -171,8 +198,45 @@ class VacEntity (object):
     def heads(self):
         return u'coords, angle, text, closed, radius'
 
+    @classmethod
+    def props(cls, cols=None):
+        ''' set of properties read for columns cols, all columns if None
+        '''
+        res = set()
+        for k,v in cls.PROPS.items():
+            if cols is None or k in cols:
+                res.update(v)
+        return res
+
+    def reads(self, cols):
+        ''' predicate: is property read for columns cols (frozenset or None), cached per adapter type
+        '''
+        if cols is None:
+            return readsAll
+        key = (type(self), cols)
+        res = readsCache.get(key)
+        if res is None:
+            res = readsCache[key] = self.props(cols).__contains__
+        return res
+
+    @classmethod
+    def skips(cls, cols):
+        ''' number of properties not read for columns cols, cached per adapter type;
+        GetBulge counted once, vertices count unknown when Coordinates not read
+        '''
+        if cols is None:
+            return 0
+        key = (cls, cols)
+        res = skipsCache.get(key)
+        if res is None:
+            res = skipsCache[key] = len(cls.props()) - len(cls.props(cols))
+        return res
+
     def values(self):
-        return u'%s//%s//%s//%s//%s' % (self.coords, self.angle, self.name, self.closed, self.radius)
+        ''' list of unicode field values, in heads() order
+        '''
+        return [unicode(self.coords), unicode(self.angle), unicode(self.name),
+            unicode(self.closed), unicode(self.radius)]
 
     def getWCSpointsFromOCSangle(self, pnt, norm, angle=0.0):
         '''Returns tuple with three points (sp, cx, cy)
@@ -206,17 +270,27 @@ class VacBlock (VacEntity):
     coords: InsertionPoint, SecondPoint, X-axis, Y-axis
         SecondPoint, X-axis, Y-axis: three points that defines rotation angle, OCS X,Y axis in WCS
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('InsertionPoint', 'Rotation', 'Normal'), 'angle': ('Rotation',),
+        'text': ('Name',), 'radius': ('XScaleFactor', 'YScaleFactor')}
+
+    def __init__(self, item='', cols=None):
         super(VacBlock, self).__init__(item)
         if not item: return
         o = CType(item, AutoCAD.IAcadBlockReference)
-        self.coords = o.InsertionPoint # point2str(o.InsertionPoint)
-        self.angle = o.Rotation
-        self.name = o.Name
-        self.radius = u'%s, %s' % (o.XScaleFactor, o.YScaleFactor)
+        reads = self.reads(cols)
+        if reads('Rotation'):
+            self.angle = o.Rotation
+        if reads('Name'):
+            self.name = o.Name
+        if reads('XScaleFactor'):
+            self.radius = u'%s, %s' % (o.XScaleFactor, o.YScaleFactor)
+        if not reads('InsertionPoint'): return
 
+        self.coords = o.InsertionPoint # point2str(o.InsertionPoint)
         norm = o.Normal
         sp,cx,cy = self.getWCSpointsFromOCSangle(self.coords, norm, self.angle)
+        self.pts = (self.coords, sp, cx, cy)
         self.coords = u'%s, %s, %s, %s' % (point2str(self.coords), point2str(sp), point2str(cx), point2str(cy))
         #~ self.angle = u'%s, %s' % (self.angle, VAcad.ocs2wcsAngle(self.angle, norm))
 #class VacBlock (VacEntity)
@@ -236,38 +310,47 @@ class VacLWPolyline (VacEntity):
         coordinateWCS = ThisDrawing.Utility.TranslateCoordinates(firstVertex, acOCS, acWorld, False, plineNormal)
         coordinateUCS = ThisDrawing.Utility.TranslateCoordinates(firstVertex, acOCS, acUCS, False, plineNormal)
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('Closed', 'Coordinates', 'Normal', 'GetBulge'), 'closed': ('Closed',)}
+
+    def __init__(self, item='', cols=None):
         super(VacLWPolyline, self).__init__(item)
         if not item: return
         o = CType(item, AutoCAD.IAcadLWPolyline)
-        self.closed = o.Closed
-        self.coords = o.Coordinates
+        reads = self.reads(cols)
+        if reads('Closed'):
+            self.closed = o.Closed
+        if not reads('Coordinates'): return
+        coords = o.Coordinates
         if self.closed:
             # add closing point
-            self.coords = self.coords + (self.coords[0], self.coords[1])
+            coords = tuple(coords) + (coords[0], coords[1])
 
-        # format WCS coords string with bulges
-        llen = len(self.coords)
+        # format WCS coords string with bulges, vertices transformed all at once
         norm = o.Normal
         bsign = self.getWCSBulgeSign(norm)
-        s = u''
-        for n,e in zip(range(llen), self.coords):
-            if n%2 == 0: # 0, 2, 4,...
-                if s: s += u', '
-                p = VAcad.trans((e, self.coords[n+1], 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
-                if n < llen-2: # not last pair
-                    ind = n/2
-                    b = bsign * o.GetBulge(ind)
-                    if not b == 0.0:
-                        s += u'(bulge %0.5f) ' % b
-                        print '  polyline [%s] have bulge [%0.3f] at segment [%u]' % (o.Handle, b, ind+1)
-                s += point2str(p)
-        self.coords = s
-#	def __init__(self, item=''):
+        pts = VAcad.transXY(coords, AutoCAD.acOCS, AutoCAD.acWorld, norm)
+        last = len(pts) - 1
+        lst = []
+        bulges = [0.0] * len(pts)
+        for ind,p in enumerate(pts):
+            if ind < last: # not last pair
+                b = bsign * o.GetBulge(ind)
+                if not b == 0.0:
+                    bulges[ind] = b
+                    lst.append(u'(bulge %0.5f) %0.16f, %0.16f' % (b, p[0], p[1]))
+                    print '  polyline [%s] have bulge [%0.3f] at segment [%u]' % (o.Handle, b, ind+1)
+                    continue
+            lst.append(u'%0.16f, %0.16f' % (p[0], p[1]))
+        self.coords = u', '.join(lst)
+        self.pts,self.bulges = (pts, bulges)
+#	def __init__(self, item='', cols=None):
 
     def getWCSBulgeSign(self, norm):
         '''Detect bulge sign in WCS using predefined vectors in OCS
         '''
+        if VAcad.localTrans:
+            return VAcad.ocsCache.get(norm).bulgeSign
         p0 = VAcad.trans((0.0, 0.0, 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
         p1 = VAcad.trans((2.0, 1.0, 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
         p2 = VAcad.trans((2.0, 2.0, 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
@@ -288,19 +371,31 @@ class VacText (VacEntity):
 
     To position text whose justification is other than left, aligned, or fit, use the TextAlignmentPoint.
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('InsertionPoint', 'TextAlignmentPoint', 'Rotation', 'Normal'),
+        'text': ('TextString',), 'angle': ('Rotation',), 'closed': ('StyleName',),
+        'radius': ('Alignment', 'VerticalAlignment', 'HorizontalAlignment', 'Height', 'ScaleFactor', 'Backward')}
+
+    def __init__(self, item='', cols=None):
         super(VacText, self).__init__(item)
         if not item: return
         o = CType(item, AutoCAD.IAcadText)
-        self.coords = (o.InsertionPoint, o.TextAlignmentPoint)
-        self.name = o.TextString
-        self.angle = o.Rotation
-        self.radius = u'%s, %s, %s, %s, %s, %s' % (
-            o.Alignment, o.VerticalAlignment, o.HorizontalAlignment, o.Height, o.ScaleFactor, o.Backward)
-        self.closed = o.StyleName
+        reads = self.reads(cols)
+        if reads('TextString'):
+            self.name = o.TextString
+        if reads('Rotation'):
+            self.angle = o.Rotation
+        if reads('Alignment'):
+            self.radius = u'%s, %s, %s, %s, %s, %s' % (
+                o.Alignment, o.VerticalAlignment, o.HorizontalAlignment, o.Height, o.ScaleFactor, o.Backward)
+        if reads('StyleName'):
+            self.closed = o.StyleName
+        if not reads('InsertionPoint'): return
 
+        self.coords = (o.InsertionPoint, o.TextAlignmentPoint)
         norm = o.Normal
         sp,cx,cy = self.getWCSpointsFromOCSangle(self.coords[0], norm, self.angle)
+        self.pts = (self.coords[0], self.coords[1], sp, cx, cy)
         self.coords = u'%s, %s, %s, %s, %s' % (
             point2str(self.coords[0]), point2str(self.coords[1]),
             point2str(sp), point2str(cx), point2str(cy))
@@ -314,11 +409,15 @@ class VacLine (VacEntity):
 
     extra attribs: Thickness
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('StartPoint', 'EndPoint')}
+
+    def __init__(self, item='', cols=None):
         super(VacLine, self).__init__(item)
-        if not item: return
+        if not item or not self.reads(cols)('StartPoint'): return
         o = CType(item, AutoCAD.IAcadLine)
-        self.coords = u'%s, %s' % (point2str(o.StartPoint), point2str(o.EndPoint))
+        self.pts = (o.StartPoint, o.EndPoint)
+        self.coords = u'%s, %s' % (point2str(self.pts[0]), point2str(self.pts[1]))
 #class VacLine (VacEntity)
 
 
@@ -328,12 +427,19 @@ class VacCircle (VacEntity):
 
     extra attribs: Thickness
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('Center',), 'radius': ('Radius',)}
+
+    def __init__(self, item='', cols=None):
         super(VacCircle, self).__init__(item)
         if not item: return
         o = CType(item, AutoCAD.IAcadCircle)
-        self.coords = point2str(o.Center)
-        self.radius = o.Radius
+        reads = self.reads(cols)
+        if reads('Center'):
+            self.pts = (o.Center,)
+            self.coords = point2str(self.pts[0])
+        if reads('Radius'):
+            self.radius = o.Radius
 #class VacCircle (VacEntity)
 
 
@@ -354,19 +460,27 @@ class VacArc (VacEntity):
 
     Arc direction given in UCS and coords in WCS.
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('Center', 'StartPoint', 'EndPoint', 'Radius', 'Normal'), 'radius': ('Radius',),
+        'angle': ('StartAngle', 'EndAngle')}
+
+    def __init__(self, item='', cols=None):
         super(VacArc, self).__init__(item)
         if not item: return
         o = CType(item, AutoCAD.IAcadArc)
+        reads = self.reads(cols)
+        if reads('StartAngle'):
+            # radians
+            self.angle = u'%s, %s' % (o.StartAngle, o.EndAngle)
+        if reads('Radius'):
+            self.radius = o.Radius
+        if not reads('Center'): return
+
         c,s,e = (o.Center, o.StartPoint, o.EndPoint)
-        sa,ea = (o.StartAngle, o.EndAngle)
+        wc,ws,we = (c, s, e)
         # WCS
         self.coords = u'%s, %s, %s' % (point2str(c), point2str(s), point2str(e))
 
-        self.radius = o.Radius
-        # radians
-        self.angle = u'%s, %s' % (sa, ea)
-
         # get midpoint
         norm = o.Normal
         c = VAcad.trans(c, AutoCAD.acWorld, AutoCAD.acOCS, norm)
@@ -375,6 +489,7 @@ class VacArc (VacEntity):
         m = trig.getArcMidpointP(c, self.radius, s, e)
         m = VAcad.trans(m, AutoCAD.acOCS, AutoCAD.acWorld, norm)
         self.coords = u'%s, %s' % (self.coords, point2str(m))
+        self.pts = (wc, ws, we, m)
 #class VacArc (VacEntity)
 
 
@@ -384,36 +499,159 @@ class VacPoint (VacEntity):
 
     extra attribs: Thickness
     '''
-    def __init__(self, item=''):
+    __slots__ = ()
+    PROPS = {'coords': ('Coordinates',)}
+
+    def __init__(self, item='', cols=None):
         super(VacPoint, self).__init__(item)
-        if not item: return
+        if not item or not self.reads(cols)('Coordinates'): return
         o = CType(item, AutoCAD.IAcadPoint)
-        self.coords = point2str(o.Coordinates)
+        self.pts = (o.Coordinates,)
+        self.coords = point2str(self.pts[0])
 #class VacPoint (VacEntity):
 
 
 class VAcadServices:
     '''Tools and services for transformations, etc.
+    AutoCAD connection made on first use of acad, ac, docs, doc, ms, u attributes.
     '''
     def __init__(self):
+        self.bulgeSign = ''
+        self.zeroAngle = ''
+        self.norm = ''
+        # OCS <-> WCS transformations computed locally, w/o TranslateCoordinates
+        self.localTrans = True
+        # compare every N-th local transformation with TranslateCoordinates result; 0: no checks
+        self.verifyTrans = 0
+        self.transCount = {'local': 0, 'com': 0, 'verified': 0}
+        # OCS parameters (matrices, zero angle, bulge sign) keyed by entity Normal
+        self.ocsCache = trig.VocsCache()
+
+    def __getattr__(self, name):
+        if name in ('acad', 'ac', 'docs', 'doc', 'ms', 'u'):
+            self.connect()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def connect(self, new=False):
+        ''' attach to running AutoCAD or start new AutoCAD instance
+        '''
         import comtypes.client
-        self.acad = comtypes.client.GetActiveObject('AutoCAD.Application')
+        if new:
+            self.acad = comtypes.client.CreateObject('AutoCAD.Application')
+        else:
+            self.acad = comtypes.client.GetActiveObject('AutoCAD.Application')
         self.ac = CType(self.acad, AutoCAD.IAcadApplication)
         self.docs = self.ac.Documents
         self.doc = self.ac.ActiveDocument
         self.ms = self.doc.ModelSpace
         self.u = self.doc.Utility
-        self.bulgeSign = ''
-        self.zeroAngle = ''
-        self.norm = ''
 
-    def openDWG(self, fname, ro=True):
-        self.docs.Close()
+    def quit(self):
+        ''' close AutoCAD instance started by connect(new=True)
+        '''
+        if 'acad' in self.__dict__:
+            self.ac.Quit()
+        for k in ('acad', 'ac', 'docs', 'doc', 'ms', 'u', 'opened'):
+            self.__dict__.pop(k, None)
+
+    def openDWG(self, fname, ro=True, closeAll=True):
+        ''' open fname, make it current document.
+        closeAll=False (session mode): only document opened by previous openDWG closed,
+        connection, type library and caches stay as is.
+        '''
+        if closeAll:
+            self.docs.Close()
+            self.__dict__.pop('opened', None)
+        else:
+            self.closeDWG()
         self.doc = self.docs.Open(fname, ro)
+        self.opened = self.doc
         self.ms = self.doc.ModelSpace
         self.u = self.doc.Utility
 
+    def closeDWG(self):
+        ''' close document opened by openDWG, w/o saving
+        '''
+        doc = self.__dict__.pop('opened', None)
+        if doc is not None:
+            doc.Close(False)
+
+    def enumItems(self, collection, start=0, batch=100):
+        ''' Items of collection (ModelSpace, SelectionSet) from start index, in Item(i) order.
+        Fetched by collection enumerator (_NewEnum, IEnumVARIANT.Next) in batches of batch items,
+        one COM call per batch instead of Item(i) call per item.
+        '''
+        import comtypes.automation
+        enum = CType(collection._NewEnum, comtypes.automation.IEnumVARIANT)
+        if enum is None:
+            raise NameError('Collection enumerator not available [%r]' % collection)
+        if start:
+            enum.Skip(start)
+        batch = max(batch, 2) # Next(1) returns (item, fetched)
+        while True:
+            items = enum.Next(batch)
+            if not items: break
+            for item in items:
+                yield item
+
+    def selectAll(self, name, dxfNames, space='Model'):
+        ''' New SelectionSet name (old one with the same name deleted) with all entities of
+        DXF types dxfNames (LWPOLYLINE, INSERT, ...) in space (DXF code 410)
+        '''
+        sets = self.doc.SelectionSets
+        for i in xrange(sets.Count):
+            ss = sets.Item(i)
+            if ss.Name.lower() == name.lower():
+                ss.Delete()
+                break
+        ss = sets.Add(name)
+        ss.Select(AutoCAD.acSelectionSetAll,
+            FilterType=array.array('h', [0, 410]), FilterData=(u','.join(dxfNames), space))
+        return ss
+
     def trans(self, point, csFrom, csTo, norm='', disp=False):
+        ''' Translate point from csFrom to csTo coordinate system.
+        OCS <-> WCS translation made by trig.Vocs2wcs (arbitrary axis algorithm),
+        other ones by Utility.TranslateCoordinates.
+        If verifyTrans > 0, every verifyTrans-th local result checked against COM result.
+        '''
+        if len(point) < 3:
+            point = (point[0], point[1], 0.0)
+        if norm and self.localTrans and (csFrom, csTo) in (
+                (AutoCAD.acOCS, AutoCAD.acWorld), (AutoCAD.acWorld, AutoCAD.acOCS)):
+            t = self.ocsCache.get(norm)
+            if csFrom == AutoCAD.acOCS:
+                p = t.ocs2wcsP(point)
+            else:
+                p = t.wcs2ocsP(point)
+            self.transCount['local'] += 1
+            if self.verifyTrans and self.transCount['local'] % self.verifyTrans == 0:
+                self.verifyTransform(p, point, csFrom, csTo, norm, disp)
+            return p
+        self.transCount['com'] += 1
+        return self.comTrans(point, csFrom, csTo, norm, disp)
+
+    def transXY(self, coords, csFrom, csTo, norm=''):
+        ''' Translate flat list of 2D coords (x1, y1, x2, y2, ...), e.g. LWPolyline.Coordinates.
+        Returns list of points [(x,y), ...].
+        OCS -> WCS made in one pass by trig.Vocs2wcs.ocs2wcsXY
+        '''
+        if norm and self.localTrans and (csFrom, csTo) == (AutoCAD.acOCS, AutoCAD.acWorld):
+            res = self.ocsCache.get(norm).ocs2wcsXY(coords)
+            self.transCount['local'] += len(res)
+            if self.verifyTrans and res:
+                self.verifyTransform(res[0], (coords[0], coords[1]), csFrom, csTo, norm)
+            return res
+        res = []
+        for n in xrange(0, len(coords) - 1, 2):
+            p = self.trans((coords[n], coords[n+1], 0.0), csFrom, csTo, norm)
+            res.append((p[0], p[1]))
+        return res
+
+    def comTrans(self, point, csFrom, csTo, norm='', disp=False):
+        ''' Translate point by Utility.TranslateCoordinates
+        '''
         if len(point) < 3:
             point = (point[0], point[1], 0.0)
         p = array.array('d', [point[0], point[1], point[2]])
@@ -424,10 +662,23 @@ class VAcadServices:
             p = self.u.TranslateCoordinates(p, csFrom, csTo, disp)
         return p
 
+    def verifyTransform(self, res, point, csFrom, csTo, norm, disp=False, accuracy=1e-6):
+        ''' Compare local transformation result with TranslateCoordinates result
+        '''
+        p = self.comTrans(point, csFrom, csTo, norm, disp)
+        self.transCount['verified'] += 1
+        for a,b in zip(res, p):
+            if not trig.floatIsEqual(a, b, accuracy * max(1.0, abs(b))):
+                raise NameError('Local trans failed. Point [%s], norm [%s], cs [%s -> %s], local [%s], COM [%s]' % (
+                    tuple(point), tuple(norm), csFrom, csTo, tuple(res), tuple(p)))
+
     def ocs2wcsAngle(self, angle, norm):
         ''' transform angle from OCS to WCS
         '''
-        #~ if not (self.norm and self.bulgeSign) or self.norm != norm:
+        if self.localTrans:
+            t = self.ocsCache.get(norm)
+            self.bulgeSign, self.zeroAngle, self.norm = (t.bulgeSign, t.zeroAngle, norm)
+            return t.ocs2wcsAngle(angle)
         p0 = self.trans((0.0, 0.0, 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
         p1 = self.trans((2.0, 1.0, 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
         p2 = self.trans((2.0, 2.0, 0.0), AutoCAD.acOCS, AutoCAD.acWorld, norm)
@@ -484,11 +735,38 @@ class VAcadServices:
 #class VAcadServices:
 
 
-try:
-    # c:\Python25\Lib\site-packages\comtypes\gen\_D32C213D_6096_40EF_A216_89A3A6FB82F7_0_1_0.py
-    import comtypes.gen.AutoCAD as AutoCAD
-except:
-    getModule('acax18ENU.tlb') # comtypes.gen.AutoCAD
-    import comtypes.gen.AutoCAD as AutoCAD
-
+class VacTypeLib(object):
+    ''' comtypes.gen.AutoCAD stand-in.
+    Constants (acOCS, acText, ...) taken from precomputed acadconst module;
+    interfaces (IAcadText, ...) loaded from type library on first use.
+    '''
+    def __init__(self):
+        super(VacTypeLib, self).__init__()
+        self.__dict__.update(acadconst.constants())
+        self.module = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        v = getattr(self.load(), name)
+        setattr(self, name, v)
+        return v
+
+    def load(self):
+        if self.module is None:
+            try:
+                # c:\Python25\Lib\site-packages\comtypes\gen\_D32C213D_6096_40EF_A216_89A3A6FB82F7_0_1_0.py
+                import comtypes.gen.AutoCAD as tlb
+            except:
+                getModule(acadconst.TLB_NAME) # comtypes.gen.AutoCAD
+                import comtypes.gen.AutoCAD as tlb
+            diff = acadconst.checkConstants(tlb)
+            if diff:
+                raise NameError('acadconst differs from type library, regenerate it: %s' % diff)
+            self.module = tlb
+        return self.module
+#class VacTypeLib(object):
+
+
+AutoCAD = VacTypeLib()
 VAcad = VAcadServices()
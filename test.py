@@ -17,6 +17,9 @@ import time, traceback
 cp = 'utf-8'
 ecErr = 1
 ecOK = 0
+# arcs and bulges recovered with facets sagitta tolerance (trig.arcFacets); 0: 30 facets per circle
+TOLERANCE = 0.0
+HERE = os.path.dirname(os.path.abspath(__file__))
 
 
 def test (s, norm):
@@ -466,7 +469,7 @@ def testArc():
         c, s, e, m = pts
         s,e = detectArcStartEnd(c, s, e, m)
         bulge = getArcBulge(c, s, e)
-        res = unzipBulge2(s, e, bulge, 0)
+        res = unzipBulge2(s, e, bulge, 0, TOLERANCE)
         print
         print '(setq h (handent "%s") o (redraw h 3) o (command "zoom" "o" h ""))' % h
         test(pline( res['points'] ), paragon)
@@ -591,7 +594,7 @@ def testPolylineLight():
                 p = points[n+1]
                 bulge2,x2,y2 = parsePoint(p)
                 e = tm.wcs2ucsP((x2,y2))
-                res = unzipBulge2(s, e, bulge, 0)
+                res = unzipBulge2(s, e, bulge, 0, TOLERANCE)
                 pts = pts + res['points'][:-1]
             else:
                 pts.append(s)
@@ -1337,6 +1340,624 @@ def testBulge():
 #def testBulge():
 
 
+def testDump():
+    ''' Dump simulated drawing (acadsim) twice: with local OCS transformations
+    and with Utility.TranslateCoordinates. Results must be the same.
+    '''
+    import tempfile, shutil
+    import acadsim, snippets
+    print
+    print 'testDump...'
+    sim = acadsim.install(acadsim.VsimServer())
+    sim.addDrawing(acadsim.makeDrawing('SIM.dwg', count=300, seed=2, bigone=500))
+    dumper = snippets.loadDumper()
+    wd = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(wd)
+    try:
+        res = []
+        for local in (True, False):
+            dumper.VAcad.localTrans = local
+            dumper.comtypesDump()
+            f = open('SIM.dwg.csv', 'rb')
+            res.append(f.read())
+            f.close()
+        test(res[0] == res[1], True)
+        test(res[0].count('\n;'), 0)
+        testNpz(dumper)
+        testGpkg(dumper, sim)
+        testFilter(dumper, sim)
+        testProjection(dumper, sim)
+        testEnum(dumper, sim)
+        testStats(dumper)
+        testTolerance(dumper)
+        testProfile(dumper, sim)
+        testCheckpoint(dumper, sim)
+        testManifest(dumper, sim)
+        testSession(dumper, sim)
+        testBatch()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(wd)
+    print
+    return ecOK
+#def testDump():
+
+
+def testNpz(dumper):
+    ''' npz sink vertices must be the same as CSV coords
+    '''
+    import csv, re
+    try:
+        import numpy
+    except ImportError:
+        print 'testNpz skipped, no numpy'
+        return
+    opts = dumper.parseArgs(['--sink', 'csv', '--sink', 'npz'])[0]
+    dumper.comtypesDump(opts)
+    d = numpy.load('SIM.dwg.npz')
+    off,xy = (d['vertex_offset'], d['xy'])
+    f = open('SIM.dwg.csv', 'rb')
+    rows = list(csv.reader(f, delimiter=';', quotechar="'"))[2:]
+    f.close()
+    test(len(rows), len(off) - 1)
+    for i,row in enumerate(rows):
+        nums = [float(x) for x in re.sub(r'\(bulge [^)]*\)', '', row[7]).split(',') if x.strip()]
+        pts = xy[off[i]:off[i+1]].ravel().tolist()
+        test(len(nums), len(pts))
+        test(max([abs(a - b) for a,b in zip(nums, pts)] + [0.0]) < 1e-9, True)
+        test(d['layer_dict'][d['layer'][i]].encode('utf-8'), row[3])
+        test(d['text_dict'][d['text'][i]].encode('utf-8'), row[9])
+    d.close()
+#def testNpz(dumper):
+
+
+def testGpkg(dumper, sim):
+    ''' GeoPackage sink: all entities in feature table and R-tree, closed polylines as polygons;
+    with projection (--columns) geometry, length and area the same
+    '''
+    import sqlite3, struct
+    opts = dumper.parseArgs(['--sink', 'gpkg'])[0]
+    dumper.comtypesDump(opts)
+    db = sqlite3.connect('SIM.dwg.gpkg')
+    test(db.execute('PRAGMA application_id').fetchone()[0], 0x47504B47)
+    count = db.execute('SELECT count(*) FROM entities').fetchone()[0]
+    test(count, dumper.VAcad.ms.Count)
+    test(db.execute('SELECT count(*) FROM rtree_entities_geom').fetchone()[0], count)
+    polygons = 0
+    for closed,geom in db.execute("SELECT closed, geom FROM entities WHERE typename = 'AcDbPolyline'"):
+        if struct.unpack_from('<I', str(geom), 41)[0] == 3:
+            test(closed, u'True')
+            polygons += 1
+    test(polygons > 0, True)
+    minx,maxx,miny,maxy = db.execute('SELECT min_x - 1, max_x + 1, min_y - 1, max_y + 1 FROM gpkg_contents').fetchone()
+    test(db.execute('SELECT count(*) FROM rtree_entities_geom WHERE minx >= ? AND maxx <= ? AND miny >= ? AND maxy <= ?',
+        (minx, maxx, miny, maxy)).fetchone()[0], count)
+    for radius,area in db.execute("SELECT radius, area FROM entities WHERE typename = 'AcDbCircle'"):
+        test(abs(area - math.pi * float(radius) ** 2) < 1e-9 * area, True)
+    rows = db.execute('SELECT length, area FROM entities ORDER BY fid').fetchall()
+    db.close()
+    try:
+        import numpy
+    except ImportError:
+        return
+    # length and area columns the same as measures for npz output (testNpz)
+    import measures
+    d = numpy.load('SIM.dwg.npz')
+    res = measures.npzMeasures(d)
+    d.close()
+    test(len(rows), len(res['length']))
+    for (length,area),l,a in zip(rows, res['length'].tolist(), res['area'].tolist()):
+        test(abs((length or 0.0) - l) <= 1e-9 * max(1.0, l), True)
+        test(abs((area or 0.0) - abs(a)) <= 1e-9 * max(1.0, abs(a)), True)
+
+    import random
+    import acadsim, acadconst
+    dwg = acadsim.makeDrawing('GEOM.dwg', count=100, seed=3)
+    rnd = random.Random(3)
+    dwg['entities'].extend([acadsim.makeEntity(rnd, acadconst.acCircle, 100 + i, (2, 40)) for i in range(10)])
+    sim.addDrawing(dwg)
+    dumper.VAcad.openDWG('GEOM.dwg')
+    try:
+        res = []
+        for args in ([], ['--columns', 'layer,handle']):
+            dumper.comtypesDump(dumper.parseArgs(['--sink', 'gpkg', '--tolerance', '0.01'] + args)[0])
+            db = sqlite3.connect('GEOM.dwg.gpkg')
+            res.append([(str(g), l, a) for g,l,a in db.execute('SELECT geom, length, area FROM entities ORDER BY fid')])
+            db.close()
+        test(res[0] == res[1], True)
+        test(len([r for r in res[1] if r[2]]) >= 10, True)
+    finally:
+        dumper.VAcad.openDWG('SIM.dwg')
+#def testGpkg(dumper, sim):
+
+
+def testFilter(dumper, sim):
+    ''' Filtered dump: rows for matched entities only, rejected entities cost less COM calls
+    '''
+    import csv
+    sim.resetCalls()
+    dumper.comtypesDump(dumper.parseArgs(['--checkpoint', '0'])[0])
+    full = sim.totalCalls()
+    f = open('SIM.dwg.csv', 'rb')
+    rows = list(csv.reader(f, delimiter=';', quotechar="'"))[2:]
+    f.close()
+    hidden = [u'КС_ФОНАРИ'.encode('utf-8'), u'ВОДА_ВОДОХРАНИЛИЩА'.encode('utf-8')]
+    paragon = [r for r in rows if r[1] == 'AcDbText' and not r[3] in hidden and '99:5604' in r[6]]
+
+    sim.resetCalls()
+    dumper.comtypesDump(dumper.parseArgs(['--checkpoint', '0', '--layer', u'зд_*'.encode('utf-8')])[0])
+    test(sim.totalCalls() < full / 2, True)
+    dumper.comtypesDump(dumper.parseArgs(['--visible', '--type', 'AcDbText', '--code', '5604*'])[0])
+    f = open('SIM.dwg.csv', 'rb')
+    sample = list(csv.reader(f, delimiter=';', quotechar="'"))[2:]
+    f.close()
+    test(len(sample) > 0, True)
+    test(sample, paragon)
+#def testFilter(dumper, sim):
+
+
+def testProjection(dumper, sim):
+    ''' Projected dump: listed columns the same as in full dump, other columns empty, less COM calls;
+    property reads skipped (stats) equal to the drop in simulated property reads, w/o polylines (GetBulge)
+    '''
+    import csv
+    def rows():
+        f = open('SIM.dwg.csv', 'rb')
+        res = list(csv.reader(f, delimiter=';', quotechar="'"))
+        f.close()
+        return res[2:]
+    sim.resetCalls()
+    dumper.comtypesDump(dumper.parseArgs([])[0])
+    full,fullCalls = (rows(), sim.totalCalls())
+    for cols,keep in (('typename,handle,text', (0, 1, 2, 5, 9)), ('coords', (0, 1, 2, 7))):
+        sim.resetCalls()
+        dumper.comtypesDump(dumper.parseArgs(['--columns', cols])[0])
+        test(sim.totalCalls() < fullCalls, True)
+        for a,b in zip(rows(), full):
+            for i in range(len(b)):
+                if i in keep: test(a[i], b[i])
+                elif i < 7: test(a[i], '')
+                elif a[i]: test(a[i], b[i]) # property read for listed column
+    props = set([p for k,p in dumper.ITEM_PROPS])
+    for name in ('AcDbText', 'AcDbBlockReference'):
+        props.update(dumper.VacItem().makeEntity(dumper.ENTITY_TYPES[name], '').props())
+        calls = []
+        for args in ([], ['--columns', 'layer,text']):
+            sim.resetCalls()
+            dumper.comtypesDump(dumper.parseArgs(['--type', name] + args)[0])
+            calls.append(sum([n for k,n in sim.calls.items() if k in props]))
+        st = dumper.loadStats('SIM.dwg.stats.json')
+        test((st.skipped.keys(), st.skipped.get(name, 0) > 0), ([name], True))
+        test(st.skipped[name], calls[0] - calls[1])
+    test(dumper.VdumpStats().merge(st).merge(st).skipped, {name: 2 * st.skipped[name]})
+#def testProjection(dumper, sim):
+
+
+def testEnum(dumper, sim):
+    ''' Entities enumerated by batches and from SelectionSet: the same CSV as Item(i), less COM calls
+    '''
+    res = []
+    for args in (['--enum', 'index'], ['--enum', 'batch', '--batch', '64'], ['--enum', 'select', '--batch', '7']):
+        sim.resetCalls()
+        dumper.comtypesDump(dumper.parseArgs(args)[0])
+        f = open('SIM.dwg.csv', 'rb')
+        res.append((f.read(), sim.calls.get('Item', 0), sim.calls.get('Next', 0)))
+        f.close()
+    test(res[1][0] == res[0][0], True)
+    test(res[2][0] == res[0][0], True)
+    count = dumper.VAcad.ms.Count
+    test((res[1][1], res[1][2]), (0, count / 64 + 2)) # batches and empty one at end
+    test(res[0][1], count)
+    test(len(dumper.VAcad.doc.SelectionSets.sets), 0)
+#def testEnum(dumper, sim):
+
+
+def testStats(dumper):
+    ''' JSON summary: counters match dumped rows, merged stats of two runs doubled
+    '''
+    import csv
+    dumper.comtypesDump(dumper.parseArgs(['--type', 'AcDbText', '--type', 'AcDbPolyline'])[0])
+    f = open('SIM.dwg.csv', 'rb')
+    rows = list(csv.reader(f, delimiter=';', quotechar="'"))[2:]
+    f.close()
+    st = dumper.loadStats('SIM.dwg.stats.json')
+    test(st.entities(), len(rows))
+    test(st.objects, dumper.VAcad.ms.Count)
+    test(st.dupIDs, 0)
+    test(len(st.ids), 0)
+    test(sorted(st.types.keys()), [u'AcDbPolyline', u'AcDbText'])
+    test(st.types[u'AcDbText'], len([r for r in rows if r[1] == 'AcDbText']))
+    test(sum(st.layers.values()), len(rows))
+    test(st.filter['accepted'] + st.filter['type'], st.objects)
+    total = dumper.VdumpStats().merge(st).merge(dumper.loadStats('SIM.dwg.stats.json'))
+    test((len(total.files), total.objects, total.entities()), (2, 2 * st.objects, 2 * len(rows)))
+    test(total.filter['type'], 2 * st.filter['type'])
+    test(dumper.VdumpStats().load(total.toDict()).toDict(), total.toDict())
+    ids = dumper.VdumpStats()
+    test([ids.addID(x) for x in (7, 8, 7)], [True, True, False])
+    test((ids.dupIDs, sorted(dumper.VdumpStats().load(ids.toDict(True)).ids)), (1, [7, 8]))
+#def testStats(dumper):
+
+
+def testProfile(dumper, sim):
+    ''' --profile: acadprof counts every COM call made by comtypesDump, per entity type;
+    VAcad objects unwrapped after dump, crashed dump too
+    '''
+    import acadsim, acadprof
+    profs = []
+    orig = acadprof.VcomProfiler
+    class Vprof(orig):
+        def __init__(self):
+            orig.__init__(self)
+            profs.append(self)
+    acadprof.VcomProfiler = Vprof
+    try:
+        for args in ([], ['--enum', 'batch'], ['--columns', 'layer,handle']):
+            before = dict(sim.calls)
+            dumper.comtypesDump(dumper.parseArgs(['--profile'] + args)[0])
+            prof = profs[-1]
+            calls = dict([(k, v - before.get(k, 0)) for k,v in sim.calls.items() if v > before.get(k, 0)])
+            counted = {}
+            for st in prof.stats.values():
+                for k,(c,s) in st.items():
+                    counted[k] = counted.get(k, 0) + c
+            # doc.Utility.Prompt after profiler uninstalled
+            calls['Utility'] -= 1
+            calls['Prompt'] -= 1
+            test(counted, dict([(k, v) for k,v in calls.items() if v]))
+            st = dumper.loadStats('SIM.dwg.stats.json')
+            test(dict([(k, v[0]) for k,v in prof.entities.items()]), st.types)
+            test(isinstance(dumper.VAcad.ms, acadprof.VcomProxy), False)
+        def crash(name):
+            if name == 'Handle': raise acadsim.COMError('simulated crash')
+            acadsim.VsimServer.tick(sim, name)
+        sim.tick = crash
+        try:
+            dumper.comtypesDump(dumper.parseArgs(['--profile'])[0])
+            test('crash', 'no crash')
+        except acadsim.COMError:
+            pass
+        del sim.tick
+        test([isinstance(x, acadprof.VcomProxy) for x in (dumper.VAcad.doc, dumper.VAcad.ms, dumper.VAcad.u)],
+            [False] * 3)
+    finally:
+        acadprof.VcomProfiler = orig
+#def testProfile(dumper, sim):
+
+
+def testCheckpoint(dumper, sim):
+    ''' Dump crashed (AutoCAD died) at entity 177 resumed from checkpoint 150: the same CSV and stats
+    as dump w/o crash; index, batch and filtered SelectionSet enumeration
+    '''
+    import json
+    import acadsim
+    def crash(name):
+        if name == 'ObjectName':
+            reads[0] += 1
+            if reads[0] == 177: raise acadsim.COMError('simulated crash')
+        acadsim.VsimServer.tick(sim, name)
+    for args in (['--enum', 'index'], ['--enum', 'batch', '--batch', '40'],
+            ['--enum', 'select', '--batch', '7', '--layer', u'зд_*'.encode('utf-8')]):
+        res = []
+        dumper.comtypesDump(dumper.parseArgs(args)[0])
+        test(os.path.exists('SIM.dwg.csv.ckpt'), False)
+        for name in ('SIM.dwg.csv', 'SIM.dwg.stats.json'):
+            f = open(name, 'rb')
+            res.append(f.read())
+            f.close()
+        reads = [0]
+        sim.tick = crash
+        try:
+            dumper.comtypesDump(dumper.parseArgs(args + ['--checkpoint', '50'])[0])
+            test('crash', 'no crash')
+        except acadsim.COMError:
+            pass
+        del sim.tick
+        f = open('SIM.dwg.csv.ckpt', 'rb')
+        test(json.load(f)['index'], 150)
+        f.close()
+        dumper.comtypesDump(dumper.parseArgs(args + ['--checkpoint', '50', '--resume'])[0])
+        test(os.path.exists('SIM.dwg.csv.ckpt'), False)
+        for name,data in zip(('SIM.dwg.csv', 'SIM.dwg.stats.json'), res):
+            f = open(name, 'rb')
+            test(f.read() == data, True)
+            f.close()
+#def testCheckpoint(dumper, sim):
+
+
+def testManifest(dumper, sim):
+    ''' Vmanifest: check, update, changed; single DWG dump w/o manifest by default;
+    watch extracts new and changed DWG once, after copying finished (size, mtime stable for two polls)
+    '''
+    import manifest, acadsim
+    def write(fname, data):
+        f = open(fname, 'wb')
+        f.write(data)
+        f.close()
+    write('M.dwg', 'dwg data')
+    write('M.dwg.csv', 'csv data')
+    mf = manifest.Vmanifest('m.json', 'v1')
+    test((mf.check('M.dwg'), mf.changed('M.dwg')), (False, True))
+    mf.update('M.dwg', 'M.dwg.csv', mf.fileInfo('M.dwg'))
+    mf.save()
+    mf = manifest.Vmanifest('m.json', 'v1')
+    test((mf.check('M.dwg'), mf.changed('M.dwg')), (True, False))
+    st = os.stat('M.dwg')
+    os.utime('M.dwg', (st.st_atime, st.st_mtime + 10)) # touched: mtime changed, content the same
+    test((mf.changed('M.dwg'), mf.check('M.dwg'), mf.changed('M.dwg')), (True, True, False))
+    write('M.dwg', 'DWG DATA') # same size, other content
+    os.utime('M.dwg', (st.st_atime, st.st_mtime + 20))
+    test(mf.check('M.dwg'), False)
+    mf.update('M.dwg', 'M.dwg.csv')
+    test((mf.check('M.dwg'), manifest.Vmanifest('m.json', 'v2').check('M.dwg')), (True, False))
+    write('M.dwg.csv', 'csv data, other size')
+    test(mf.check('M.dwg'), False)
+    test(manifest.Vmanifest('m.json', 'v1').files.keys(), [mf.key('M.dwg')])
+
+    # single DWG: no manifest w/o --manifest FILE, extracted each time
+    for name in ('W1.dwg', 'W2.dwg'):
+        sim.addDrawing(acadsim.makeDrawing(name, count=20, seed=len(name)))
+        write(name, name)
+    opts = dumper.parseArgs([])[0]
+    test(opts.manifest, None)
+    dumped = []
+    dumpFile = dumper.dumpFile
+    def dump(fname, opts=None, logs=False):
+        dumped.append(fname)
+        return dumpFile(fname, opts, logs)
+    dumper.dumpFile = dump
+    try:
+        dumper.dumpFile('W1.dwg', opts)
+        dumper.dumpFile('W1.dwg', opts)
+        test(os.path.exists(dumper.MANIFEST), False)
+        test(len(dumped), 2)
+
+        # watch: W1 changed after first extraction, W2 not
+        class Vclock:
+            polls = 0
+            def __getattr__(self, name):
+                return getattr(time, name)
+            def sleep(self, secs):
+                self.polls += 1
+                if self.polls == 2: write('W1.dwg', 'W1.dwg changed')
+                if self.polls == 6: raise KeyboardInterrupt()
+        del dumped[:]
+        dumper.time = Vclock()
+        opts = dumper.parseArgs(['--watch', '1', '--manifest', 'w.json', '--type', 'AcDbLine'])[0]
+        test(dumper.watch(['W1.dwg', 'W2.dwg'], opts), ecOK)
+    finally:
+        dumper.time = time
+        dumper.dumpFile = dumpFile
+    test(dumped, ['W1.dwg', 'W2.dwg', 'W1.dwg'])
+    test(dumper.getManifest('w.json', opts).check('W1.dwg'), True)
+#def testManifest(dumper, sim):
+
+
+def testSession(dumper, sim):
+    ''' VAcadServices: connect on first use, openDWG(closeAll=False) closes only previous document,
+    closeDWG; session over two drawings: one connection, only documents it opened closed
+    '''
+    import acadsim, snippets
+    docs = sim.application.docs
+    for name in ('S1.dwg', 'S2.dwg'):
+        sim.addDrawing(acadsim.makeDrawing(name, count=30, seed=len(name) + int(name[1])))
+        f = open(name, 'wb')
+        f.write(name)
+        f.close()
+    v = snippets.VAcadServices()
+    test('acad' in v.__dict__, False)
+    n = sim.calls.get('ActiveDocument', 0)
+    v.ms
+    test(('acad' in v.__dict__, sim.calls.get('ActiveDocument', 0) - n), (True, 1))
+    v.openDWG('S1.dwg')
+    test([d.Name for d in docs.docs], [u'S1.dwg'])
+    v.openDWG('S2.dwg', closeAll=False)
+    test(([d.Name for d in docs.docs], v.doc.Name), ([u'S2.dwg'], u'S2.dwg'))
+    v.closeDWG()
+    v.closeDWG()
+    test((docs.count(), 'opened' in v.__dict__), (0, False))
+    v.openDWG('S1.dwg')
+    v.openDWG('S2.dwg', closeAll=False)
+    v.__dict__.pop('opened')
+    test([d.Name for d in docs.docs], [u'S2.dwg'])
+
+    before = dict(sim.calls)
+    opts = dumper.parseArgs(['--session', '--logs', '--summary', 'session.json', '--manifest', 's.json'])[0]
+    test(dumper.session(['* comment\n', 'S1.dwg\n', '\n', 'S2.dwg\n'], opts, opts.logs), ecOK)
+    calls = dict([(k, sim.calls.get(k, 0) - before.get(k, 0)) for k in ('ActiveDocument', 'Documents', 'Open')])
+    test(calls, {'ActiveDocument': 0, 'Documents': 0, 'Open': 2})
+    test([d.Name for d in docs.docs], [u'S2.dwg'])
+    test([os.path.exists(x) for x in ('S1.dwg.csv', 'S2.dwg.csv', 'S1.dwg.log', 'S2.dwg.err')], [True] * 4)
+    st = dumper.loadStats('session.json')
+    test((sorted(st.files), st.objects), ([u'S1.dwg', u'S2.dwg'], 60))
+#def testSession(dumper, sim):
+
+
+def testBatch():
+    ''' dwg.batch.py --sim -j 2: outputs and logs for each DWG, unchanged DWG skipped on second run
+    '''
+    import subprocess
+    batch = os.path.join(HERE, 'dwg.batch.py')
+    def run():
+        p = subprocess.Popen([sys.executable, batch, '-j', '2', '--sim', 'batch.list'],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        return (p.communicate()[0], p.returncode)
+    names = ['B1.dwg', 'B2.dwg', 'B3.dwg']
+    for name in names:
+        f = open(name, 'wb')
+        f.write(name)
+        f.close()
+    f = open('batch.list', 'wb')
+    f.write('\n'.join(names))
+    f.close()
+    out,code = run()
+    test((code, 'files to extract [3]' in out), (ecOK, True))
+    pids = set()
+    for name in names:
+        test([os.path.exists(name + x) for x in ('.csv', '.log', '.err', '.stats.json')], [True] * 4)
+        f = open(name + '.log', 'rb')
+        log = f.read()
+        f.close()
+        test('done [0]' in log, True)
+        pids.add(log.split('pid [')[1].split(']')[0])
+    test(len(pids) in (1, 2), True)
+    out,code = run()
+    test((code, 'files to extract [0]' in out), (ecOK, True))
+    f = open('B2.dwg', 'ab')
+    f.write(' changed')
+    f.close()
+    out,code = run()
+    test((code, 'files to extract [1]' in out, 'file [B2.dwg], res [0]' in out), (ecOK, True, True))
+#def testBatch():
+
+
+def testTolerance(dumper):
+    ''' GeoPackage with arcs tolerance: circles as polygons, facets deviate from arc <= tolerance;
+    arc templates stats per dump, not cumulative
+    '''
+    import sqlite3, struct
+    import gpkg, snippets, acadconst, trig
+    dumper.comtypesDump(dumper.parseArgs(['--sink', 'gpkg', '--tolerance', '0.05',
+        '--layer-tolerance', u'в_*=0.001'.encode('utf-8')])[0])
+    db = sqlite3.connect('SIM.dwg.gpkg')
+    circles = db.execute("SELECT count(*) FROM entities WHERE typename = 'AcDbCircle'").fetchone()[0]
+    polygons = 0
+    for (geom,) in db.execute("SELECT geom FROM entities WHERE typename = 'AcDbCircle'"):
+        if struct.unpack_from('<I', str(geom), 41)[0] == 3: polygons += 1
+    db.close()
+    test(polygons, circles)
+    for r,tol in ((0.6, 0.05), (0.6, 0.001), (150.0, 0.05)):
+        ent = snippets.VacCircle()
+        ent.pts,ent.radius = (((10.0, 20.0, 0.0),), r)
+        wkbType,pts = gpkg.entityGeometry(acadconst.acCircle, ent, tol)
+        test((wkbType, pts[0] == pts[-1]), (gpkg.WKB_POLYGON, True))
+        dev = max([r - math.hypot((a[0] + b[0]) / 2.0 - 10.0, (a[1] + b[1]) / 2.0 - 20.0) for a,b in zip(pts, pts[1:])])
+        test(dev <= tol * (1 + 1e-9), True)
+    test(len(gpkg.entityGeometry(acadconst.acCircle, ent, 0.0)[1]), 1)
+    cache = trig.arcTemplates
+    cache.dict.clear()
+    cache.keys[:] = []
+    res = []
+    for x in range(2):
+        dumper.comtypesDump(dumper.parseArgs(['--sink', 'gpkg', '--tolerance', '0.05'])[0])
+        st = dumper.loadStats('SIM.dwg.stats.json')
+        res.append((st.arcHits, st.arcMisses))
+    test((res[0][1] > 0, res[1][1], res[1][0]), (True, 0, sum(res[0])))
+    test((cache.hits >= sum(res[0]) + res[1][0], len(cache.dict)), (True, res[0][1]))
+#def testTolerance(dumper):
+
+
+def testRecord():
+    ''' Record fields go to CSV columns as is, '//' in values don't split columns
+    '''
+    import snippets
+    print
+    print 'testRecord...'
+    dumper = snippets.loadDumper()
+    item = dumper.VacItem()
+    item.name,item.etype,item.lyr,item.id,item.handle = (u'AcDbText', 32, u'ТЕКСТ', 2100000016, u'1002')
+    item.attr = {u'99': u'T1000000', u'00': u'"http://linserv"'}
+    item.ent = snippets.VacEntity()
+    item.ent.coords,item.ent.angle,item.ent.name,item.ent.closed,item.ent.radius = (
+        u'1.0, 2.0', 0.5, u'a//b', u'ROMANS', u'0, 0, 0, 3.0, 1.0, False')
+    vals = item.listValues('utf-8')
+    test(len(vals), len(item.listHeads('utf-8')))
+    test(vals[5], u'00:"http://linserv";99:T1000000'.encode('utf-8'))
+    test(vals[8], 'a//b')
+    test(hasattr(item, '__dict__') or hasattr(item.ent, '__dict__'), False)
+
+    # XData parsed once, shared read only attributes, oldest entry dropped
+    cache = dumper.VxdataCache(maxsize=2)
+    xd = u'/99:T1000000/00:"Опорные точки"/'
+    attr = cache.get(xd)
+    test(cache.get(u'%s' % xd[:]) is attr, True)
+    test(attr.text, u'00:"Опорные точки";99:T1000000')
+    test(cache.get(u'/00:"Опорные точки"/').keys()[0] is attr.keys()[attr.keys().index(u'00')], True)
+    try:
+        attr[u'99'] = u''
+        test('read only', 'writable')
+    except NameError:
+        pass
+    cache.get(u'')
+    test(cache.get(xd) is attr, False)
+    test((cache.hits, cache.misses, len(cache.dict)), (1, 4, 2))
+    print
+    return ecOK
+#def testRecord():
+
+
+def testMeasures():
+    ''' Exact length, area, centroid of bulged polylines and arcs: known shapes,
+    fine tessellation (trig.bulgePoints), numpy batch the same as scalar
+    '''
+    import random
+    import measures, trig
+    print
+    print 'testMeasures...'
+    def near(a, b, eps=1e-9):
+        return abs(a - b) <= eps * max(1.0, abs(b))
+
+    # circle of two semicircles, far from origin; clockwise: negative area
+    for cx,cy,r,b in ((3.0, -2.0, 1.0, 1.0), (1.0e6, 2.0e6, 5.0, -1.0)):
+        l,a,c = measures.polylineMeasures([(cx + r, cy), (cx - r, cy)], [b, b], True)
+        test((near(l, 2 * math.pi * r), near(a, b * math.pi * r * r), near(c[0], cx), near(c[1], cy)), (True,) * 4)
+        test(measures.polylineMeasures([(cx + r, cy), (cx - r, cy)], [b, b], False)[1:], (0.0, None))
+    test(measures.circleMeasures((1.0, 2.0), 2.0), (4 * math.pi, 4 * math.pi, (1.0, 2.0)))
+    # half disk: centroid 4r/(3pi) from diameter
+    l,a,c = measures.polylineMeasures([(0.0, 0.0), (2.0, 0.0)], [-1.0, 0.0], True)
+    test((near(l, math.pi + 2.0), near(a, -math.pi / 2.0), near(c[1], 4.0 / (3.0 * math.pi)), near(c[0], 1.0)), (True,) * 4)
+
+    # random polylines against fine tessellation, small bulges by series
+    rnd = random.Random(11)
+    polys = []
+    for k in range(50):
+        n = rnd.randint(3, 7)
+        pts = [(10 * math.cos(2 * math.pi * i / n) + rnd.uniform(-1, 1), 10 * math.sin(2 * math.pi * i / n) + rnd.uniform(-1, 1))
+            for i in range(n)]
+        polys.append((pts, [rnd.choice((0.0, rnd.uniform(-0.6, 0.6), 1e-4, -1e-7)) for i in range(n)], rnd.random() < 0.7))
+    for pts,bulges,closed in polys[:10]:
+        ring = [pts[0]]
+        n = len(pts)
+        for i in range(n - 1 + int(closed)):
+            ring.extend(trig.bulgePoints(pts[i], pts[(i + 1) % n], bulges[i], tolerance=1e-7, templates=None))
+        l = sum([math.hypot(q[0] - p[0], q[1] - p[1]) for p,q in zip(ring, ring[1:])])
+        a = sum([(p[0] * q[1] - q[0] * p[1]) / 2.0 for p,q in zip(ring, ring[1:])])
+        res = measures.polylineMeasures(pts, bulges, closed)
+        test(near(res[0], l, 1e-7), True)
+        if closed:
+            test(near(res[1], a, 1e-6), True)
+    # arc: length, segment closed by chord the same as two vertices polyline
+    for k in range(50):
+        c,r,sa,sw = ((rnd.uniform(-100, 100), rnd.uniform(-100, 100)), rnd.uniform(0.1, 20.0), rnd.uniform(0.0, 6.28),
+            rnd.uniform(0.001, 6.28) * rnd.choice((1, -1)))
+        s,e,m = [trig.AutoLISP.polarP(c, a, r) for a in (sa, sa + sw, sa + sw / 2.0)]
+        l,a,g = measures.arcMeasures(c, s, e, m)
+        l2,a2,g2 = measures.polylineMeasures([s, e], [math.tan(sw / 4.0), 0.0], True)
+        test((near(l, r * abs(sw)), near(a, a2, 1e-8), near(g[0], g2[0], 1e-8), near(g[1], g2[1], 1e-8)), (True,) * 4)
+
+    if measures.numpy is None:
+        print 'testMeasures arrays skipped, no numpy'
+        return
+    polys.append(([], [], True))
+    polys.append(([(5.0, 5.0)], [0.5], True))
+    xy = [p for pts,b,c in polys for p in pts]
+    offsets = [0]
+    for pts,b,c in polys:
+        offsets.append(offsets[-1] + len(pts))
+    res = measures.polylinesMeasures(xy, [x for p,b,c in polys for x in b], offsets, [c for p,b,c in polys])
+    for (pts,bulges,closed),l,a,c in zip(polys, res['length'].tolist(), res['area'].tolist(), res['centroid'].tolist()):
+        l2,a2,c2 = measures.polylineMeasures(pts, bulges, closed)
+        test((near(l, l2), near(a, a2)), (True, True))
+        if c2 is None:
+            test((c[0] == c[0], c[1] == c[1]), (False, False)) # nan
+        else:
+            test((near(c[0], c2[0]), near(c[1], c2[1])), (True, True))
+    print
+    return ecOK
+#def testMeasures():
+
+
 def testEntity():
     '''Test layer must be thaw!
     '''
@@ -1355,6 +1976,9 @@ if __name__ == '__main__':
     print 'begin test [%s], argc: [%s], argv: [%s]' % (time.strftime('%Y-%m-%d %H:%M:%S'), argc, sys.argv)
     try:
         testBulge()
+        testDump()
+        testRecord()
+        testMeasures()
         res = testEntity()
         print 'done [%s]' % res
     except Exception, e:
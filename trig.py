@@ -14,6 +14,11 @@ Coordinates and entities transformation tools.
 import os, sys, math
 import time, traceback
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 cp = 'utf-8'
 ecErr = 1
 ecOK = 0
@@ -57,9 +62,29 @@ class AutoLISP:
     @staticmethod
     def polarP(pnt, phi, dist):
         return AutoLISP.polar(pnt[0], pnt[1], phi, dist)
+
+    @staticmethod
+    def angles(x1, y1, x2, y2):
+        ''' angle for arrays of points, numpy array in range [0:2Pi]
+        '''
+        needNumpy('AutoLISP.angles')
+        res = numpy.arctan2(numpy.subtract(y2, y1), numpy.subtract(x2, x1))
+        return numpy.where(res < 0, (2 * math.pi) + res, res)
+
+    @staticmethod
+    def polars(x1, y1, phi, dist):
+        ''' polar for arrays, numpy arrays (x, y)
+        '''
+        needNumpy('AutoLISP.polars')
+        return (x1 + dist * numpy.cos(phi), y1 + dist * numpy.sin(phi))
 #class AutoLISP:
 
 
+def needNumpy(name):
+    if numpy is None:
+        raise NameError('numpy module needed for [%s]' % name)
+
+
 def pyAngle(x1, y1, x2, y2):
     ''' Returns the angle between line [p1,p2] and X axis.
     Range [-Pi - Pi]
@@ -82,9 +107,35 @@ def normAngle2pi(angle):
     '''
     if angle >= 0.0 and angle <= math.pi*2:
         return angle
-    if angle < 0.0:
-        return normAngle2pi(angle + math.pi*2)
-    return normAngle2pi(angle - math.pi*2)
+    res = math.fmod(angle, math.pi*2)
+    if res < 0.0:
+        res += math.pi*2
+    return res
+
+def normAngles2pi(angles):
+    ''' normAngle2pi for array of angles, numpy array
+    '''
+    needNumpy('normAngles2pi')
+    a = numpy.asarray(angles, dtype=numpy.float64)
+    res = numpy.fmod(a, math.pi*2)
+    res = numpy.where(res < 0.0, res + math.pi*2, res)
+    return numpy.where((a >= 0.0) & (a <= math.pi*2), a, res)
+
+def orientation(p0, p1, p2):
+    ''' 1.0 if p0, p1, p2 go counterclockwise or lie on a line, -1.0 if clockwise;
+    sign of cross product (p1 - p0) x (p2 - p0), no angles and no 0/2*pi wrap around
+    '''
+    if (p1[0] - p0[0]) * (p2[1] - p0[1]) - (p1[1] - p0[1]) * (p2[0] - p0[0]) < 0.0:
+        return -1.0
+    return 1.0
+
+def orientations(p0, p1, p2):
+    ''' orientation for arrays of points [n, 2] (or [n, 3], z ignored), numpy array of 1.0, -1.0
+    '''
+    needNumpy('orientations')
+    p0,p1,p2 = [numpy.asarray(p, dtype=numpy.float64).reshape(-1, numpy.shape(p)[-1]) for p in (p0, p1, p2)]
+    cross = (p1[:, 0] - p0[:, 0]) * (p2[:, 1] - p0[:, 1]) - (p1[:, 1] - p0[:, 1]) * (p2[:, 0] - p0[:, 0])
+    return numpy.where(cross < 0.0, -1.0, 1.0)
 
 def rotationAngle(cx, cy, centerP, origAngle):
     ''' Get mirroring mark and rotation angle (in current CS) for block or text,
@@ -100,28 +151,26 @@ def rotationAngle(cx, cy, centerP, origAngle):
 
     @rtype: tuple
     @returns: (zDir, rotAngle) Z-axis direction and block rotation angle in current CS.
+
+    Z-axis direction is orientation of (centerP, cx, cy): Y vector clockwise from X vector means mirroring.
     '''
-    zDir = 1.0
-    ucsA = origAngle
-#	print 'rotationAngle: cp [%s], cx [%s], cy [%s]' % (centerP, cx, cy)
     xa = AutoLISP.angleP(centerP, cx)
-    ya = AutoLISP.angleP(centerP, cy)
-#	print 'rotationAngle: xa [%s], ya [%s]' % (math.degrees(xa), math.degrees(ya))
-    # norm. x,y angles
-    nxa = xa
-    nya = ya
-    if abs(nxa - nya) > math.radians(90.5):
-        nxa = normAngle2pi(xa + math.pi)
-        nya = normAngle2pi(ya + math.pi)
-#	print 'rotationAngle: nxa [%s], nya [%s]' % (math.degrees(nxa), math.degrees(nya))
-    # detect Z-axis direction
-    if (nya - nxa) < 0:
-        zDir = -1.0
+    zDir = orientation(centerP, cx, cy)
     # calc angle
     ucsA = (origAngle * zDir) + (xa * zDir)
     return (zDir, ucsA)
 #def rotationAngle(cx, cy, centerP, origAngle):
 
+def rotationAngles(cx, cy, centerP, origAngle):
+    ''' rotationAngle for arrays: cx, cy, centerP [n, 2], origAngle [n];
+    all blocks or texts of drawing in one call. Returns numpy arrays (zDir, rotAngle)
+    '''
+    needNumpy('rotationAngles')
+    cx,cy,centerP = [numpy.asarray(p, dtype=numpy.float64).reshape(-1, numpy.shape(p)[-1]) for p in (cx, cy, centerP)]
+    xa = AutoLISP.angles(centerP[:, 0], centerP[:, 1], cx[:, 0], cx[:, 1])
+    zDir = orientations(centerP, cx, cy)
+    return (zDir, (numpy.asarray(origAngle, dtype=numpy.float64) * zDir) + (xa * zDir))
+
 
 class Vwcs2ucs:
     '''Examples:
@@ -136,15 +185,21 @@ class Vwcs2ucs:
     ucsDlt = math.radians(360)
     # if a <= ucsZA: ucsDlt = 0.0
     # ucsA = ucsZA + (a * ucsRotSign) + ucsDlt
+
+    UCS -> WCS (ucs2wcs) by Cramer's rule, see wcs2ucs; coefficients computed once in config.
+    Matrix with zero c row (2D UCS, as in examples) inverted for x, y only, z = 0.
+    Configured transformers for matrices kept in ucsCache, module functions use it.
     '''
     def __init__(self):
         self.ucsMatrix = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (0.0, 0.0, 0.0))
         self.ucsZA = 0.0
         self.ucsDlt = math.radians(360)
         self.bulgeSign = 1.0
+        self.inverse = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
 
     def config(self, matrix):
         self.ucsMatrix = matrix
+        self.inverse = self.inverseMatrix()
         # detect clock hands directions for UCS
         p0 = self.wcs2ucs(0.0, 0.0)
         p1 = self.wcs2ucs(2.0, 1.0)
@@ -159,6 +214,26 @@ class Vwcs2ucs:
         ta = (self.bulgeSign * self.ucsZA) + (self.bulgeSign * a)
         return normAngle2pi(ta)
 
+    def ucs2wcsAngle(self, a):
+        return normAngle2pi((self.bulgeSign * a) - self.ucsZA)
+
+    def inverseMatrix(self):
+        ''' rows of UCS -> WCS rotation: (x, y, z) = rows . (xt - d1, yt - d2, zt - d3);
+        None if matrix can't be inverted
+        '''
+        a,b,c,d = self.ucsMatrix
+        delta = a[0]*b[1]*c[2] - a[0]*c[1]*b[2] - b[0]*a[1]*c[2] + b[0]*c[1]*a[2] + c[0]*a[1]*b[2] - c[0]*b[1]*a[2]
+        if not delta == 0.0:
+            # delta1, delta2, delta3 coefficients for (xt - d1), (yt - d2), (zt - d3)
+            return (
+                ((b[1]*c[2] - c[1]*b[2]) / delta, (c[0]*b[2] - b[0]*c[2]) / delta, (b[0]*c[1] - c[0]*b[1]) / delta),
+                ((c[1]*a[2] - a[1]*c[2]) / delta, (a[0]*c[2] - c[0]*a[2]) / delta, (c[0]*a[1] - a[0]*c[1]) / delta),
+                ((a[1]*b[2] - b[1]*a[2]) / delta, (b[0]*a[2] - a[0]*b[2]) / delta, (a[0]*b[1] - b[0]*a[1]) / delta))
+        delta = a[0]*b[1] - b[0]*a[1]
+        if not delta == 0.0:
+            return ((b[1] / delta, -b[0] / delta, 0.0), (-a[1] / delta, a[0] / delta, 0.0), (0.0, 0.0, 0.0))
+        return None
+
     def getUCSBulgeSign(self):
         return self.bulgeSign
 
@@ -195,43 +270,429 @@ class Vwcs2ucs:
         z = 0.0
         if len(pnt) > 2: z = pnt[2]
         return self.wcs2ucs(pnt[0], pnt[1], z)
+
+    def ucs2wcs(self, x, y, z=0.0):
+        ''' transform point from UCS to WCS, returns point (x, y, z)
+        '''
+        if self.inverse is None:
+            raise NameError('UCS matrix can not be inverted [%s]' % (self.ucsMatrix,))
+        d = self.ucsMatrix[3]
+        i,j,k = self.inverse
+        x,y,z = (x - d[0], y - d[1], z - d[2])
+        return (i[0]*x + i[1]*y + i[2]*z, j[0]*x + j[1]*y + j[2]*z, k[0]*x + k[1]*y + k[2]*z)
+
+    def ucs2wcsP(self, pnt):
+        z = 0.0
+        if len(pnt) > 2: z = pnt[2]
+        return self.ucs2wcs(pnt[0], pnt[1], z)
+
+    def wcs2ucsPoints(self, points):
+        ''' transform points [(x, y) or (x, y, z), ...] from WCS to UCS.
+        Returns numpy array [n, 3], one matrix multiplication for all points;
+        list of points (x, y, z) w/o numpy
+        '''
+        if numpy is None:
+            return [self.wcs2ucsP(p) for p in points]
+        m = numpy.array(self.ucsMatrix, dtype=numpy.float64)
+        return pointsArray(points).dot(m[:3]) + m[3]
+
+    def ucs2wcsPoints(self, points):
+        ''' transform points from UCS to WCS, as wcs2ucsPoints
+        '''
+        if numpy is None:
+            return [self.ucs2wcsP(p) for p in points]
+        if self.inverse is None:
+            raise NameError('UCS matrix can not be inverted [%s]' % (self.ucsMatrix,))
+        inv = numpy.array(self.inverse, dtype=numpy.float64)
+        return (pointsArray(points) - numpy.array(self.ucsMatrix[3], dtype=numpy.float64)).dot(inv.T)
+
+    def wcs2ucsAngles(self, angles):
+        ''' wcs2ucsAngle for sequence of angles, numpy array in range [0, 2*pi) or list w/o numpy
+        '''
+        if numpy is None:
+            return [self.wcs2ucsAngle(a) for a in angles]
+        a = numpy.asarray(angles, dtype=numpy.float64)
+        return numpy.mod(self.bulgeSign * self.ucsZA + self.bulgeSign * a, 2.0 * math.pi)
+
+    def ucs2wcsAngles(self, angles):
+        if numpy is None:
+            return [self.ucs2wcsAngle(a) for a in angles]
+        a = numpy.asarray(angles, dtype=numpy.float64)
+        return numpy.mod(self.bulgeSign * a - self.ucsZA, 2.0 * math.pi)
 #class Vwcs2ucs:
 
 
+def pointsArray(points):
+    ''' numpy array [n, 3] for points [(x, y) or (x, y, z), ...] or array [n, 2], [n, 3]; z = 0 if missing
+    '''
+    if len(points) and len(points[0]) == 3:
+        return numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+    xy = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2)
+    res = numpy.zeros((len(xy), 3), dtype=numpy.float64)
+    res[:, :2] = xy
+    return res
+
+
+class VucsCache:
+    ''' Vwcs2ucs transformers keyed by UCS matrix, configured once for each matrix.
+    Oldest entries dropped when cache size exceeds maxsize.
+    '''
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.dict = {}
+        self.keys = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, matrix):
+        try: # tuple of tuples is a key already, same hash for equal int and float
+            t = self.dict.get(matrix)
+        except TypeError:
+            t = None
+        if t is not None:
+            self.hits += 1
+            return t
+        key = tuple([tuple([float(v) for v in row]) for row in matrix])
+        t = self.dict.get(key)
+        if t is not None:
+            self.hits += 1
+            return t
+        self.misses += 1
+        t = Vwcs2ucs()
+        t.config(key)
+        if len(self.keys) >= self.maxsize:
+            del self.dict[self.keys.pop(0)]
+        self.dict[key] = t
+        self.keys.append(key)
+        return t
+
+    def toStr(self):
+        return u'hits [%i], misses [%i], size [%i]' % (self.hits, self.misses, len(self.dict))
+
+    def __str__(self):
+        return self.toStr()
+
+    def __repr__(self):
+        return self.toStr()
+#class VucsCache:
+
+# transformers for wcs2ucs, ucs2wcs module functions
+ucsCache = VucsCache()
+
+
 def getBulgeSign(p0, p1, p2):
     ''' Detect clockhand directions reversion for new CS.
     Angle p0-p1 < p0-p2 in first CS, check how true is it in new CS.
     ref. snippets.VacLWPolyline.getWCSBulgeSign(self, norm)
+    Cross product orientation test, angles comparison fails when p0-p1 and p0-p2 cross 0 angle.
     '''
-    res = 1.0
-    p1a = AutoLISP.angleP(p0, p1)
-    p2a = AutoLISP.angleP(p0, p2)
-    if p1a > p2a: res = -1.0
-    return res
+    return orientation(p0, p1, p2)
 
 def getUCSBulgeSign(ucsMatrix):
-    t = Vwcs2ucs()
-    t.config(ucsMatrix)
-    return t.getUCSBulgeSign()
+    return ucsCache.get(ucsMatrix).getUCSBulgeSign()
 
 def wcs2ucs(matrix, x, y, z=0.0):
     ''' transform point from WCS to UCS
     '''
-    t = Vwcs2ucs()
-    t.config(matrix)
-    return t.wcs2ucs(x,y,z)
+    return ucsCache.get(matrix).wcs2ucs(x,y,z)
 
 def wcs2ucsP(matrix, pnt):
     z = 0.0
     if len(pnt) > 2: z = pnt[2]
     return wcs2ucs(matrix, pnt[0], pnt[1], z)
 
+def ucs2wcs(matrix, x, y, z=0.0):
+    ''' transform point from UCS to WCS
+    '''
+    return ucsCache.get(matrix).ucs2wcs(x,y,z)
+
+def ucs2wcsP(matrix, pnt):
+    z = 0.0
+    if len(pnt) > 2: z = pnt[2]
+    return ucs2wcs(matrix, pnt[0], pnt[1], z)
+
+
+def normVector(v):
+    ''' return vector v (x,y,z) scaled to unit length
+    '''
+    x,y,z = v
+    l = math.sqrt(x*x + y*y + z*z)
+    if l == 0.0:
+        raise NameError('normVector: zero length vector [%s]' % (v,))
+    return (x/l, y/l, z/l)
+
+def crossProduct(a, b):
+    return (a[1]*b[2] - a[2]*b[1], a[2]*b[0] - a[0]*b[2], a[0]*b[1] - a[1]*b[0])
+
+def arbitraryAxis(norm):
+    ''' AutoCAD arbitrary axis algorithm.
+    Returns OCS axes (ax, ay, az) as unit vectors in WCS for entity extrusion direction (Normal).
+
+    DXF Reference, Advanced DXF Issues, Arbitrary Axis Algorithm:
+        If (abs(Nx) < 1/64) and (abs(Ny) < 1/64) then
+            Ax = Wy X N
+        else
+            Ax = Wz X N
+        Scale Ax to unit length.
+        Ay = N X Ax, scale Ay to unit length.
+    '''
+    az = normVector(norm)
+    if abs(az[0]) < 1.0/64.0 and abs(az[1]) < 1.0/64.0:
+        ax = crossProduct((0.0, 1.0, 0.0), az)
+    else:
+        ax = crossProduct((0.0, 0.0, 1.0), az)
+    ax = normVector(ax)
+    ay = normVector(crossProduct(az, ax))
+    return (ax, ay, az)
+
+
+class Vocs2wcs:
+    ''' OCS <-> WCS points transformation without AutoCAD.
+    Replacement for Utility.TranslateCoordinates(p, acOCS, acWorld, False, norm) and back.
+
+    OCS origin is the WCS origin, so it's rotation only:
+        wcs = x*ax + y*ay + z*az
+        ocs = (wcs . ax, wcs . ay, wcs . az)
+    Examples:
+        t = Vocs2wcs((0.0, 0.0, -1.0))
+        t.ocs2wcs(1.0, 2.0) # (-1.0, 2.0, 0.0)
+    '''
+    def __init__(self, norm=(0.0, 0.0, 1.0)):
+        self.norm = (0.0, 0.0, 1.0)
+        self.axes = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+        self.matrix = ()
+        self.inverse = ()
+        self.zeroAngle = 0.0
+        self.bulgeSign = 1.0
+        self.config(norm)
+
+    def config(self, norm):
+        self.norm = tuple(norm)
+        self.axes = arbitraryAxis(norm)
+        ax,ay,az = self.axes
+        # 4x4 OCS -> WCS matrix, columns are OCS axes; inverse is transposed (rotation only)
+        self.matrix = (
+            (ax[0], ay[0], az[0], 0.0),
+            (ax[1], ay[1], az[1], 0.0),
+            (ax[2], ay[2], az[2], 0.0),
+            (0.0, 0.0, 0.0, 1.0))
+        self.inverse = (
+            (ax[0], ax[1], ax[2], 0.0),
+            (ay[0], ay[1], ay[2], 0.0),
+            (az[0], az[1], az[2], 0.0),
+            (0.0, 0.0, 0.0, 1.0))
+        # same as VAcadServices.ocs2wcsAngle
+        p0 = self.ocs2wcs(0.0, 0.0)
+        p1 = self.ocs2wcs(2.0, 1.0)
+        p2 = self.ocs2wcs(2.0, 2.0)
+        p10 = self.ocs2wcs(1.0, 0.0)
+        self.bulgeSign = getBulgeSign(p0, p1, p2)
+        self.zeroAngle = AutoLISP.angleP(p0, p10)
+
+    def ocs2wcsAngle(self, a):
+        ta = (self.bulgeSign * self.zeroAngle) + (self.bulgeSign * a)
+        return normAngle2pi(ta)
+
+    def ocs2wcs(self, x, y, z=0.0):
+        ax,ay,az = self.axes
+        return (
+            x*ax[0] + y*ay[0] + z*az[0],
+            x*ax[1] + y*ay[1] + z*az[1],
+            x*ax[2] + y*ay[2] + z*az[2])
+
+    def wcs2ocs(self, x, y, z=0.0):
+        ax,ay,az = self.axes
+        return (
+            x*ax[0] + y*ax[1] + z*ax[2],
+            x*ay[0] + y*ay[1] + z*ay[2],
+            x*az[0] + y*az[1] + z*az[2])
+
+    def ocs2wcsP(self, pnt):
+        z = 0.0
+        if len(pnt) > 2: z = pnt[2]
+        return self.ocs2wcs(pnt[0], pnt[1], z)
+
+    def wcs2ocsP(self, pnt):
+        z = 0.0
+        if len(pnt) > 2: z = pnt[2]
+        return self.wcs2ocs(pnt[0], pnt[1], z)
+
+    def ocs2wcsXY(self, coords):
+        ''' transform flat list of 2D OCS coords (x1, y1, x2, y2, ...) to WCS.
+        Returns list of points [(x,y), ...]; with numpy it's one matrix multiplication
+        for all vertices.
+        '''
+        if numpy is None:
+            res = []
+            for n in xrange(0, len(coords) - 1, 2):
+                x,y,z = self.ocs2wcs(coords[n], coords[n+1])
+                res.append((x, y))
+            return res
+        xy = numpy.asarray(coords, dtype=numpy.float64).reshape(-1, 2)
+        rot = numpy.array(self.matrix, dtype=numpy.float64)[:2, :2]
+        return xy.dot(rot.T).tolist()
+#class Vocs2wcs:
+
+
+class VocsCache:
+    ''' Vocs2wcs transformers keyed by entity Normal.
+    Almost all entities in drawing share a few normals, so axes, matrices, zero angle
+    and bulge sign computed once per normal.
+    Oldest entries dropped when cache size exceeds maxsize.
+    '''
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.dict = {}
+        self.keys = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, norm):
+        key = (norm[0], norm[1], norm[2])
+        t = self.dict.get(key)
+        if t is not None:
+            self.hits += 1
+            return t
+        self.misses += 1
+        t = Vocs2wcs(key)
+        if len(self.keys) >= self.maxsize:
+            del self.dict[self.keys.pop(0)]
+        self.dict[key] = t
+        self.keys.append(key)
+        return t
+
+    def toStr(self):
+        return u'hits [%i], misses [%i], size [%i]' % (self.hits, self.misses, len(self.dict))
+
+    def __str__(self):
+        return self.toStr()
+
+    def __repr__(self):
+        return self.toStr()
+#class VocsCache:
+
+
+# max facet angle for tolerance tessellation, full circle gets 3 facets at least
+MAX_FACET_ANGLE = math.pi * 2.0 / 3.0
+
+def arcFacets(radius, sweep, tolerance=0.0, maxangle=math.pi/18.0):
+    ''' facets count for arc of radius and sweep (radians):
+    tolerance > 0: sagitta of each facet (max distance between chord and arc) <= tolerance, drawing units;
+    so small arcs get few facets and big ones enough to look smooth;
+    tolerance 0: facet angle <= maxangle
+    '''
+    if tolerance > 0.0:
+        if radius <= 0.0:
+            return 1
+        maxangle = min(2.0 * math.acos(max(-1.0, 1.0 - tolerance / radius)), MAX_FACET_ANGLE)
+        if maxangle <= 0.0:
+            return 1
+    return max(1, int(math.ceil(abs(sweep) / maxangle - 1e-9)))
+
+
+class VarcTolerance:
+    ''' Sagitta tolerance for arcs tessellation (arcFacets) by layer name:
+    tolerance of first matched layer name glob or default; names compared case insensitive.
+    Result cached per layer name.
+    '''
+    def __init__(self, default=0.0, layers=()):
+        self.default = default
+        self.layers = [(glob.upper(), tol) for glob,tol in layers]
+        self.cache = {}
+
+    def get(self, lyr):
+        res = self.cache.get(lyr)
+        if res is None:
+            import fnmatch
+            res = self.default
+            u = lyr.upper()
+            for glob,tol in self.layers:
+                if fnmatch.fnmatchcase(u, glob):
+                    res = tol
+                    break
+            self.cache[lyr] = res
+        return res
 
-def unzipBulge(x1, y1, x2, y2, bulge, sublen=0.0, algo=1):
+    def toStr(self):
+        return u'default [%s], layers [%s]' % (self.default, u';'.join([u'%s=%s' % x for x in self.layers]))
+
+    def __str__(self):
+        return self.toStr().encode(cp)
+
+    def __repr__(self):
+        return self.toStr().encode(cp)
+#class VarcTolerance:
+
+
+# bulge values closer than BULGE_QUANTUM share facets template
+BULGE_QUANTUM = 1e-9
+
+class VarcTemplates:
+    ''' Facets templates for bulge segments in normalized chord space:
+    chord from (0, 0) to (1, 0), inner facets vertices (u, v) for bulge and facets count.
+    Segment p1-p2 points are p1 + u * (p2 - p1) + v * perp(p2 - p1), i.e. scale, rotate and translate,
+    no trig functions per facet. Drawings repeat the same bulges (rounded corners, symbols),
+    so templates computed once for each (quantized bulge, facets count).
+    Oldest entries dropped when cache size exceeds maxsize.
+    '''
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.dict = {}
+        self.keys = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, bulge, n):
+        key = (int(round(bulge / BULGE_QUANTUM)), n)
+        t = self.dict.get(key)
+        if t is not None:
+            self.hits += 1
+            return t
+        self.misses += 1
+        t = arcTemplate(bulge, n)
+        if len(self.keys) >= self.maxsize:
+            del self.dict[self.keys.pop(0)]
+        self.dict[key] = t
+        self.keys.append(key)
+        return t
+
+    def hitRate(self):
+        return 100.0 * self.hits / max(1, self.hits + self.misses)
+
+    def toStr(self):
+        return u'hits [%i], misses [%i], hit rate [%0.1f%%], size [%i]' % (
+            self.hits, self.misses, self.hitRate(), len(self.dict))
+
+    def __str__(self):
+        return self.toStr()
+
+    def __repr__(self):
+        return self.toStr()
+#class VarcTemplates:
+
+
+def arcTemplate(bulge, n):
+    ''' inner vertices (u, v) of bulge arc over chord (0, 0)-(1, 0) divided to n equal parts
+    '''
+    theta = 4.0 * math.atan(bulge)
+    radius = 1.0 / (2.0 * math.sin(theta / 2.0)) # signed, like theta
+    a = math.pi / 2.0 - theta / 2.0
+    cx,cy = (radius * math.cos(a), radius * math.sin(a))
+    sa = math.atan2(-cy, -cx)
+    step = theta / n
+    r = abs(radius)
+    return tuple([(cx + r * math.cos(sa + step * i), cy + r * math.sin(sa + step * i)) for i in xrange(1, n)])
+
+# bulgePoints templates, shared by all drawings
+arcTemplates = VarcTemplates()
+
+
+def unzipBulge(x1, y1, x2, y2, bulge, sublen=0.0, algo=1, tolerance=0.0):
     ''' Convert AutoCAD polyline segment with bulge to arc (radius, center, angles, start-stop points)
     and to approximating line segments (facets).
 
     If sublen == 0 then facetlen = 2*pi*r / 30
+    If tolerance > 0 then facets count by max sagitta (arcFacets), sublen ignored
 
     Formula sources:
         att\FacetBulge_rev1.zip\FacetBulge\BulgeCalc_Rev1.xls (wrong formula)
@@ -334,12 +795,15 @@ def unzipBulge(x1, y1, x2, y2, bulge, sublen=0.0, algo=1):
     res['seAngles'] = (startAngle, endAngle)
 
     # subangle (F27), numsub (# of Divisions K26)
-    if sublen <= 0.0:
-        numsub = abs(angle / 0.2) # 30 segments for full circle
-        try: sublen = alen / numsub
-        except: sublen = alen
-    try: numsub = round(alen/sublen, 0)
-    except: numsub = 1
+    if tolerance > 0.0:
+        numsub = float(arcFacets(radius, angle, tolerance))
+    else:
+        if sublen <= 0.0:
+            numsub = abs(angle / 0.2) # 30 segments for full circle
+            try: sublen = alen / numsub
+            except: sublen = alen
+        try: numsub = round(alen/sublen, 0)
+        except: numsub = 1
     if numsub < 2:
         numsub = 1
     subangle = angle / numsub
@@ -380,13 +844,87 @@ def unzipBulge(x1, y1, x2, y2, bulge, sublen=0.0, algo=1):
     print 'unzipBulge done [%s; %s; %s; %s; %s; %s; %s; %s; %s; subpoints %s]' % (
         s1, s2, s3, s4, s5, s6, s7, s8, s9, listPoints)
     return res
-#def unzipBulge(x1, y1, x2, y2, bulge, sublen=0.0, algo=1):
+#def unzipBulge(x1, y1, x2, y2, bulge, sublen=0.0, algo=1, tolerance=0.0):
 
 
-def unzipBulge2(p1, p2, bulge, sublen):
+def unzipBulge2(p1, p2, bulge, sublen, tolerance=0.0):
     ''' p1, p2 - points like (x,y,z)
     '''
-    return unzipBulge(p1[0], p1[1], p2[0], p2[1], bulge, sublen)
+    return unzipBulge(p1[0], p1[1], p2[0], p2[1], bulge, sublen, tolerance=tolerance)
+
+
+def unzipBulges(segments, sublen=0.0, tolerance=0.0):
+    ''' Batch unzipBulge for many polyline segments, numpy needed.
+    segments: array [n, 5] or list of (x1, y1, x2, y2, bulge).
+    Facets count for each segment the same as unzipBulge gives for sublen or tolerance;
+    tolerance: number or array [n], e.g. VarcTolerance.get for segments layers;
+    points computed as in unzipBulge algo 2 (on circle, no error accumulation), w/o prints.
+    Points equal to unzipBulge points, algo 1 or 2, within 1e-9 * max(1, radius).
+
+    Returns dict of numpy arrays:
+        center      float64 [n, 2], arc center
+        radius      float64 [n], 1e99 for straight segment (bulge 0), as unzipBulge
+        angle       float64 [n], included angle, radians, signed as bulge
+        offsets     int64 [n + 1], segment i points: points[2*offsets[i]:2*offsets[i+1]]
+        points      float64 [2*m], x,y of facets vertices, segment start and end points included;
+                    points.reshape(-1, 2) for [m, 2] view
+    '''
+    if numpy is None:
+        raise NameError('numpy module needed for unzipBulges')
+    np = numpy
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 5)
+    x1,y1,x2,y2,bulge = [seg[:, i] for i in range(5)]
+    err = np.seterr(divide='ignore', invalid='ignore', over='ignore')
+    try:
+        angle = np.arctan(bulge) * 4.0
+        dist = np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        radius = np.where(angle == 0.0, 1.e99, (dist / 2.0) / np.sin(np.abs(angle / 2.0)))
+        radius[radius == 0.0] = 1.e-99
+        alen = np.abs(radius * angle)
+
+        gamma = (np.pi - 4.0 * np.arctan(np.abs(bulge))) / 2.0
+        phi = np.arctan2(y2 - y1, x2 - x1) + gamma * np.where(bulge < 0.0, -1.0, 1.0)
+        cx,cy = (x1 + radius * np.cos(phi), y1 + radius * np.sin(phi))
+        startAngle = np.arctan2(y1 - cy, x1 - cx)
+
+        # facets count, unzipBulge way: python round, ZeroDivisionError gives 1 facet
+        if sublen <= 0.0:
+            numsub = np.abs(angle / 0.2)
+            sub = np.where(numsub == 0.0, alen, alen / numsub)
+        else:
+            sub = np.float64(sublen)
+        numsub = np.floor(alen / sub + 0.5)
+        tol = np.zeros(len(seg)) + tolerance
+        if (tol > 0.0).any():
+            maxangle = np.minimum(2.0 * np.arccos(np.clip(1.0 - tol / radius, -1.0, 1.0)), MAX_FACET_ANGLE)
+            numsub = np.where(tol > 0.0, np.ceil(np.abs(angle) / maxangle - 1e-9), numsub)
+        numsub[~np.isfinite(numsub) | (numsub < 2)] = 1
+        subangle = angle / numsub
+    finally:
+        np.seterr(**err)
+
+    count = numsub.astype(np.int64)
+    offsets = np.zeros(len(seg) + 1, dtype=np.int64)
+    np.cumsum(count + 1, out=offsets[1:])
+    xy = np.empty((offsets[-1], 2), dtype=np.float64)
+    xy[offsets[:-1], 0],xy[offsets[:-1], 1] = (x1, y1)
+    xy[offsets[1:] - 1, 0],xy[offsets[1:] - 1, 1] = (x2, y2)
+
+    # inner points: segment index and step number for each
+    inner = count - 1
+    idx = np.repeat(np.arange(len(seg)), inner)
+    if len(idx):
+        first = np.cumsum(inner) - inner
+        step = np.arange(len(idx)) - np.repeat(first, inner) + 1
+        a = startAngle[idx] + step * subangle[idx]
+        r = radius[idx]
+        pos = offsets[idx] + step
+        xy[pos, 0] = cx[idx] + r * np.cos(a)
+        xy[pos, 1] = cy[idx] + r * np.sin(a)
+
+    return {'center': np.column_stack((cx, cy)), 'radius': radius, 'angle': angle,
+        'offsets': offsets, 'points': xy.ravel()}
+#def unzipBulges(segments, sublen=0.0, tolerance=0.0):
 
 
 def getArcBulge(center, start, end, startangle=-1, endangle=-1):
@@ -439,21 +977,104 @@ def getArcMidpointA(center, radius, startangle, endangle):
     x,y = AutoLISP.polar(center[0], center[1], a, radius)
     return (x,y,0)
 
+def getArcMidpointsA(center, radius, startangle, endangle):
+    ''' getArcMidpointA for arrays: center [n, 2], radius, startangle, endangle [n];
+    numpy array of midpoints [n, 3], z = 0
+    '''
+    needNumpy('getArcMidpointsA')
+    c = numpy.asarray(center, dtype=numpy.float64).reshape(-1, numpy.shape(center)[-1])
+    s = numpy.asarray(startangle, dtype=numpy.float64)
+    e = numpy.asarray(endangle, dtype=numpy.float64)
+    # normArcAngles
+    back = s > e
+    delta = numpy.where(back, math.radians(360) - s, 0.0)
+    e = numpy.where(back, e + delta, e)
+    s = numpy.where(back, 0.0, s)
+    a = ((e - s) / 2.0) - delta + s
+    res = numpy.zeros((len(c), 3), dtype=numpy.float64)
+    res[:, 0],res[:, 1] = AutoLISP.polars(c[:, 0], c[:, 1], a, radius)
+    return res
+
 def detectArcStartEnd(center, start, end, midpoint):
     ''' s,e = detectArcStartEnd(c, s, e, m)
     An arc is always drawn counterclockwise from the start point to the endpoint.
+    Points on circle in counterclockwise order make counterclockwise triangle,
+    so arc from start to end goes through midpoint if (start, midpoint, end) orientation is counterclockwise.
     '''
-    startangle = AutoLISP.angle(center[0], center[1], start[0],start[1])
-    endangle = AutoLISP.angle(center[0], center[1], end[0],end[1])
-    midangle = AutoLISP.angle(center[0], center[1], midpoint[0],midpoint[1])
-    startangle, endangle, delta = normArcAngles(startangle, endangle)
-    midangle += delta
-    if midangle > math.radians(360):
-        midangle -= math.radians(360)
-    if midangle > startangle and midangle < endangle:
+    if orientation(start, midpoint, end) > 0:
         return (start, end)
     return (end, start)
 
+def detectArcsStartEnd(center, start, end, midpoint):
+    ''' detectArcStartEnd for arrays of points [n, 2] or [n, 3]; returns numpy arrays (start, end)
+    '''
+    needNumpy('detectArcsStartEnd')
+    s = numpy.asarray(start, dtype=numpy.float64)
+    e = numpy.asarray(end, dtype=numpy.float64)
+    ccw = (orientations(s, midpoint, e) > 0)[:, numpy.newaxis]
+    return (numpy.where(ccw, s, e), numpy.where(ccw, e, s))
+
+
+def bulgePoints(p1, p2, bulge, maxangle=math.pi/18.0, tolerance=0.0, templates=arcTemplates):
+    ''' Polyline bulge segment p1-p2 as points [(x,y), ...] from p1 (excluded) to p2 (included);
+    arc divided to equal parts with included angle <= maxangle or by sagitta tolerance (arcFacets).
+    Included angle = 4 * atan(bulge), positive bulge: counterclockwise.
+    Quiet and cheap, unlike unzipBulge; for GIS outputs.
+    templates: VarcTemplates cache, None: compute points on arc directly
+    '''
+    if bulge == 0.0:
+        return [(p2[0], p2[1])]
+    dx,dy = (p2[0] - p1[0], p2[1] - p1[1])
+    chord = math.hypot(dx, dy)
+    if chord == 0.0:
+        return [(p2[0], p2[1])]
+    theta = 4.0 * math.atan(bulge)
+    radius = chord / (2.0 * math.sin(theta / 2.0)) # signed, like theta
+    if templates is not None:
+        res = [(p1[0] + u * dx - v * dy, p1[1] + u * dy + v * dx)
+            for u,v in templates.get(bulge, arcFacets(abs(radius), theta, tolerance, maxangle))]
+        res.append((p2[0], p2[1]))
+        return res
+    a = math.atan2(dy, dx) + math.pi / 2.0 - theta / 2.0
+    cx,cy = (p1[0] + radius * math.cos(a), p1[1] + radius * math.sin(a))
+    return arcPoints((cx, cy), abs(radius), math.atan2(p1[1] - cy, p1[0] - cx), theta, p2, maxangle, tolerance)
+
+def arcPoints(center, radius, startangle, sweep, end, maxangle=math.pi/18.0, tolerance=0.0):
+    ''' points on arc after start point: sweep (signed, radians) divided to equal parts
+    with angle <= maxangle or by sagitta tolerance (arcFacets); last point is end, exactly
+    '''
+    n = arcFacets(radius, sweep, tolerance, maxangle)
+    step = sweep / n
+    res = []
+    for i in xrange(1, n):
+        a = startangle + step * i
+        res.append((center[0] + radius * math.cos(a), center[1] + radius * math.sin(a)))
+    res.append((end[0], end[1]))
+    return res
+
+def arcSweep(center, start, end, midpoint):
+    ''' (start angle, signed sweep) for arc from start to end through midpoint
+    '''
+    sa = math.atan2(start[1] - center[1], start[0] - center[0])
+    ccw = normAngle2pi(math.atan2(end[1] - center[1], end[0] - center[0]) - sa)
+    ma = normAngle2pi(math.atan2(midpoint[1] - center[1], midpoint[0] - center[0]) - sa)
+    if ccw == 0.0:
+        ccw = math.pi * 2.0
+    if ma <= ccw:
+        return (sa, ccw)
+    return (sa, ccw - math.pi * 2.0)
+
+def arcSweeps(center, start, end, midpoint):
+    ''' arcSweep for arrays of points [n, 2], (start angles, signed sweeps) numpy arrays
+    '''
+    needNumpy('arcSweeps')
+    c,s,e,m = [numpy.asarray(p, dtype=numpy.float64).reshape(-1, numpy.shape(p)[-1]) for p in (center, start, end, midpoint)]
+    sa = numpy.arctan2(s[:, 1] - c[:, 1], s[:, 0] - c[:, 0])
+    ccw = normAngles2pi(numpy.arctan2(e[:, 1] - c[:, 1], e[:, 0] - c[:, 0]) - sa)
+    ma = normAngles2pi(numpy.arctan2(m[:, 1] - c[:, 1], m[:, 0] - c[:, 0]) - sa)
+    ccw = numpy.where(ccw == 0.0, math.pi * 2.0, ccw)
+    return (sa, numpy.where(ma <= ccw, ccw, ccw - math.pi * 2.0))
+
 
 ################################################################################
 # Some tests
@@ -531,10 +1152,211 @@ def testAngle():
     print
 #def testAngle():
 
+def testOCS():
+    ''' (trans '(1.0 2.0 0.0) (handent "...") 0) for entity with Normal (0 0 -1) give us (-1.0 2.0 0.0)
+    '''
+    t = Vocs2wcs((0.0, 0.0, -1.0))
+    test(t.ocs2wcs(1.0, 2.0), (-1.0, 2.0, 0.0))
+    test(t.wcs2ocsP((-1.0, 2.0)), (1.0, 2.0, 0.0))
+    t = Vocs2wcs((0.0, 0.0, 1.0))
+    test(t.ocs2wcsP((3.0, 4.0, 5.0)), (3.0, 4.0, 5.0))
+    t = Vocs2wcs((1.0, 1.0, 1.0))
+    p = t.wcs2ocsP(t.ocs2wcs(3.0, 4.0, 5.0))
+    test([floatIsEqual(a, b, 1e-9) for a,b in zip(p, (3.0, 4.0, 5.0))], [True, True, True])
+    # arbitrary axis by hand: Ax = Wz x N (Wy x N if N near Z), Ay = N x Ax; OCS axes in WCS.
+    # Expected values don't come from Vocs2wcs, acadsim TranslateCoordinates uses it
+    r2,r3,r6 = (math.sqrt(2.0), math.sqrt(3.0), math.sqrt(6.0))
+    for norm,ax,ay,az in (
+            ((0.0, 1.0, 0.0), (-1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 1.0, 0.0)),
+            ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0)),
+            ((0.0, 0.0, -1.0), (-1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, -1.0)),
+            ((1.0, 1.0, 1.0), (-1.0 / r2, 1.0 / r2, 0.0), (-1.0 / r6, -1.0 / r6, 2.0 / r6), (1.0 / r3, 1.0 / r3, 1.0 / r3))):
+        t = Vocs2wcs(norm)
+        for p,res in (((1.0, 0.0, 0.0), ax), ((0.0, 1.0, 0.0), ay), ((0.0, 0.0, 1.0), az),
+                ((3.0, 4.0, 5.0), [3 * a + 4 * b + 5 * c for a,b,c in zip(ax, ay, az)])):
+            test([floatIsEqual(a, b, 1e-12) for a,b in zip(t.ocs2wcsP(p), res)], [True, True, True])
+            test([floatIsEqual(a, b, 1e-12) for a,b in zip(t.wcs2ocsP(res), p)], [True, True, True])
+    c = VocsCache(maxsize=2)
+    t = c.get((0.0, 0.0, -1.0))
+    test((t.bulgeSign, t.zeroAngle), (-1.0, math.pi))
+    test(c.get((0.0, 0.0, -1.0)) is t, True)
+    c.get((0.0, 0.0, 1.0))
+    c.get((1.0, 0.0, 0.0))
+    test((c.hits, c.misses, len(c.dict)), (1, 3, 2))
+    t = Vocs2wcs((0.0, 0.0, -1.0))
+    test([tuple(p) for p in t.ocs2wcsXY((1.0, 2.0, 3.0, 4.0))], [(-1.0, 2.0), (-3.0, 4.0)])
+
+def testBulgePoints():
+    ''' half circle (0,0)-(2,0), bulge 1: counterclockwise, through (1,-1); bulge -1 through (1,1)
+    '''
+    pts = bulgePoints((0.0, 0.0), (2.0, 0.0), 1.0, math.pi / 2.0)
+    test(len(pts), 2)
+    test([floatIsEqual(a, b, 1e-9) for a,b in zip(pts[0], (1.0, -1.0))], [True, True])
+    test(pts[-1], (2.0, 0.0))
+    pts = bulgePoints((0.0, 0.0), (2.0, 0.0), -1.0, math.pi / 2.0)
+    test([floatIsEqual(a, b, 1e-9) for a,b in zip(pts[0], (1.0, 1.0))], [True, True])
+    test(len(bulgePoints((0.0, 0.0), (2.0, 0.0), 1.0)), 18)
+    test(bulgePoints((0.0, 0.0), (2.0, 0.0), 0.0), [(2.0, 0.0)])
+    sa,sweep = arcSweep((0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (-1.0, 0.0))
+    test((floatIsEqual(sa, 0.0, 1e-9), floatIsEqual(sweep, -1.5 * math.pi, 1e-9)), (True, True))
+    sa,sweep = arcSweep((0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (0.7, 0.7))
+    test(floatIsEqual(sweep, 0.5 * math.pi, 1e-9), True)
+
+def testUnzipBulges():
+    ''' batch tessellation gives unzipBulge points, algo 1 and algo 2
+    '''
+    if numpy is None:
+        print 'testUnzipBulges skipped, no numpy'
+        return
+    segs = [(13.0, 9.0, 21.68, 33.65, -0.45), (11.7326, 11.8487, 13.1059, 15.2217, 2.5613),
+        (24.2884, 10.3276, 27.3493, 14.9170, -4.5373), (8.0555, 5.0696, -6.8401, -6.4998, -0.3324),
+        (6.0425, -6.4998, -3.6195, 4.3654, -2.1734), (1.0, 0.0, -1.0, 0.0, 1.0),
+        (50.0, 0.0, -50.0, 0.0, 1.0), (1.0, 0.0, 0.99, -0.044, 44.53),
+        (0.0, 0.0, 0.0, 0.0, 45.0), (0.0, 0.0, 1.0, 1.0, 0.0), (0.0, 0.0, 1000.0, 0.0, 0.001)]
+    stdout = sys.stdout
+    for sublen in (0.0, 1.0, 0.3):
+        res = unzipBulges(segs, sublen)
+        off,pts = (res['offsets'], res['points'].reshape(-1, 2))
+        test(len(off), len(segs) + 1)
+        for i,(x1,y1,x2,y2,b) in enumerate(segs):
+            sys.stdout = open(os.devnull, 'w')
+            try:
+                paragons = [unzipBulge(x1, y1, x2, y2, b, sublen, algo) for algo in (1, 2)]
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+            tol = 1e-9 * max(1.0, paragons[0]['radius'])
+            test(floatIsEqual(res['radius'][i], paragons[0]['radius'], tol), True)
+            if b:
+                test([floatIsEqual(a, c, tol) for a,c in zip(res['center'][i], paragons[0]['center'])], [True, True])
+            for p in paragons:
+                test(len(p['points']), off[i+1] - off[i])
+                test(max([max(abs(a[0] - c[0]), abs(a[1] - c[1])) for a,c in zip(pts[off[i]:off[i+1]], p['points'])]) <= tol, True)
+    test(len(unzipBulges([])['points']), 0)
+
+def testArcFacets():
+    ''' tolerance tessellation: facets sagitta <= tolerance, small arcs get few facets
+    '''
+    for radius,tol in ((0.5, 0.01), (500.0, 0.01), (500.0, 0.5), (3.0, 10.0)):
+        n = arcFacets(radius, math.pi * 2.0, tol)
+        test(radius * (1.0 - math.cos(math.pi / n)) <= tol, True)
+        test(n <= 3 or radius * (1.0 - math.cos(math.pi / (n - 1))) > tol, True)
+    test(arcFacets(0.5, math.pi * 2.0, 0.01) < 36 < arcFacets(500.0, math.pi * 2.0, 0.01), True)
+    test(arcFacets(3.0, math.pi * 2.0, 10.0), 3)
+    test(arcFacets(1.0, math.pi, 0.0), 18)
+    test(len(bulgePoints((0.0, 0.0), (2.0, 0.0), 1.0, tolerance=0.01)), arcFacets(1.0, math.pi, 0.01))
+    t = VarcTolerance(0.05, [(u'в_*', 0.001), (u'ЗД_*', 0.1)])
+    test((t.get(u'В_КОЛОДЕЦ'), t.get(u'ЗД_ЖИЛЫЕ'), t.get(u'0')), (0.001, 0.1, 0.05))
+    so = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        res = unzipBulge(50.0, 0.0, -50.0, 0.0, 1.0, tolerance=0.01)
+    finally:
+        sys.stdout.close()
+        sys.stdout = so
+    test(len(res['points']) - 1, arcFacets(50.0, math.pi, 0.01))
+    if numpy is not None:
+        res = unzipBulges([(50.0, 0.0, -50.0, 0.0, 1.0), (1.0, 0.0, -1.0, 0.0, 1.0), (0.0, 0.0, 1.0, 0.0, 0.0)], tolerance=[0.01, 0.01, 0.01])
+        test(list(numpy.diff(res['offsets'])), [arcFacets(50.0, math.pi, 0.01) + 1, arcFacets(1.0, math.pi, 0.01) + 1, 2])
+
+def testArcTemplates():
+    ''' template points the same as computed on arc, repeated bulges taken from cache
+    '''
+    c = VarcTemplates(maxsize=2)
+    for p1,p2,b,tol in (((0.0, 0.0), (2.0, 0.0), 1.0, 0.0), ((5.0, 7.0), (3.0, -4.0), -0.41421356, 0.0),
+            ((100.0, 50.0), (130.0, 90.0), 0.2, 0.01), ((100.0, 50.0), (99.0, 51.0), 3.5, 0.0)):
+        a = bulgePoints(p1, p2, b, tolerance=tol, templates=c)
+        e = bulgePoints(p1, p2, b, tolerance=tol, templates=None)
+        test(len(a), len(e))
+        test(max([max(abs(x[0] - y[0]), abs(x[1] - y[1])) for x,y in zip(a, e)]) < 1e-9, True)
+        test(a[-1], (p2[0], p2[1]))
+    test((c.hits, c.misses, len(c.dict)), (0, 4, 2))
+    bulgePoints((1.0, 1.0), (4.0, 5.0), 3.5, templates=c)
+    bulgePoints((1.0, 1.0), (4.0, 5.0), 3.5 + BULGE_QUANTUM / 10.0, templates=c)
+    test((c.hits, c.misses), (2, 4))
+
+def testUCS():
+    ''' UCS -> WCS inverse, batched transforms the same as point by point, transformers memoized
+    '''
+    flip = ((0.0, 1.0, 0.0), (1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    a = 0.3
+    rot = ((math.cos(a), math.sin(a), 0.0), (-math.sin(a), math.cos(a), 0.0), (0.0, 0.0, 1.0), (10.0, -20.0, 5.0))
+    pts = [(3195.9399150400714, 1786.6350706759843), (1.0, 2.0), (-5.5, 0.25)]
+    for m in (flip, rot):
+        t = ucsCache.get(m)
+        test(ucsCache.get([list(r) for r in m]) is t, True)
+        for p in pts:
+            u = wcs2ucsP(m, p)
+            w = ucs2wcsP(m, u)
+            test([floatIsEqual(x, y, 1e-9) for x,y in zip(w, p + (0.0,))], [True, True, True])
+        test(floatIsEqual(t.ucs2wcsAngle(t.wcs2ucsAngle(1.0)), 1.0, 1e-12), True)
+        if numpy is None: continue
+        u = t.wcs2ucsPoints(pts)
+        test(numpy.abs(u - numpy.array([t.wcs2ucsP(p) for p in pts])).max() < 1e-9, True)
+        test(numpy.abs(t.ucs2wcsPoints(u)[:, :2] - numpy.array(pts)).max() < 1e-9, True)
+        angles = [0.0, 1.0, 4.0, 6.0]
+        test(numpy.abs(t.wcs2ucsAngles(angles) - numpy.mod([t.wcs2ucsAngle(x) for x in angles], 2.0 * math.pi)).max() < 1e-12, True)
+        test(numpy.abs(t.ucs2wcsAngles(t.wcs2ucsAngles(angles)) - angles).max() < 1e-12, True)
+    test(wcs2ucs(flip, 1.0, 2.0), (2.0, 1.0, 0.0))
+    t = Vwcs2ucs()
+    t.config(((1.0, 0.0, 0.0), (2.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)))
+    test(t.inverse, None)
+
+def testAngleKernel():
+    ''' orientation by cross product, array versions give scalar results
+    '''
+    p0,p1,p2 = ((0.0, 0.0), (math.cos(-0.1), math.sin(-0.1)), (math.cos(0.1), math.sin(0.1)))
+    test(getBulgeSign(p0, p1, p2), 1.0) # 350 and 10 deg, counterclockwise
+    test(normAngle2pi(-7.0 * math.pi / 2.0), math.pi / 2.0)
+    test(floatIsEqual(normAngle2pi(1001.0), 1001.0 - 159 * 2 * math.pi, 1e-9), True)
+    # arcs: center, radius, start angle, sweep (counterclockwise)
+    import random
+    rnd = random.Random(7)
+    arcs = [((rnd.uniform(-100, 100), rnd.uniform(-100, 100)), rnd.uniform(0.1, 50), rnd.uniform(0, 2 * math.pi),
+        rnd.uniform(0.01, 2 * math.pi - 0.01)) for i in range(200)]
+    for c,r,sa,sw in arcs:
+        s = AutoLISP.polarP(c, sa, r)
+        e = AutoLISP.polarP(c, sa + sw, r)
+        m = getArcMidpointA(c, r, normAngle2pi(sa), normAngle2pi(sa + sw))
+        test(detectArcStartEnd(c, s, e, m), (s, e))
+        test(detectArcStartEnd(c, e, s, m), (s, e))
+    if numpy is None:
+        print 'testAngleKernel arrays skipped, no numpy'
+        return
+    pts = numpy.array([(rnd.uniform(-10, 10), rnd.uniform(-10, 10)) for i in range(200)]).reshape(-1, 4)
+    res = AutoLISP.angles(pts[:, 0], pts[:, 1], pts[:, 2], pts[:, 3])
+    test(res.tolist(), [AutoLISP.angle(*p) for p in pts.tolist()])
+    angles = [rnd.uniform(-50, 50) for i in range(100)] + [0.0, 2 * math.pi, -2 * math.pi]
+    test(normAngles2pi(angles).tolist(), [normAngle2pi(a) for a in angles])
+    c = pts[:, :2]
+    cx = c + [(math.cos(a), math.sin(a)) for a in angles[:len(c)]]
+    turns = [math.pi / 2 * rnd.choice((1, -1)) for a in angles[:len(c)]]
+    cy = c + [(math.cos(a + t), math.sin(a + t)) for a,t in zip(angles, turns)]
+    orig = angles[:len(c)]
+    zDir,ucsA = rotationAngles(cx, cy, c, orig)
+    test(zip(zDir.tolist(), ucsA.tolist()), [rotationAngle(x, y, p, a) for x,y,p,a in zip(cx.tolist(), cy.tolist(), c.tolist(), orig)])
+    cs = numpy.array([a[0] for a in arcs])
+    sas = normAngles2pi([a[2] for a in arcs])
+    eas = normAngles2pi([a[2] + a[3] for a in arcs])
+    rs = numpy.array([a[1] for a in arcs])
+    mids = getArcMidpointsA(cs, rs, sas, eas)
+    test(numpy.abs(mids - [getArcMidpointA(a[0], a[1], s, e) for a,s,e in zip(arcs, sas, eas)]).max() < 1e-9, True)
+    ss = numpy.column_stack(AutoLISP.polars(cs[:, 0], cs[:, 1], sas, rs))
+    es = numpy.column_stack(AutoLISP.polars(cs[:, 0], cs[:, 1], eas, rs))
+    s,e = detectArcsStartEnd(cs, es, ss, mids)
+    test((s.tolist(), e.tolist()), (ss.tolist(), es.tolist()))
+
 def testTrig():
     testArcMidpoint()
     testAngle()
     testUCSMatrix()
+    testOCS()
+    testBulgePoints()
+    testUnzipBulges()
+    testArcFacets()
+    testArcTemplates()
+    testUCS()
+    testAngleKernel()
     return ecOK
 
 if __name__ == '__main__':